@@ -0,0 +1,130 @@
+"""
+Runs the benchmark suite and writes the results as JSON.
+
+    python -m benchmarks --sizes 1000,100000 --output results.json
+    python -m benchmarks --sizes 100000 --compare results.json
+
+Each size gets a freshly generated database in a temporary directory, so
+runs with the same arguments and seed measure the same data. The GUI part
+uses stand-in widgets unless --real-tk is given (which needs a display,
+e.g. under xvfb-run).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+try:
+    from benchmarks import fake_tk
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from benchmarks import fake_tk
+
+
+def _parse_sizes(value: str) -> List[int]:
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower().replace("_", "")
+        multiplier = 1
+        if part.endswith("k"): part, multiplier = part[:-1], 1_000
+        elif part.endswith("m"): part, multiplier = part[:-1], 1_000_000
+        sizes.append(int(float(part) * multiplier))
+    return sizes
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def _print_comparison(baseline: Dict[str, Any], current: Dict[str, Any]):
+    # Compares mean_ms of every operation present in both reports, per size.
+    old_runs = {run["tasks"]: run for run in baseline.get("runs", [])}
+    for run in current["runs"]:
+        old_run = old_runs.get(run["tasks"])
+        if old_run is None:
+            continue
+        print(f"\n{run['tasks']} tasks: baseline mean ms -> current mean ms")
+        for section in ("data", "gui", "llm"):
+            for name, stats in run.get(section, {}).items():
+                old_stats = old_run.get(section, {}).get(name)
+                if not isinstance(stats, dict) or not isinstance(old_stats, dict):
+                    continue
+                old_ms, new_ms = old_stats.get("mean_ms"), stats.get("mean_ms")
+                if not old_ms or new_ms is None:
+                    continue
+                print(f"  {section}.{name:<32} {old_ms:10.3f} -> {new_ms:10.3f}  ({(new_ms / old_ms - 1) * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="NexusTask AI benchmarks")
+    parser.add_argument("--sizes", default="1k,100k", help="comma-separated task counts, e.g. 1k,100k,1m")
+    parser.add_argument("--notes-per-task", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=200, help="calls per single-row operation")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare mean timings against")
+    parser.add_argument("--no-gui", action="store_true", help="skip the GUI benchmarks")
+    parser.add_argument("--no-llm", action="store_true", help="skip the LLM pipeline benchmarks")
+    parser.add_argument("--real-tk", action="store_true", help="use real Tk widgets (needs a display)")
+    parser.add_argument("--keep-databases", action="store_true", help="leave the generated databases on disk")
+    args = parser.parse_args()
+
+    if not args.no_gui and not args.real_tk:
+        fake_tk.install()  # before anything imports the gui package
+
+    import data.database as db
+    from benchmarks.bench_data import run_data_benchmarks
+    from benchmarks.bench_gui import run_gui_benchmarks
+    from benchmarks.bench_llm import run_llm_benchmarks
+    from benchmarks.generator import generate_database
+
+    report: Dict[str, Any] = {"environment": _environment(), "arguments": vars(args), "runs": []}
+    for size in _parse_sizes(args.sizes):
+        workdir = tempfile.mkdtemp(prefix=f"nexus_bench_{size}_")
+        path = os.path.join(workdir, "bench.db")
+        try:
+            print(f"Generating {size} tasks...", file=sys.stderr)
+            run: Dict[str, Any] = {"tasks": size}
+            run["generate"] = generate_database(path, size, notes_per_task=args.notes_per_task, seed=args.seed)
+            print(f"Timing data operations on {size} tasks...", file=sys.stderr)
+            run["data"] = run_data_benchmarks(size, samples=args.samples, seed=args.seed)
+            if not args.no_gui:
+                print(f"Timing GUI list paths on {size} tasks...", file=sys.stderr)
+                run["gui"] = run_gui_benchmarks(real_tk=args.real_tk, seed=args.seed)
+            if not args.no_llm:
+                print(f"Timing the LLM pipeline on {size} tasks...", file=sys.stderr)
+                run["llm"] = run_llm_benchmarks()
+            report["runs"].append(run)
+        finally:
+            db.close_database()
+            if args.keep_databases:
+                print(f"Kept {path}", file=sys.stderr)
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            _print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
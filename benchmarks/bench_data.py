@@ -0,0 +1,138 @@
+import datetime
+import random
+import sys
+import os
+from typing import Any, Dict
+
+try:
+    import data.database as db
+    from data.repository import Repository
+    from data.change_feed import ChangeFeed
+    from benchmarks.generator import BASE_TIME, COMMON_WORDS, WORDS
+    from benchmarks.timing import Samples
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from data.repository import Repository
+    from data.change_feed import ChangeFeed
+    from benchmarks.generator import BASE_TIME, COMMON_WORDS, WORDS
+    from benchmarks.timing import Samples
+
+# (name, query): a word in most rows, a mid-frequency word, a prefix as typed
+# so far, a two-word query and a word that is in no row.
+SEARCH_QUERIES = [
+    ("common_word", COMMON_WORDS[0]),
+    ("rare_word", WORDS[-1]),
+    ("prefix", WORDS[10][:3]),
+    ("two_words", f"{WORDS[6]} {WORDS[12]}"),
+    ("no_match", "zzzyx"),
+]
+
+
+def run_data_benchmarks(tasks: int, samples: int = 200, list_repeats: int = 3,
+                        seed: int = 0) -> Dict[str, Any]:
+    """
+    Times the data-layer operations against the currently configured database,
+    which must hold `tasks` generated tasks with ids 1..tasks. Toggles and
+    deletes only touch the `samples` tasks inserted here, so the generated
+    rows are left as they were.
+    """
+    rng = random.Random(seed)
+    task_ids = [rng.randint(1, tasks) for _ in range(samples)]
+    results: Dict[str, Any] = {}
+
+    def record(name: str, timings: Samples):
+        results[name] = timings.summary()
+
+    inserted = Samples()
+    created_ids = [inserted.time(db.add_task, f"Benchmark task {i}", priority="Alta").id for i in range(samples)]
+    record("insert_task", inserted)
+
+    for name, func, rows in (("list_tasks", db.get_all_tasks, tasks),
+                             ("list_notes_with_tasks", db.get_all_notes_with_tasks, None),
+                             ("first_task_page", db.get_tasks_page, db.PAGE_SIZE)):
+        timings = Samples()
+        for _ in range(list_repeats):
+            count = len(timings.time(func))
+        timings.rows_per_call = rows if rows is not None else count
+        record(name, timings)
+
+    iterated = Samples(rows_per_call=tasks)
+    iterated.time(lambda: sum(1 for _ in db.iter_tasks()))
+    record("iter_tasks", iterated)
+
+    repository = Repository()
+    cold = Samples(rows_per_call=tasks)
+    cold.time(repository.list_tasks)
+    warm = Samples(rows_per_call=tasks)
+    for _ in range(list_repeats):
+        warm.time(repository.list_tasks)
+    record("repository_list_tasks_cold", cold)
+    record("repository_list_tasks_warm", warm)
+
+    fetched = Samples()
+    for task_id in task_ids:
+        fetched.time(db.get_task_by_id, task_id)
+    record("get_task_by_id", fetched)
+
+    notes_for_task = Samples()
+    for task_id in task_ids:
+        notes_for_task.time(db.get_notes_for_task, task_id)
+    record("get_notes_for_task", notes_for_task)
+
+    toggled = Samples()
+    for task_id in created_ids:
+        toggled.time(db.update_task_completion, task_id, True)
+    record("toggle_task", toggled)
+    bulk_toggled = Samples(rows_per_call=len(created_ids))
+    bulk_toggled.time(db.update_tasks_completion_bulk, [(task_id, False) for task_id in created_ids])
+    record("toggle_tasks_bulk", bulk_toggled)
+
+    for name, query in SEARCH_QUERIES:
+        searched = Samples()
+        for _ in range(max(1, samples // 10)):
+            searched.time(db.search, query)
+        record(f"search_{name}", searched)
+
+    # Filter bar views; BASE_TIME + 30..60 days is a month of generated due dates.
+    month_start = (BASE_TIME + datetime.timedelta(days=30)).date()
+    task_views = [
+        ("open_by_priority", lambda: db.TaskQuery().open().sorted_by("priority")),
+        ("open_by_due_date", lambda: db.TaskQuery().open().sorted_by("due")),
+        ("high_priority_newest_page", lambda: db.TaskQuery().with_priorities("Alta").limited(db.PAGE_SIZE)),
+        ("due_within_month", lambda: db.TaskQuery().due_between(month_start, month_start + datetime.timedelta(days=30))
+                                                   .sorted_by("due")),
+    ]
+    for name, build in task_views:
+        timings = Samples()
+        for _ in range(list_repeats):
+            timings.rows_per_call = len(timings.time(db.query_tasks, build()))
+        record(f"query_{name}", timings)
+
+    # The stats header reads the trigger-maintained counts; the check
+    # recomputes them from every task.
+    stats = Samples()
+    for _ in range(samples):
+        stats.time(db.get_task_stats)
+    record("task_stats", stats)
+    checked = Samples(rows_per_call=tasks)
+    checked.time(db.check_task_stats)
+    record("check_task_stats", checked)
+
+    # What each window pays per poll while no other process writes.
+    feed = ChangeFeed()
+    feed.poll()
+    idle_polls = Samples()
+    for _ in range(samples):
+        idle_polls.time(feed.poll)
+    record("change_feed_idle_poll", idle_polls)
+
+    half = len(created_ids) // 2
+    deleted = Samples()
+    for task_id in created_ids[:half]:
+        deleted.time(db.delete_task, task_id)
+    record("delete_task", deleted)
+    bulk_deleted = Samples(rows_per_call=len(created_ids) - half)
+    bulk_deleted.time(db.delete_tasks_bulk, created_ids[half:])
+    record("delete_tasks_bulk", bulk_deleted)
+    return results
@@ -0,0 +1,122 @@
+import random
+import sys
+import os
+import time
+from typing import Any, Callable, Dict
+
+try:
+    from benchmarks import fake_tk
+    from benchmarks.timing import Samples
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from benchmarks import fake_tk
+    from benchmarks.timing import Samples
+
+VIEWPORT_SIZE = (1000, 620)  # task list viewport of the default 1050x750 window
+LOAD_TIMEOUT_SECONDS = 600.0
+
+
+class _Pump:
+    """Runs the event loop, real or faked, until a condition holds."""
+
+    def __init__(self, app, real_tk: bool):
+        self.app = app
+        self.real_tk = real_tk
+
+    def until(self, condition: Callable[[], bool], timeout: float = LOAD_TIMEOUT_SECONDS):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("GUI benchmark timed out waiting for the window")
+            if self.real_tk:
+                self.app.update()
+            else:
+                fake_tk.run_pending()
+            time.sleep(0.0005)  # let the DB worker thread run
+
+    def idle(self):
+        self.until(lambda: self.app.data.worker.pending == 0 and self.app.data._outstanding == 0
+                   and (self.real_tk or not fake_tk.has_pending()))
+
+
+def run_gui_benchmarks(real_tk: bool = False, scroll_steps: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """
+    Builds the main window against the currently configured database and
+    times the list code paths: first paint, full load, scrolling, resizing,
+    showing search results and opening the Notes tab. Without real_tk the
+    widgets are the stand-ins from benchmarks.fake_tk, which must already be
+    installed (see benchmarks.__main__); timings then cover the application's
+    own Python work, not Tk drawing.
+    """
+    from gui.app_window import AppWindow
+
+    rng = random.Random(seed)
+    results: Dict[str, Any] = {"widgets": "tk" if real_tk else "fake"}
+    phases: Dict[str, float] = {}
+    start = time.perf_counter()
+    app = AppWindow(on_startup_phase=lambda phase: phases.setdefault(phase, time.perf_counter() - start))
+    results["window_built_ms"] = (time.perf_counter() - start) * 1000
+    pump = _Pump(app, real_tk)
+    task_list = app.task_list_view
+    if not real_tk:
+        for list_view in (task_list, app.note_list_view):
+            list_view.viewport.resize(*VIEWPORT_SIZE)
+            list_view._on_viewport_configure()
+    try:
+        pump.until(lambda: "fully loaded" in phases)
+        results["first_paint_ms"] = phases["first paint"] * 1000
+        results["fully_loaded_ms"] = phases["fully loaded"] * 1000
+        results["tasks_listed"] = len(task_list.items)
+        results["task_row_widgets"] = len(task_list._pool)
+        pump.idle()
+
+        paged = Samples()
+        for step in range(scroll_steps):
+            paged.time(task_list.yview_scroll, 1 if step < scroll_steps // 2 else -1, "pages")
+        results["scroll_page"] = paged.summary()
+
+        jumped = Samples()
+        for _ in range(scroll_steps):
+            jumped.time(task_list.yview, "moveto", rng.random())
+        results["scroll_jump"] = jumped.summary()
+
+        def resize_burst():
+            width, height = VIEWPORT_SIZE
+            for step in range(50):
+                if not real_tk:
+                    task_list.viewport.resize(width - step, height)
+                task_list._on_viewport_configure()
+            pump.idle()
+        resized = Samples()
+        for _ in range(10):
+            resized.time(resize_burst)
+        results["resize_burst_50_events"] = resized.summary()
+
+        search_results = app.repository.search_tasks("informe", limit=200)
+        shown = Samples(rows_per_call=len(search_results))
+        all_tasks = list(task_list.items)
+        for _ in range(20):
+            shown.time(task_list.set_items, search_results)
+            shown.time(task_list.set_items, all_tasks)
+        results["set_items_search_and_back"] = shown.summary()
+
+        notes_start = time.perf_counter()
+        if real_tk:
+            app.tab_view.set("Notes")
+            app._on_tab_selected()
+        else:
+            app.tab_view.select("Notes")
+        pump.idle()
+        results["notes_tab_first_open_ms"] = (time.perf_counter() - notes_start) * 1000
+        results["notes_listed"] = len(app.note_list_view.items)
+        if not real_tk:
+            results["fonts_created"] = fake_tk.CTkFont.created
+    finally:
+        app._stop_toast_poll()
+        app._stop_change_poll()
+        app.reminders.stop()
+        app.reminder_toasts.close()
+        app.completion_buffer.close()
+        app.data.shutdown()
+        app.destroy()
+    return results
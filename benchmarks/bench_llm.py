@@ -0,0 +1,51 @@
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict
+
+try:
+    import data.database as db
+    from benchmarks.timing import time_once
+    from llm_integration.cache import ResponseCache
+    from llm_integration.pipeline import LLMPipeline
+    from llm_integration.providers import StubProvider
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from benchmarks.timing import time_once
+    from llm_integration.cache import ResponseCache
+    from llm_integration.pipeline import LLMPipeline
+    from llm_integration.providers import StubProvider
+
+LLM_PROMPTS = 2000
+STUB_BATCH_LATENCY = 0.02  # seconds per provider call, like a short network round trip
+
+
+def run_llm_benchmarks(prompts: int = LLM_PROMPTS) -> Dict[str, Any]:
+    """
+    Pushes summarisation prompts built from the first `prompts` tasks through
+    an LLMPipeline backed by StubProvider: once against an empty cache, again
+    with the responses in memory, and once more through a fresh pipeline
+    that only has the on-disk cache.
+    """
+    descriptions = [task.description for task in itertools.islice(db.iter_tasks(), prompts)]
+    texts = [f"Summarise this task in one sentence:\n{description}" for description in descriptions]
+    workdir = tempfile.mkdtemp(prefix="nexus_bench_llm_")
+    cache_path = os.path.join(workdir, "llm_cache.db")
+    results: Dict[str, Any] = {}
+    try:
+        pipeline = LLMPipeline(StubProvider(latency=STUB_BATCH_LATENCY), ResponseCache(cache_path))
+        results["cold"] = time_once(pipeline.complete, texts, rows=len(texts))
+        results["memory_cache"] = time_once(pipeline.complete, texts, rows=len(texts))
+        results["pipeline_stats"] = pipeline.stats()
+        pipeline.shutdown()
+
+        pipeline = LLMPipeline(StubProvider(latency=STUB_BATCH_LATENCY), ResponseCache(cache_path))
+        results["disk_cache"] = time_once(pipeline.complete, texts, rows=len(texts))
+        results["disk_pipeline_stats"] = pipeline.stats()
+        pipeline.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
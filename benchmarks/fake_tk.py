@@ -0,0 +1,259 @@
+"""
+Minimal stand-ins for tkinter and customtkinter, enough to drive the GUI's
+list-building code without a display. Widgets only remember their options;
+after()/after_idle() callbacks are queued and run by run_pending() in place
+of the Tk event loop, with delays ignored. Callbacks delayed by TIMER_MS or
+more (the toast and change polls, toast timeouts) stand for real time
+passing and are held back until run_timers(), so a poll that re-arms
+itself forever doesn't keep has_pending() true.
+
+install() must run before anything imports the gui package.
+"""
+import itertools
+import sys
+import types
+from typing import Any, Callable, List, Optional, Tuple
+
+_ids = itertools.count(1)
+TIMER_MS = 1000
+
+_pending: List[Tuple[str, Optional[Callable[..., Any]], tuple]] = []
+_timers: List[Tuple[str, Optional[Callable[..., Any]], tuple]] = []
+_cancelled = set()
+
+
+def run_pending(max_rounds: int = 100) -> int:
+    """Runs queued callbacks (and the ones they queue) and returns how many ran."""
+    ran = 0
+    for _ in range(max_rounds):
+        if not _pending:
+            break
+        batch = _pending[:]
+        del _pending[:]
+        for after_id, func, args in batch:
+            if after_id in _cancelled:
+                _cancelled.discard(after_id)
+                continue
+            if func is not None:
+                func(*args)
+                ran += 1
+    return ran
+
+
+def has_pending() -> bool:
+    return bool(_pending)
+
+
+def run_timers() -> int:
+    """Runs the held-back timers once, as if their delay had passed, and what they queue."""
+    _pending.extend(_timers)
+    del _timers[:]
+    return run_pending()
+
+
+class Misc:
+    def __init__(self, master=None, *args, **kwargs):
+        self.master = master
+        self._options = dict(kwargs)
+        self._width = kwargs.get("width", 200)
+        self._height = kwargs.get("height", 30)
+        self._exists = True
+        parent_path = str(master) if master is not None else ""
+        self._path = f"{parent_path}.!w{next(_ids)}"
+
+    def __str__(self) -> str:
+        return self._path
+
+    def __getattr__(self, name: str):
+        # Geometry management, bindings, window-manager calls and the like
+        # have no observable effect here.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+    def configure(self, **kwargs):
+        self._options.update(kwargs)
+
+    config = configure
+
+    def cget(self, key: str) -> Any:
+        return self._options.get(key)
+
+    def resize(self, width: int, height: int):
+        """Test hook: gives the widget a size, as the geometry manager would."""
+        self._width, self._height = width, height
+
+    def winfo_width(self) -> int:
+        return self._width
+
+    def winfo_height(self) -> int:
+        return self._height
+
+    def winfo_exists(self) -> bool:
+        return self._exists
+
+    def destroy(self):
+        self._exists = False
+
+    def after(self, ms: int, func: Optional[Callable[..., Any]] = None, *args: Any) -> str:
+        after_id = f"after#{next(_ids)}"
+        (_timers if ms >= TIMER_MS else _pending).append((after_id, func, args))
+        return after_id
+
+    def after_idle(self, func: Callable[..., Any], *args: Any) -> str:
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id: str):
+        _cancelled.add(after_id)
+
+
+class Canvas(Misc):
+    def __init__(self, master=None, *args, **kwargs):
+        super().__init__(master, *args, **kwargs)
+        self.items = {}
+
+    def create_window(self, x: float, y: float, **kwargs) -> int:
+        item_id = next(_ids)
+        self.items[item_id] = dict(kwargs, x=x, y=y)
+        return item_id
+
+    def coords(self, item_id: int, x: float, y: float):
+        self.items[item_id].update(x=x, y=y)
+
+    def itemconfigure(self, item_id: int, **kwargs):
+        self.items[item_id].update(kwargs)
+
+
+class Variable:
+    def __init__(self, master=None, value: Any = None):
+        self._value = value
+
+    def get(self) -> Any:
+        return self._value
+
+    def set(self, value: Any):
+        self._value = value
+
+
+class CTkBaseClass(Misc):
+    def __init__(self, master=None, *args, **kwargs):
+        super().__init__(master, *args, **kwargs)
+        self._fg_color = kwargs.get("fg_color")
+
+    def _apply_widget_scaling(self, value: float) -> float:
+        return value
+
+    def _reverse_widget_scaling(self, value: float) -> float:
+        return value
+
+    def _apply_appearance_mode(self, color: Any) -> Any:
+        return color[0] if isinstance(color, (tuple, list)) else color
+
+    def _set_appearance_mode(self, mode_string: str):
+        pass
+
+
+class CTkEntry(CTkBaseClass):
+    def __init__(self, master=None, *args, **kwargs):
+        super().__init__(master, *args, **kwargs)
+        self._text = ""
+
+    def get(self, *args) -> str:
+        return self._text
+
+    def insert(self, index: Any, text: str):
+        self._text += text
+
+    def delete(self, first: Any, last: Any = None):
+        self._text = ""
+
+
+class CTkTextbox(CTkEntry):
+    def get(self, *args) -> str:
+        return self._text + "\n"  # Text widgets always end with a newline
+
+
+class CTkTabview(CTkBaseClass):
+    def __init__(self, master=None, *args, **kwargs):
+        super().__init__(master, *args, **kwargs)
+        self._tabs = {}
+        self._current: Optional[str] = None
+        self._command = kwargs.get("command")
+
+    def add(self, name: str):
+        self._tabs[name] = CTkBaseClass(self)
+        return self._tabs[name]
+
+    def tab(self, name: str):
+        return self._tabs[name]
+
+    def set(self, name: str):
+        self._current = name
+
+    def get(self) -> str:
+        return self._current
+
+    def select(self, name: str):
+        """Test hook: selects a tab the way a click on its button does."""
+        self._current = name
+        if self._command:
+            self._command()
+
+
+class CTkSegmentedButton(CTkBaseClass):
+    def __init__(self, master=None, *args, **kwargs):
+        super().__init__(master, *args, **kwargs)
+        self._values = list(kwargs.get("values", []))
+        self._current: Optional[str] = None
+        self._command = kwargs.get("command")
+
+    def set(self, value: str):
+        self._current = value
+
+    def get(self) -> Optional[str]:
+        return self._current
+
+    def select(self, value: str):
+        """Test hook: selects a value the way a click on its button does."""
+        self._current = value
+        if self._command:
+            self._command(value)
+
+
+class CTkFont:
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        CTkFont.created += 1
+        self.options = kwargs
+
+
+def _build_modules() -> Tuple[types.ModuleType, types.ModuleType]:
+    tk = types.ModuleType("tkinter")
+    tk.Misc = Misc
+    tk.Tk = tk.Frame = tk.Label = tk.Toplevel = Misc
+    tk.Canvas = Canvas
+    tk.Variable = Variable
+    tk.StringVar = tk.BooleanVar = tk.IntVar = tk.DoubleVar = Variable
+    tk.END, tk.WORD, tk.LEFT, tk.RIGHT, tk.BOTH, tk.X, tk.Y = "end", "word", "left", "right", "both", "x", "y"
+
+    ctk = types.ModuleType("customtkinter")
+    for name in ("CTk", "CTkFrame", "CTkLabel", "CTkButton", "CTkCheckBox", "CTkOptionMenu",
+                 "CTkScrollbar", "CTkScrollableFrame", "CTkProgressBar", "CTkToplevel", "CTkSwitch"):
+        setattr(ctk, name, type(name, (CTkBaseClass,), {}))
+    ctk.CTkEntry = CTkEntry
+    ctk.CTkTextbox = CTkTextbox
+    ctk.CTkTabview = CTkTabview
+    ctk.CTkSegmentedButton = CTkSegmentedButton
+    ctk.CTkFont = CTkFont
+    ctk.set_appearance_mode = lambda mode: None
+    ctk.set_default_color_theme = lambda theme: None
+    return tk, ctk
+
+
+def install():
+    if "gui.app_window" in sys.modules:
+        raise RuntimeError("fake_tk.install() must run before the gui package is imported")
+    tk, ctk = _build_modules()
+    sys.modules["tkinter"] = tk
+    sys.modules["customtkinter"] = ctk
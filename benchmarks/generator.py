@@ -0,0 +1,121 @@
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import data.database as db
+    from core.models import Task, Note, Priority
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from core.models import Task, Note, Priority
+
+# Fixed vocabulary so full-text search sees realistic term frequencies: a few
+# words appear in most rows, most words in only a few percent of them.
+WORDS = (
+    "revisar enviar llamar preparar informe reunión cliente proyecto diseño código "
+    "prueba despliegue presupuesto factura contrato correo agenda equipo servidor "
+    "base datos error usuario pantalla ventana tarea nota semana mes trimestre "
+    "entrega plazo documento manual backup migración índice consulta rendimiento "
+    "memoria caché red seguridad permiso acceso registro auditoría métrica panel"
+).split()
+COMMON_WORDS = WORDS[:4]
+
+BASE_TIME = datetime.datetime(2024, 1, 1, 8, 0, 0)
+GENERATOR_BATCH_SIZE = 50_000  # rows per transaction; bounds memory for 1M-row databases
+
+
+def _text(rng: random.Random, min_words: int, max_words: int) -> str:
+    count = rng.randint(min_words, max_words)
+    # Bias towards the common words so some searches match most rows.
+    words = [rng.choice(COMMON_WORDS) if rng.random() < 0.2 else rng.choice(WORDS) for _ in range(count)]
+    return " ".join(words).capitalize()
+
+
+def _tasks(rng: random.Random, count: int) -> Iterator[Task]:
+    priorities = list(Priority)
+    for i in range(count):
+        due_date = None
+        if rng.random() < 0.6:
+            due_date = (BASE_TIME + datetime.timedelta(days=rng.randint(-30, 365))).date()
+        yield Task(id=None, description=_text(rng, 3, 8), priority=rng.choice(priorities),
+                   due_date=due_date, completed=rng.random() < 0.3,
+                   created_at=BASE_TIME + datetime.timedelta(seconds=30 * i))
+
+
+def _notes(rng: random.Random, count: int, task_ids: List[Tuple[int, int]],
+           linked_ratio: float) -> Iterator[Note]:
+    for i in range(count):
+        task_id = None
+        if task_ids and rng.random() < linked_ratio:
+            first, last = rng.choice(task_ids)
+            task_id = rng.randint(first, last)
+        yield Note(id=None, content=_text(rng, 10, 40), task_id=task_id,
+                   created_at=BASE_TIME + datetime.timedelta(seconds=45 * i))
+
+
+def _insert_in_batches(insert, rows: Iterator, count: int) -> List[Tuple[int, int]]:
+    # Returns the (first, last) id of every batch instead of the models.
+    id_ranges: List[Tuple[int, int]] = []
+    remaining = count
+    while remaining > 0:
+        batch_size = min(GENERATOR_BATCH_SIZE, remaining)
+        created = insert(next(rows) for _ in range(batch_size))
+        if len(created) != batch_size:
+            raise RuntimeError(f"Expected {batch_size} rows to be inserted, got {len(created)}")
+        id_ranges.append((created[0].id, created[-1].id))
+        remaining -= batch_size
+    return id_ranges
+
+
+def generate_database(path: str, tasks: int, notes_per_task: float = 0.5,
+                      linked_ratio: float = 0.8, seed: int = 0) -> Dict[str, float]:
+    """
+    Builds a database at `path` (which must not exist yet) and leaves the
+    data layer configured to use it. The same arguments always produce the
+    same rows.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(f"Refusing to overwrite existing database: {path}")
+    rng = random.Random(seed)
+    notes = int(tasks * notes_per_task)
+
+    db.configure_database(path)
+    db.initialize_database()
+    start = time.perf_counter()
+    task_ids = _insert_in_batches(db.add_tasks_bulk, _tasks(rng, tasks), tasks)
+    tasks_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    _insert_in_batches(db.add_notes_bulk, _notes(rng, notes, task_ids, linked_ratio), notes)
+    notes_seconds = time.perf_counter() - start
+    return {
+        "tasks": tasks,
+        "notes": notes,
+        "seed": seed,
+        "tasks_insert_seconds": tasks_seconds,
+        "notes_insert_seconds": notes_seconds,
+        "tasks_per_second": tasks / tasks_seconds if tasks_seconds else 0.0,
+        "notes_per_second": notes / notes_seconds if notes_seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic NexusTask AI database.")
+    parser.add_argument("path", help="database file to create")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--notes-per-task", type=float, default=0.5)
+    parser.add_argument("--linked-ratio", type=float, default=0.8, help="share of notes linked to a task")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    summary = generate_database(args.path, args.tasks, args.notes_per_task, args.linked_ratio, args.seed)
+    db.close_database()
+    print(f"Created {summary['tasks']} tasks and {summary['notes']} notes in {args.path} "
+          f"({summary['tasks_per_second']:.0f} tasks/s, {summary['notes_per_second']:.0f} notes/s)")
+
+
+if __name__ == "__main__":
+    main()
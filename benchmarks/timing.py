@@ -0,0 +1,39 @@
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+
+class Samples:
+    """Durations of repeated runs of one operation, summarized for the JSON report."""
+
+    def __init__(self, rows_per_call: int = 1):
+        self.durations: List[float] = []
+        self.rows_per_call = rows_per_call
+
+    def time(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.durations.append(time.perf_counter() - start)
+        return result
+
+    def summary(self) -> Dict[str, float]:
+        if not self.durations:
+            return {"calls": 0}
+        ordered = sorted(self.durations)
+        total = sum(ordered)
+        rows = self.rows_per_call * len(ordered)
+        return {
+            "calls": len(ordered),
+            "total_ms": total * 1000,
+            "mean_ms": statistics.fmean(ordered) * 1000,
+            "p50_ms": ordered[len(ordered) // 2] * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "max_ms": ordered[-1] * 1000,
+            "rows_per_second": rows / total if total else 0.0,
+        }
+
+
+def time_once(func: Callable[..., Any], *args: Any, rows: int = 1, **kwargs: Any) -> Dict[str, float]:
+    samples = Samples(rows_per_call=rows)
+    samples.time(func, *args, **kwargs)
+    return samples.summary()
@@ -1,16 +1,41 @@
 import datetime
-from typing import Optional
+from enum import Enum
+from typing import Dict, Optional, Union
+
+class Priority(str, Enum):
+    # A str subclass, so members compare equal to and are stored as the plain
+    # text values; every task shares these three instances.
+    BAJA = "Baja"
+    MEDIA = "Media"
+    ALTA = "Alta"
+
+    def __str__(self) -> str:
+        return self.value
+
+    __format__ = str.__format__
+
+PRIORITIES: Dict[str, Priority] = {priority.value: priority for priority in Priority}
+# Integer encoding stored in tasks.priority_rank; higher is more urgent.
+PRIORITY_RANKS: Dict[Priority, int] = {Priority.BAJA: 0, Priority.MEDIA: 1, Priority.ALTA: 2}
+
+def parse_priority(value: Union[str, Priority]) -> Priority:
+    priority = PRIORITIES.get(value)
+    if priority is None:
+        raise ValueError("Priority must be 'Baja', 'Media', or 'Alta'")
+    return priority
 
 class Task:
-    def __init__(self, id: Optional[int], description: str, priority: str = "Media",
-                 due_date: Optional[datetime.date] = None, completed: bool = False):
-        if priority not in ["Baja", "Media", "Alta"]:
-            raise ValueError("Priority must be 'Baja', 'Media', or 'Alta'")
+    __slots__ = ("id", "description", "priority", "due_date", "completed", "created_at")
+
+    def __init__(self, id: Optional[int], description: str, priority: Union[str, Priority] = Priority.MEDIA,
+                 due_date: Optional[datetime.date] = None, completed: bool = False,
+                 created_at: Optional[datetime.datetime] = None):
         self.id = id
         self.description = description
-        self.priority = priority
+        self.priority = parse_priority(priority)
         self.due_date = due_date
         self.completed = completed
+        self.created_at = created_at
 
     def __str__(self) -> str:
         status = "[X]" if self.completed else "[ ]"
@@ -19,23 +44,95 @@ class Task:
 
     def __repr__(self) -> str:
         return (f"Task(id={self.id!r}, description={self.description!r}, "
-                f"priority={self.priority!r}, due_date={self.due_date!r}, "
+                f"priority={self.priority.value!r}, due_date={self.due_date!r}, "
                 f"completed={self.completed!r})")
 
+# Characters of a note kept in notes.preview, which is what list views read.
+NOTE_PREVIEW_CHARS = 120
+
 class Note:
-    def __init__(self, id: Optional[int], content: str,
+    __slots__ = ("id", "content", "created_at", "task_id", "preview", "content_length")
+
+    def __init__(self, id: Optional[int], content: Optional[str],
                  created_at: Optional[datetime.datetime] = None,
-                 task_id: Optional[int] = None):
+                 task_id: Optional[int] = None,
+                 preview: Optional[str] = None, content_length: Optional[int] = None):
+        # content is None for notes loaded by list queries, which only read
+        # preview and content_length; see Repository.get_note().
         self.id = id
         self.content = content
         self.created_at = created_at if created_at else datetime.datetime.now()
         self.task_id = task_id
+        self.preview = preview if preview is not None else (content or "")[:NOTE_PREVIEW_CHARS]
+        self.content_length = content_length if content_length is not None else len(content or "")
+
+    def set_content(self, content: str):
+        self.content = content
+        self.preview = content[:NOTE_PREVIEW_CHARS]
+        self.content_length = len(content)
 
     def __str__(self) -> str:
         created_str = self.created_at.strftime('%Y-%m-%d %H:%M') if self.created_at else "No date"
         task_link_str = f" (TaskID: {self.task_id})" if self.task_id else ""
-        return f"(ID: {self.id}) {self.content[:50]}... - Created: {created_str}{task_link_str}"
+        return f"(ID: {self.id}) {self.preview[:50]}... - Created: {created_str}{task_link_str}"
+
+    def __repr__(self) -> str:
+        content = self.content if self.content is not None else f"<{self.content_length} chars not loaded>"
+        return (f"Note(id={self.id!r}, content={content!r}, "
+                f"created_at={self.created_at!r}, task_id={self.task_id!r})")
+
+class SearchResult:
+    __slots__ = ("kind", "id", "snippet", "rank")
+
+    def __init__(self, kind: str, id: int, snippet: str, rank: float):
+        self.kind = kind # "task" or "note"
+        self.id = id
+        self.snippet = snippet
+        self.rank = rank # bm25 score, lower is a better match
+
+    def __repr__(self) -> str:
+        return (f"SearchResult(kind={self.kind!r}, id={self.id!r}, "
+                f"snippet={self.snippet!r}, rank={self.rank!r})")
+
+class TaskStats:
+    """Task counts per priority, as read from the trigger-maintained stats tables."""
+    __slots__ = ("open", "completed", "overdue", "due_today")
+
+    def __init__(self, open: Optional[Dict[Priority, int]] = None, completed: Optional[Dict[Priority, int]] = None,
+                 overdue: Optional[Dict[Priority, int]] = None, due_today: int = 0):
+        # Every priority is present, with 0 when there are no such tasks.
+        self.open = {priority: 0 for priority in Priority}
+        self.completed = {priority: 0 for priority in Priority}
+        self.overdue = {priority: 0 for priority in Priority} # open tasks due before today
+        self.open.update(open or {})
+        self.completed.update(completed or {})
+        self.overdue.update(overdue or {})
+        self.due_today = due_today # open tasks due today
+
+    @property
+    def total_open(self) -> int:
+        return sum(self.open.values())
+
+    @property
+    def total_completed(self) -> int:
+        return sum(self.completed.values())
+
+    @property
+    def total_overdue(self) -> int:
+        return sum(self.overdue.values())
+
+    @property
+    def total(self) -> int:
+        return self.total_open + self.total_completed
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TaskStats):
+            return NotImplemented
+        return (self.open == other.open and self.completed == other.completed
+                and self.overdue == other.overdue and self.due_today == other.due_today)
 
     def __repr__(self) -> str:
-        return (f"Note(id={self.id!r}, content={self.content!r}, "
-                f"created_at={self.created_at!r}, task_id={self.task_id!r})")
\ No newline at end of file
+        def counts(by_priority: Dict[Priority, int]) -> Dict[str, int]:
+            return {priority.value: count for priority, count in by_priority.items()}
+        return (f"TaskStats(open={counts(self.open)!r}, completed={counts(self.completed)!r}, "
+                f"overdue={counts(self.overdue)!r}, due_today={self.due_today!r})")
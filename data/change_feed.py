@@ -0,0 +1,90 @@
+import datetime
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import data.database as db
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+
+# More changes than this at once (e.g. another process imported a file) are
+# cheaper to pick up with a full reload than row by row.
+MAX_INCREMENTAL_CHANGES = 1000
+CHANGE_LOG_RETENTION = datetime.timedelta(days=1)
+PRUNE_INTERVAL_SECONDS = 3600.0
+
+
+class ChangeFeed:
+    """
+    Follows change_log for one process, so it can pick up writes made by
+    other processes sharing the database file. poll() costs one PRAGMA when
+    nothing changed: data_version only moves when another connection
+    commits. When it has moved, only the change_log rows after the last seq
+    seen are read.
+
+    A feed uses the connection of the thread calling it; always poll from
+    the same thread. It also prunes log rows older than `retention` every
+    `prune_interval` seconds.
+    """
+
+    def __init__(self, max_changes: int = MAX_INCREMENTAL_CHANGES,
+                 retention: datetime.timedelta = CHANGE_LOG_RETENTION,
+                 prune_interval: float = PRUNE_INTERVAL_SECONDS):
+        self.max_changes = max_changes
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self.last_seq: Optional[int] = None  # None until the first poll
+        self._data_version: Optional[int] = None
+        self._last_prune = time.monotonic()
+        self.polls = 0
+        self.unchanged = 0   # polls answered by data_version alone
+        self.changes = 0     # log rows read
+        self.reloads = 0     # polls that asked for a full reload
+        self.pruned = 0
+
+    def poll(self) -> Optional[List[Tuple[str, int]]]:
+        """
+        (kind, item_id) of every task and note changed since the last poll,
+        once each, in the order first changed. None means the caller missed
+        too much (over max_changes, or rows pruned before it read them) and
+        should reload everything instead. The first poll only records where
+        the log is now.
+        """
+        self.polls += 1
+        self._maybe_prune()
+        # Read before the log: a commit landing in between is then either in
+        # the rows read now or flagged by the next poll, never missed.
+        version = db.get_data_version()
+        if self.last_seq is None:
+            self.last_seq = db.get_change_log_position()
+            self._data_version = version
+            return []
+        if version is not None and version == self._data_version:
+            self.unchanged += 1
+            return []
+        rows = db.get_changes_since(self.last_seq, self.max_changes + 1)
+        if rows is None or version is None:
+            return []  # try again on the next poll
+        self._data_version = version
+        if not rows:
+            return []
+        self.changes += len(rows)
+        if rows[0][0] != self.last_seq + 1 or len(rows) > self.max_changes:
+            self.reloads += 1
+            self.last_seq = db.get_change_log_position()
+            return None
+        self.last_seq = rows[-1][0]
+        # The rows are re-read as they are now, so one entry per item does.
+        return list(dict.fromkeys((kind, item_id) for _, kind, item_id, _ in rows))
+
+    def _maybe_prune(self):
+        if time.monotonic() - self._last_prune >= self.prune_interval:
+            self._last_prune = time.monotonic()
+            self.pruned += db.prune_change_log(self.retention)
+
+    def stats(self) -> Dict[str, int]:
+        return {"polls": self.polls, "unchanged": self.unchanged, "changes": self.changes,
+                "reloads": self.reloads, "pruned": self.pruned}
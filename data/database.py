@@ -1,105 +1,258 @@
 import sqlite3
 import os
+import re
 import datetime
 import sys
-from typing import List, Optional
+import atexit
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 try:
-    from core.models import Task, Note
+    from core.models import (Task, Note, SearchResult, Priority, PRIORITIES, PRIORITY_RANKS, NOTE_PREVIEW_CHARS,
+                             TaskStats, parse_priority)
+    from data.migrations import apply_migrations
+    from data import instrumentation
+    from data.instrumentation import instrumented
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from core.models import Task, Note
+    from core.models import (Task, Note, SearchResult, Priority, PRIORITIES, PRIORITY_RANKS, NOTE_PREVIEW_CHARS,
+                             TaskStats, parse_priority)
+    from data.migrations import apply_migrations
+    from data import instrumentation
+    from data.instrumentation import instrumented
 
 
 DATABASE_NAME = "nexus_task_ai.db"
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), '..', DATABASE_NAME)
-INIT_FLAG_FILE = os.path.join(os.path.dirname(__file__), '.db_initialized')
+
+BULK_CHUNK_SIZE = 1000
+
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,     # milliseconds
+    "cache_size": -16000,     # negative means KiB, so ~16 MB of page cache
+    "mmap_size": 134217728,   # 128 MB
+}
+
+
+class ConnectionManager:
+    """
+    Hands out one long-lived connection per thread for a database file.
+    Nothing is opened until the first connection() call, which also brings
+    the schema up to date (once per manager).
+    """
+
+    def __init__(self, database_path: str, pragmas: Optional[Dict[str, Any]] = None):
+        self.database_path = database_path
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._schema_lock = threading.Lock()
+        self.schema_version: Optional[int] = None  # set once migrations have run
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread is off only so close_all() can run from the shutdown
+        # thread; every connection is still used by the thread that opened it.
+        # No detect_types: the model row factories below parse dates
+        # themselves, which is cheaper than the generic declared-type converters.
+        conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is not None:
+                conn.execute(f"PRAGMA {name} = {value}")
+        instrumentation.connection_opened(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            with self._lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        if self.schema_version is None:
+            with self._schema_lock:
+                if self.schema_version is None:
+                    self.schema_version = apply_migrations(conn)
+        return conn
+
+    def close(self):
+        """Closes the calling thread's connection, if it has one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def set_trace_callback(self, callback: Optional[Callable[[str], None]]):
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            conn.set_trace_callback(callback)
+
+    def close_all(self):
+        """Shutdown hook: closes every connection handed out by this manager."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database connection: {e}")
+        self._local = threading.local()
+
+
+_manager = ConnectionManager(DATABASE_PATH)
+
+
+def configure_database(database_path: Optional[str] = None,
+                       pragmas: Optional[Dict[str, Any]] = None) -> ConnectionManager:
+    """Replaces the module's connection manager, e.g. to point at another file."""
+    global _manager
+    _manager.close_all()
+    _manager = ConnectionManager(database_path or DATABASE_PATH, pragmas)
+    return _manager
+
+
+def get_connection_manager() -> ConnectionManager:
+    return _manager
+
 
 def get_db_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DATABASE_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def initialize_database():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            description TEXT NOT NULL,
-            priority TEXT DEFAULT 'Media',
-            due_date DATE,
-            completed BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            content TEXT NOT NULL,
-            task_id INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE SET NULL
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    return _manager.connection()
+
+
+def close_database():
+    _manager.close_all()
+
+
+atexit.register(close_database)
+
+def _explain_query_plan(sql: str) -> List[str]:
+    rows = get_db_connection().execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row[3] for row in rows]
+
+instrumentation.set_explainer(_explain_query_plan)
+instrumentation.add_toggle_listener(
+    lambda enabled: _manager.set_trace_callback(instrumentation.trace_statement if enabled else None))
+
+@instrumented
+def initialize_database() -> int:
+    """Opens the database and applies pending migrations; safe to call repeatedly."""
+    get_db_connection()
+    return _manager.schema_version
 
+TASK_COLUMNS = "id, description, priority, due_date, completed, created_at"
+NOTE_COLUMNS = "id, content, task_id, created_at, preview, content_length"
+# What list views read: everything but the (possibly long) content.
+NOTE_PREVIEW_COLUMNS = "id, NULL AS content, task_id, created_at, preview, content_length"
+
+# Cursor row factories for TASK_COLUMNS / NOTE_COLUMNS results. They build the
+# models straight from the row tuple, skipping sqlite3.Row lookups and the
+# models' __init__ (values coming out of the table are already valid).
+_new_task = Task.__new__
+_new_note = Note.__new__
+_parse_date = datetime.date.fromisoformat
+_parse_timestamp = datetime.datetime.fromisoformat
+
+def _task_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Task:
+    id, description, priority, due_date, completed, created_at = row
+    task = _new_task(Task)
+    task.id = id
+    task.description = description
+    task.priority = PRIORITIES.get(priority) or parse_priority(priority)
+    task.due_date = _parse_date(due_date) if due_date else None
+    task.completed = bool(completed)
+    task.created_at = _parse_timestamp(created_at) if created_at else None
+    return task
+
+def _note_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Note:
+    note = _new_note(Note)
+    note.id, note.content, note.task_id, created_at, note.preview, note.content_length = row
+    note.created_at = _parse_timestamp(created_at) if created_at else None
+    return note
+
+def _note_with_task_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Tuple[Note, Optional[str]]:
+    return _note_factory(cursor, row[:6]), row[6]
+
+@instrumented
 def add_task(description: str, priority: str = "Media", due_date: Optional[datetime.date] = None) -> Optional[Task]:
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = _task_factory
     try:
-        cursor.execute('''
+        cursor.execute(f'''
             INSERT INTO tasks (description, priority, due_date, completed)
             VALUES (?, ?, ?, ?)
+            RETURNING {TASK_COLUMNS}
         ''', (description, priority, due_date, False))
+        # The row factory builds the model inside fetchone(), before the
+        # commit, so an invalid priority rolls the insert back instead of
+        # leaving this thread's connection in a transaction.
+        task = cursor.fetchone()
         conn.commit()
-        new_id = cursor.lastrowid
-        if new_id is not None:
-            return get_task_by_id(new_id)
-        return None
-    except sqlite3.Error as e:
+        return task
+    except (sqlite3.Error, ValueError) as e:
         print(f"Error adding task: {e}")
         conn.rollback()
         return None
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
 def get_all_tasks() -> List[Task]:
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = _task_factory
     try:
-        cursor.execute("SELECT id, description, priority, due_date, completed FROM tasks ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        tasks = [
-            Task(id=row['id'], description=row['description'], priority=row['priority'],
-                 due_date=row['due_date'], completed=bool(row['completed']))
-            for row in rows
-        ]
-        return tasks
+        cursor.execute(f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY created_at DESC, id DESC")
+        return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Error fetching tasks: {e}")
         return []
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
 def get_task_by_id(task_id: int) -> Optional[Task]:
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = _task_factory
     try:
-        cursor.execute("SELECT id, description, priority, due_date, completed FROM tasks WHERE id = ?", (task_id,))
-        row = cursor.fetchone()
-        if row:
-            task = Task(id=row['id'], description=row['description'], priority=row['priority'],
-                        due_date=row['due_date'], completed=bool(row['completed']))
-            return task
-        return None
+        cursor.execute(f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?", (task_id,))
+        return cursor.fetchone()
     except sqlite3.Error as e:
         print(f"Error fetching task {task_id}: {e}")
         return None
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
+def get_tasks_by_ids(task_ids: Iterable[int]) -> Dict[int, Task]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = _task_factory
+    tasks: Dict[int, Task] = {}
+    try:
+        for chunk in _chunked(task_ids, BULK_CHUNK_SIZE):
+            cursor.execute(f"SELECT {TASK_COLUMNS} FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            tasks.update((task.id, task) for task in cursor.fetchall())
+        return tasks
+    except sqlite3.Error as e:
+        print(f"Error fetching tasks by id: {e}")
+        return {}
+    finally:
+        cursor.close()
+
+@instrumented
 def update_task_completion(task_id: int, completed: bool) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -112,8 +265,44 @@ def update_task_completion(task_id: int, completed: bool) -> bool:
         conn.rollback()
         return False
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
+def update_task_due_date(task_id: int, due_date: Optional[datetime.date]) -> bool:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE tasks SET due_date = ? WHERE id = ?", (due_date, task_id))
+        conn.commit()
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        print(f"Error updating due date for task ID {task_id}: {e}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+@instrumented
+def get_open_tasks_due_between(start: datetime.date, end: datetime.date) -> List[Task]:
+    """Uncompleted tasks with start <= due_date < end, soonest first."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = _task_factory
+    try:
+        # A range scan of idx_tasks_completed_due_date; no full table pass.
+        cursor.execute(f'''
+            SELECT {TASK_COLUMNS} FROM tasks
+            WHERE completed = 0 AND due_date >= ? AND due_date < ?
+            ORDER BY due_date, id
+        ''', (start.isoformat(), end.isoformat()))
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Error fetching tasks due between {start} and {end}: {e}")
+        return []
+    finally:
+        cursor.close()
+
+@instrumented
 def delete_task(task_id: int) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -126,84 +315,430 @@ def delete_task(task_id: int) -> bool:
         conn.rollback()
         return False
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
 def add_note(content: str, task_id: Optional[int] = None) -> Optional[Note]:
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        current_time = datetime.datetime.now()
+        note = Note(None, content, created_at=datetime.datetime.now(), task_id=task_id)
         cursor.execute('''
-            INSERT INTO notes (content, task_id, created_at)
-            VALUES (?, ?, ?)
-        ''', (content, task_id, current_time))
+            INSERT INTO notes (content, task_id, created_at, preview, content_length)
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING id
+        ''', (content, task_id, note.created_at, note.preview, note.content_length))
+        note.id = cursor.fetchone()[0]
         conn.commit()
-        new_id = cursor.lastrowid
-        if new_id is not None:
-            return get_note_by_id(new_id)
-        return None
+        return note
     except sqlite3.Error as e:
         print(f"Error adding note: {e}")
         conn.rollback()
         return None
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
 def get_note_by_id(note_id: int) -> Optional[Note]:
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = _note_factory
     try:
-        cursor.execute("SELECT id, content, task_id, created_at FROM notes WHERE id = ?", (note_id,))
-        row = cursor.fetchone()
-        if row:
-            note = Note(id=row['id'], content=row['content'], task_id=row['task_id'], created_at=row['created_at'])
-            return note
-        return None
+        cursor.execute(f"SELECT {NOTE_COLUMNS} FROM notes WHERE id = ?", (note_id,))
+        return cursor.fetchone()
     except sqlite3.Error as e:
         print(f"Error fetching note {note_id}: {e}")
         return None
     finally:
-        conn.close()
+        cursor.close()
 
-def get_all_notes() -> List[Note]:
+@instrumented
+def get_note_previews(note_ids: Iterable[int]) -> Dict[int, Note]:
+    """Notes without their content (as list views load them), by id."""
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = _note_factory
+    notes: Dict[int, Note] = {}
     try:
-        cursor.execute("SELECT id, content, task_id, created_at FROM notes ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        notes = [
-            Note(id=row['id'], content=row['content'], task_id=row['task_id'], created_at=row['created_at'])
-            for row in rows
-        ]
+        for chunk in _chunked(note_ids, BULK_CHUNK_SIZE):
+            cursor.execute(f"SELECT {NOTE_PREVIEW_COLUMNS} FROM notes WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            notes.update((note.id, note) for note in cursor.fetchall())
         return notes
+    except sqlite3.Error as e:
+        print(f"Error fetching note previews: {e}")
+        return {}
+    finally:
+        cursor.close()
+
+@instrumented
+def get_all_notes() -> List[Note]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = _note_factory
+    try:
+        cursor.execute(f"SELECT {NOTE_PREVIEW_COLUMNS} FROM notes ORDER BY created_at DESC, id DESC")
+        return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Error fetching all notes: {e}")
         return []
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
 def get_notes_for_task(task_id: int) -> List[Note]:
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = _note_factory
     try:
-        cursor.execute("SELECT id, content, task_id, created_at FROM notes WHERE task_id = ? ORDER BY created_at DESC", (task_id,))
-        rows = cursor.fetchall()
-        notes = [
-            Note(id=row['id'], content=row['content'], task_id=row['task_id'], created_at=row['created_at'])
-            for row in rows
-        ]
-        return notes
+        cursor.execute(f"SELECT {NOTE_PREVIEW_COLUMNS} FROM notes WHERE task_id = ? ORDER BY created_at DESC, id DESC", (task_id,))
+        return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Error fetching notes for task {task_id}: {e}")
         return []
     finally:
-        conn.close()
+        cursor.close()
+
+@instrumented
+def get_all_notes_with_tasks() -> List[Tuple[Note, Optional[str]]]:
+    # One LEFT JOIN instead of resolving each note's task separately; the
+    # description is None for general notes and for dangling task ids.
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = _note_with_task_factory
+    try:
+        cursor.execute('''
+            SELECT n.id, NULL AS content, n.task_id, n.created_at, n.preview, n.content_length,
+                   t.description AS task_description
+            FROM notes n LEFT JOIN tasks t ON t.id = n.task_id
+            ORDER BY n.created_at DESC, n.id DESC
+        ''')
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Error fetching notes with tasks: {e}")
+        return []
+    finally:
+        cursor.close()
+
+SEARCH_LIMIT = 50
+# bm25 has to score every matching row, which is slow for words that appear in
+# most of a large corpus. Ranking is therefore done over at most this many of
+# the newest matches per source; the cutoff is found by walking the doclist.
+SEARCH_CANDIDATES = 1000
+_SEARCH_SOURCES = {
+    "task": "tasks_fts",
+    "note": "notes_fts",
+}
+
+def _fts_match_expression(query: str) -> Optional[str]:
+    # Quote every word so user input can never be parsed as FTS5 syntax, and
+    # prefix-match the last one so results update while the user is typing.
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+@instrumented
+def search(query: str, limit: int = SEARCH_LIMIT, kind: Optional[str] = None) -> List[SearchResult]:
+    match = _fts_match_expression(query)
+    if match is None:
+        return []
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    results: List[SearchResult] = []
+    try:
+        for source in ([kind] if kind else _SEARCH_SOURCES):
+            table = _SEARCH_SOURCES[source]
+            cursor.execute(f"SELECT rowid FROM {table} WHERE {table} MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                           (match, SEARCH_CANDIDATES - 1))
+            cutoff = cursor.fetchone()
+            cursor.execute(f'''
+                SELECT rowid AS id, rank, snippet({table}, 0, '[', ']', '...', 12) AS snippet
+                FROM {table} WHERE {table} MATCH ? AND rowid >= ?
+                ORDER BY rank LIMIT ?
+            ''', (match, cutoff[0] if cutoff else 0, limit))
+            results.extend(SearchResult(kind=source, id=row['id'], snippet=row['snippet'], rank=row['rank'])
+                           for row in cursor.fetchall())
+        results.sort(key=lambda result: result.rank)
+        return results[:limit]
+    except sqlite3.Error as e:
+        print(f"Error searching for {query!r}: {e}")
+        return []
+    finally:
+        cursor.close()
+
+# ORDER BY per TaskQuery sort; each has a matching index (migration 4).
+TASK_SORTS = {
+    "created": "created_at DESC, id DESC",
+    "priority": "priority_rank DESC, created_at DESC, id DESC",
+    "due": "due_date, id",
+}
 
+class TaskQuery:
+    """
+    A filtered, sorted view of the tasks table, built with chained calls:
+
+        TaskQuery().open().with_priorities("Alta", "Media").sorted_by("due")
+
+    Filters become WHERE predicates and sorts follow an index, so a view
+    costs a range scan instead of a full table pass plus a Python sort.
+    """
+
+    def __init__(self):
+        self.completed: Optional[bool] = None  # None: both open and completed
+        self.priorities: Optional[FrozenSet[Priority]] = None  # None: any priority
+        self.due_from: Optional[datetime.date] = None  # inclusive
+        self.due_before: Optional[datetime.date] = None  # exclusive
+        self.text: Optional[str] = None  # full-text match, as in search()
+        self.sort = "created"
+        self.limit: Optional[int] = None
+
+    def open(self) -> "TaskQuery":
+        return self.with_status(False)
+
+    def done(self) -> "TaskQuery":
+        return self.with_status(True)
+
+    def with_status(self, completed: Optional[bool]) -> "TaskQuery":
+        self.completed = completed
+        return self
+
+    def with_priorities(self, *priorities: Union[str, Priority]) -> "TaskQuery":
+        self.priorities = frozenset(parse_priority(priority) for priority in priorities)
+        return self
+
+    def due_between(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None) -> "TaskQuery":
+        self.due_from, self.due_before = start, end
+        return self
+
+    def matching(self, text: Optional[str]) -> "TaskQuery":
+        self.text = text if text and text.strip() else None
+        return self
+
+    def sorted_by(self, sort: str) -> "TaskQuery":
+        if sort not in TASK_SORTS:
+            raise ValueError(f"Sort must be one of {', '.join(TASK_SORTS)}")
+        self.sort = sort
+        return self
+
+    def limited(self, limit: Optional[int]) -> "TaskQuery":
+        self.limit = limit
+        return self
+
+    def is_filtered(self, ignore_text: bool = False) -> bool:
+        return (self.completed is not None or self.priorities is not None or self.due_from is not None
+                or self.due_before is not None or (self.text is not None and not ignore_text))
+
+    def statements(self) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """The SQL for this view; rows of all statements, in order, form the result."""
+        where: List[str] = []
+        params: List[Any] = []
+        if self.completed is not None:
+            where.append("completed = ?")
+            params.append(self.completed)
+        if self.priorities is not None:
+            ranks = sorted(PRIORITY_RANKS[priority] for priority in self.priorities)
+            where.append(f"priority_rank IN ({','.join('?' * len(ranks))})")
+            params.extend(ranks)
+        if self.due_from is not None:
+            where.append("due_date >= ?")
+            params.append(self.due_from.isoformat())
+        if self.due_before is not None:
+            where.append("due_date < ?")
+            params.append(self.due_before.isoformat())
+        if self.text is not None:
+            where.append("id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)")
+            params.append(_fts_match_expression(self.text))
+        limit = f" LIMIT {int(self.limit)}" if self.limit is not None else ""
+
+        def select(extra: Optional[str], order_by: str) -> Tuple[str, Tuple[Any, ...]]:
+            clauses = where + ([extra] if extra else [])
+            where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            return f"SELECT {TASK_COLUMNS} FROM tasks{where_sql} ORDER BY {order_by}{limit}", tuple(params)
+
+        if self.sort == "due" and self.due_from is None and self.due_before is None:
+            # Undated tasks go last. "ORDER BY due_date IS NULL" would defeat
+            # the index, so dated and undated rows are read separately.
+            return [select("due_date IS NOT NULL", TASK_SORTS["due"]), select("due_date IS NULL", "id DESC")]
+        return [select(None, TASK_SORTS[self.sort])]
+
+    def __repr__(self) -> str:
+        priorities = sorted(p.value for p in self.priorities) if self.priorities is not None else None
+        return (f"TaskQuery(completed={self.completed!r}, priorities={priorities!r}, due_from={self.due_from!r}, "
+                f"due_before={self.due_before!r}, text={self.text!r}, sort={self.sort!r}, limit={self.limit!r})")
+
+@instrumented
+def query_tasks(query: TaskQuery) -> List[Task]:
+    if query.priorities is not None and not query.priorities:
+        return []
+    if query.text is not None and _fts_match_expression(query.text) is None:
+        return []
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = _task_factory
+    tasks: List[Task] = []
+    try:
+        for sql, params in query.statements():
+            cursor.execute(sql, params)
+            tasks.extend(cursor.fetchall())
+            if query.limit is not None and len(tasks) >= query.limit:
+                return tasks[:query.limit]
+        return tasks
+    except sqlite3.Error as e:
+        print(f"Error querying tasks with {query!r}: {e}")
+        return []
+    finally:
+        cursor.close()
+
+# Counts the stats triggers (migration 6) maintain, computed from scratch.
+_TASK_STATS_SOURCES = [
+    ("task_stats", ("priority_rank", "completed"),
+     "SELECT priority_rank, completed, count(*) FROM tasks GROUP BY priority_rank, completed"),
+    ("task_due_stats", ("due_date", "priority_rank"),
+     "SELECT due_date, priority_rank, count(*) FROM tasks "
+     "WHERE completed = 0 AND due_date IS NOT NULL GROUP BY due_date, priority_rank"),
+]
+_PRIORITIES_BY_RANK = {rank: priority for priority, rank in PRIORITY_RANKS.items()}
+
+@instrumented
+def get_task_stats(today: Optional[datetime.date] = None) -> Optional[TaskStats]:
+    """Open, completed and overdue counts per priority, without reading tasks."""
+    today = today if today else datetime.date.today()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # One statement, so all counts come from the same snapshot. Overdue
+        # sums one row per past due date and priority that still has open
+        # tasks, however many tasks that is.
+        cursor.execute('''
+            SELECT 'status', priority_rank, completed, task_count FROM task_stats
+            UNION ALL
+            SELECT 'overdue', priority_rank, NULL, sum(task_count) FROM task_due_stats
+            WHERE due_date < ? GROUP BY priority_rank
+            UNION ALL
+            SELECT 'today', NULL, NULL, sum(task_count) FROM task_due_stats WHERE due_date = ?
+        ''', (today.isoformat(), today.isoformat()))
+        stats = TaskStats()
+        for kind, rank, completed, count in cursor.fetchall():
+            if kind == "today":
+                stats.due_today = count or 0
+                continue
+            priority = _PRIORITIES_BY_RANK[rank]
+            if kind == "overdue":
+                stats.overdue[priority] = count
+            elif completed:
+                stats.completed[priority] += count
+            else:
+                stats.open[priority] += count
+        return stats
+    except sqlite3.Error as e:
+        print(f"Error fetching task stats: {e}")
+        return None
+    finally:
+        cursor.close()
+
+@instrumented
+def check_task_stats(repair: bool = False) -> Optional[List[str]]:
+    """
+    Recomputes the stats tables from tasks and describes every stored count
+    that differs; an empty list means they are consistent. With repair=True
+    the recomputed counts replace the stored ones.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    mismatches: List[str] = []
+    try:
+        # Inside one transaction, so a concurrent write cannot show up as a mismatch.
+        cursor.execute("BEGIN IMMEDIATE" if repair else "BEGIN")
+        for table, keys, source in _TASK_STATS_SOURCES:
+            actual = {tuple(row[:2]): row[2] for row in cursor.execute(source).fetchall()}
+            stored = {tuple(row[:2]): row[2] for row in
+                      cursor.execute(f"SELECT {', '.join(keys)}, task_count FROM {table}").fetchall() if row[2] != 0}
+            differing = [key for key in sorted(set(actual) | set(stored), key=repr)
+                         if actual.get(key, 0) != stored.get(key, 0)]
+            for key in differing:
+                where = ", ".join(f"{name}={value!r}" for name, value in zip(keys, key))
+                mismatches.append(f"{table} ({where}): stored {stored.get(key, 0)}, actual {actual.get(key, 0)}")
+            if repair and differing:
+                cursor.execute(f"DELETE FROM {table}")
+                cursor.execute(f"INSERT INTO {table} ({', '.join(keys)}, task_count) {source}")
+        conn.commit()
+        return mismatches
+    except sqlite3.Error as e:
+        print(f"Error checking task stats: {e}")
+        conn.rollback()
+        return None
+    finally:
+        cursor.close()
+
+# change_log (migration 7); see data.change_feed.ChangeFeed.
+
+def get_data_version() -> Optional[int]:
+    """PRAGMA data_version of this thread's connection: it changes only when another connection commits."""
+    try:
+        return get_db_connection().execute("PRAGMA data_version").fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"Error reading data version: {e}")
+        return None
+
+@instrumented
+def get_change_log_position() -> Optional[int]:
+    """The newest seq in change_log (0 when it has never had a row)."""
+    conn = get_db_connection()
+    try:
+        # sqlite_sequence rather than max(seq), which is gone once pruned.
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        return row[0] if row else 0
+    except sqlite3.Error as e:
+        print(f"Error reading change log position: {e}")
+        return None
+
+@instrumented
+def get_changes_since(seq: int, limit: int) -> Optional[List[Tuple[int, str, int, str]]]:
+    """(seq, kind, item_id, action) rows after seq, oldest first."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT seq, kind, item_id, action FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+                       (seq, limit))
+        return [tuple(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Error reading changes since {seq}: {e}")
+        return None
+    finally:
+        cursor.close()
+
+@instrumented
+def prune_change_log(older_than: datetime.timedelta) -> int:
+    """Deletes change_log rows written more than older_than ago; returns how many."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # seq and changed_at grow together, so everything before the first
+        # recent row goes; that scan stops there instead of reading the log.
+        cutoff = (datetime.datetime.now(datetime.timezone.utc) - older_than).strftime("%Y-%m-%d %H:%M:%S")
+        cursor.execute('''
+            DELETE FROM change_log WHERE seq < coalesce(
+                (SELECT seq FROM change_log WHERE changed_at >= ? ORDER BY seq LIMIT 1),
+                (SELECT max(seq) + 1 FROM change_log))
+        ''', (cutoff,))
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.Error as e:
+        print(f"Error pruning change log: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        cursor.close()
+
+@instrumented
 def update_note(note_id: int, content: str) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("UPDATE notes SET content = ? WHERE id = ?", (content, note_id))
+        cursor.execute("UPDATE notes SET content = ?, preview = ?, content_length = ? WHERE id = ?",
+                       (content, content[:NOTE_PREVIEW_CHARS], len(content), note_id))
         conn.commit()
         return cursor.rowcount > 0
     except sqlite3.Error as e:
@@ -211,8 +746,9 @@ def update_note(note_id: int, content: str) -> bool:
         conn.rollback()
         return False
     finally:
-        conn.close()
+        cursor.close()
 
+@instrumented
 def delete_note(note_id: int) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -225,12 +761,282 @@ def delete_note(note_id: int) -> bool:
         conn.rollback()
         return False
     finally:
-        conn.close()
+        cursor.close()
+
+PAGE_SIZE = 100
+ITER_BATCH_SIZE = 500
+
+# Keyset cursors are the (created_at, id) of the last row already shown; both
+# tables are listed newest first, with id breaking created_at ties.
+PageCursor = Tuple[datetime.datetime, int]
+
+def _fetch_page(table: str, columns: str, row_factory: Callable[[sqlite3.Cursor, Tuple[Any, ...]], Any],
+                after: Optional[PageCursor], limit: int) -> List[Any]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    try:
+        if after is None:
+            cursor.execute(f"SELECT {columns} FROM {table} ORDER BY created_at DESC, id DESC LIMIT ?", (limit,))
+        else:
+            cursor.execute(f'''
+                SELECT {columns} FROM {table}
+                WHERE (created_at, id) < (?, ?)
+                ORDER BY created_at DESC, id DESC LIMIT ?
+            ''', (after[0], after[1], limit))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+@instrumented
+def get_tasks_page(after: Optional[PageCursor] = None, limit: int = PAGE_SIZE) -> List[Task]:
+    try:
+        return _fetch_page("tasks", TASK_COLUMNS, _task_factory, after, limit)
+    except sqlite3.Error as e:
+        print(f"Error fetching tasks page after {after}: {e}")
+        return []
+
+@instrumented
+def get_notes_page(after: Optional[PageCursor] = None, limit: int = PAGE_SIZE) -> List[Note]:
+    try:
+        return _fetch_page("notes", NOTE_PREVIEW_COLUMNS, _note_factory, after, limit)
+    except sqlite3.Error as e:
+        print(f"Error fetching notes page after {after}: {e}")
+        return []
+
+def _iter_rows(sql: str, params: Tuple[Any, ...], row_factory: Callable[[sqlite3.Cursor, Tuple[Any, ...]], Any],
+               batch_size: int) -> Iterator[Any]:
+    # A dedicated cursor keeps the statement open between batches, so only
+    # batch_size rows are ever held in memory.
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = row_factory
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+@instrumented
+def iter_tasks(batch_size: int = ITER_BATCH_SIZE, oldest_first: bool = False) -> Iterator[Task]:
+    order = "created_at, id" if oldest_first else "created_at DESC, id DESC"
+    sql = f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY {order}"
+    yield from _iter_rows(sql, (), _task_factory, batch_size)
+
+@instrumented
+def iter_notes(batch_size: int = ITER_BATCH_SIZE, oldest_first: bool = False) -> Iterator[Note]:
+    order = "created_at, id" if oldest_first else "created_at DESC, id DESC"
+    sql = f"SELECT {NOTE_COLUMNS} FROM notes ORDER BY {order}"
+    yield from _iter_rows(sql, (), _note_factory, batch_size)
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    if size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _next_autoincrement_id(cursor: sqlite3.Cursor, table: str) -> int:
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    row = cursor.fetchone()
+    return (row[0] if row else 0) + 1
+
+def _insert_task_rows(cursor: sqlite3.Cursor, tasks: Sequence[Task]) -> List[Task]:
+    # Ids are taken from sqlite_sequence while the caller holds the write
+    # lock, so the created tasks can be returned without reading any row back.
+    next_id = _next_autoincrement_id(cursor, "tasks")
+    # Same value and resolution as the column's CURRENT_TIMESTAMP default.
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None, microsecond=0)
+    created = [Task(id=next_id + i, description=t.description, priority=t.priority, due_date=t.due_date,
+                    completed=bool(t.completed), created_at=t.created_at or now)
+               for i, t in enumerate(tasks)]
+    cursor.executemany('''
+        INSERT INTO tasks (id, description, priority, due_date, completed, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(t.id, t.description, t.priority, t.due_date, t.completed, t.created_at) for t in created])
+    return created
+
+def _insert_note_rows(cursor: sqlite3.Cursor, notes: Sequence[Note]) -> List[Note]:
+    next_id = _next_autoincrement_id(cursor, "notes")
+    created = [Note(id=next_id + i, content=n.content, created_at=n.created_at, task_id=n.task_id)
+               for i, n in enumerate(notes)]
+    cursor.executemany('''
+        INSERT INTO notes (id, content, task_id, created_at, preview, content_length)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(n.id, n.content, n.task_id, n.created_at, n.preview, n.content_length)
+          for n in created])
+    return created
 
-if not os.path.exists(INIT_FLAG_FILE):
-    initialize_database()
+@instrumented
+def add_tasks_bulk(tasks: Iterable[Task], chunk_size: int = BULK_CHUNK_SIZE) -> List[Task]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    created: List[Task] = []
     try:
-        with open(INIT_FLAG_FILE, 'w') as f:
-            f.write(datetime.datetime.now().isoformat())
-    except IOError as e:
-        print(f"Warning: Could not create initialization flag file: {e}")
\ No newline at end of file
+        cursor.execute("BEGIN IMMEDIATE")
+        for chunk in _chunked(tasks, chunk_size):
+            created.extend(_insert_task_rows(cursor, chunk))
+        conn.commit()
+        return created
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error adding tasks in bulk: {e}")
+        conn.rollback()
+        return []
+    finally:
+        cursor.close()
+
+@instrumented
+def add_notes_bulk(notes: Iterable[Note], chunk_size: int = BULK_CHUNK_SIZE) -> List[Note]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    created: List[Note] = []
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for chunk in _chunked(notes, chunk_size):
+            created.extend(_insert_note_rows(cursor, chunk))
+        conn.commit()
+        return created
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error adding notes in bulk: {e}")
+        conn.rollback()
+        return []
+    finally:
+        cursor.close()
+
+# File imports (data.transfer); progress lives in import_runs (migration 8).
+
+@instrumented
+def start_import(import_key: str, source: str) -> Optional[Tuple[int, bool]]:
+    """Registers an import if it is new; returns (records_done, finished) for it."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("INSERT OR IGNORE INTO import_runs (import_key, source) VALUES (?, ?)", (import_key, source))
+        cursor.execute("SELECT records_done, finished FROM import_runs WHERE import_key = ?", (import_key,))
+        records_done, finished = cursor.fetchone()
+        conn.commit()
+        return records_done, bool(finished)
+    except sqlite3.Error as e:
+        print(f"Error starting import of {source}: {e}")
+        conn.rollback()
+        return None
+    finally:
+        cursor.close()
+
+@instrumented
+def import_chunk(import_key: str, tasks: Sequence[Tuple[Optional[int], Task]], notes: Sequence[Note],
+                 records_done: int) -> Optional[int]:
+    """
+    Inserts one chunk of an import: tasks as (id in the file, task) and
+    notes whose task_id is an id from the file. The chunk and the import's
+    progress are committed together, so a resumed import picks up exactly
+    after the last chunk written. Note links are remapped through the tasks
+    imported so far (this chunk's included); returns how many could not be
+    resolved and were dropped.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        created = _insert_task_rows(cursor, [task for _, task in tasks])
+        cursor.executemany("INSERT OR REPLACE INTO import_task_ids (import_key, old_id, new_id) VALUES (?, ?, ?)",
+                           [(import_key, old_id, task.id) for (old_id, _), task in zip(tasks, created)
+                            if old_id is not None])
+        old_task_ids = list({note.task_id for note in notes if note.task_id is not None})
+        new_task_ids: Dict[int, int] = {}
+        for chunk in _chunked(old_task_ids, BULK_CHUNK_SIZE):
+            cursor.execute(f"SELECT old_id, new_id FROM import_task_ids WHERE import_key = ? "
+                           f"AND old_id IN ({','.join('?' * len(chunk))})", (import_key, *chunk))
+            new_task_ids.update(cursor.fetchall())
+        unlinked = sum(1 for note in notes if note.task_id is not None and note.task_id not in new_task_ids)
+        _insert_note_rows(cursor, [Note(None, note.content, note.created_at, new_task_ids.get(note.task_id))
+                                   for note in notes])
+        cursor.execute("UPDATE import_runs SET records_done = ? WHERE import_key = ?", (records_done, import_key))
+        conn.commit()
+        return unlinked
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error importing records up to {records_done}: {e}")
+        conn.rollback()
+        return None
+    finally:
+        cursor.close()
+
+@instrumented
+def finish_import(import_key: str) -> bool:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE import_runs SET finished = TRUE WHERE import_key = ?", (import_key,))
+        cursor.execute("DELETE FROM import_task_ids WHERE import_key = ?", (import_key,))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        print(f"Error finishing import: {e}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+@instrumented
+def forget_import(import_key: str) -> bool:
+    """Drops an import's progress, so the same file is imported again from the start."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM import_task_ids WHERE import_key = ?", (import_key,))
+        cursor.execute("DELETE FROM import_runs WHERE import_key = ?", (import_key,))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        print(f"Error forgetting import: {e}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+@instrumented
+def update_tasks_completion_bulk(updates: Iterable[Tuple[int, bool]],
+                                 chunk_size: int = BULK_CHUNK_SIZE) -> Optional[int]:
+    """Returns the number of rows updated, or None if nothing was written."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    updated = 0
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for chunk in _chunked(updates, chunk_size):
+            cursor.executemany("UPDATE tasks SET completed = ? WHERE id = ?",
+                               [(bool(completed), task_id) for task_id, completed in chunk])
+            updated += cursor.rowcount
+        conn.commit()
+        return updated
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error updating task completion in bulk: {e}")
+        conn.rollback()
+        return None
+    finally:
+        cursor.close()
+
+@instrumented
+def delete_tasks_bulk(task_ids: Iterable[int], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    deleted = 0
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for chunk in _chunked(task_ids, chunk_size):
+            cursor.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in chunk])
+            deleted += cursor.rowcount
+        conn.commit()
+        return deleted
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error deleting tasks in bulk: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        cursor.close()
@@ -0,0 +1,427 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Upper bounds (ms) of the latency histogram buckets; slower calls land in "inf".
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+SLOW_QUERY_LOG_SIZE = 200
+MAX_STATEMENTS_PER_CALL = 50  # statements kept per call for the slow-query log
+MAX_EXPLAINED_STATEMENTS = 5
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b", re.IGNORECASE)
+
+# Everything below is off until enable(). While disabled an instrumented
+# function costs one global lookup, and no trace callback is installed on
+# the connections.
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_toggle_listeners: List[Callable[[bool], None]] = []
+_explainer: Optional[Callable[[str], List[str]]] = None
+_slow_query_ms: Optional[float] = None
+_on_slow_query: Optional[Callable[[Dict[str, Any]], None]] = None
+_report_events = False
+_current_activity: contextvars.ContextVar = contextvars.ContextVar("db_activity", default=None)
+
+
+class FunctionStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.statements = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, seconds: float, rows: int, statements: int, error: bool):
+        self.calls += 1
+        self.errors += error
+        self.rows += rows
+        self.statements += statements
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        milliseconds = seconds * 1000
+        for bucket, bound in enumerate(LATENCY_BUCKETS_MS):
+            if milliseconds <= bound:
+                self.histogram[bucket] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "statements": self.statements,
+            "total_ms": self.total_seconds * 1000,
+            "mean_ms": self.total_seconds * 1000 / self.calls if self.calls else 0.0,
+            "max_ms": self.max_seconds * 1000,
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class Activity:
+    """
+    Database activity caused by one GUI event: every instrumented call made
+    inside capture(), including work it queued on the DB worker and the
+    callbacks that ran when that work finished. It is complete once nothing
+    it started is outstanding.
+    """
+
+    def __init__(self, label: str, on_complete: Optional[Callable[["Activity"], None]] = None):
+        self.label = label
+        self.functions: Dict[str, FunctionStats] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._on_complete = on_complete
+        self._outstanding = 1  # the capture() block itself
+        self._lock = threading.Lock()
+
+    def hold(self):
+        with self._lock:
+            self._outstanding += 1
+
+    def release(self):
+        with self._lock:
+            self._outstanding -= 1
+            done = self._outstanding == 0
+            if done:
+                self.finished = time.perf_counter()
+        if done and self._on_complete:
+            self._on_complete(self)
+
+    def _add(self, name: str, seconds: float, rows: int, statements: int, error: bool):
+        with self._lock:
+            stats = self.functions.get(name)
+            if stats is None:
+                stats = self.functions[name] = FunctionStats()
+            stats.add(seconds, rows, statements, error)
+
+    def summary(self) -> Dict[str, Any]:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return {
+            "label": self.label,
+            "elapsed_ms": (end - self.started) * 1000,
+            "calls": sum(stats.calls for stats in self.functions.values()),
+            "db_ms": sum(stats.total_seconds for stats in self.functions.values()) * 1000,
+            "functions": {name: stats.as_dict() for name, stats in self.functions.items()},
+        }
+
+    def report(self) -> str:
+        summary = self.summary()
+        lines = [f"DB activity for '{self.label}': {summary['calls']} calls, "
+                 f"{summary['db_ms']:.2f} ms in the database, {summary['elapsed_ms']:.1f} ms until done"]
+        for name, stats in summary["functions"].items():
+            lines.append(f"  {name}: {stats['calls']} x {stats['mean_ms']:.2f} ms, "
+                         f"{stats['rows']} rows, {stats['statements']} statements")
+        return "\n".join(lines)
+
+
+class _Call:
+    __slots__ = ("name", "statement_count", "statements")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statement_count = 0
+        self.statements: List[str] = []
+
+
+_functions: Dict[str, FunctionStats] = {}
+_connections_opened = 0
+_statements_outside_calls = 0
+_slow_queries: Deque[Dict[str, Any]] = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+
+def enable(slow_query_ms: Optional[float] = None,
+           on_slow_query: Optional[Callable[[Dict[str, Any]], None]] = None,
+           report_events: bool = False):
+    """
+    Starts collecting statistics. With slow_query_ms, calls that take at
+    least that long are logged together with the query plans of their
+    statements; report_events prints every captured Activity when it
+    completes.
+    """
+    global _enabled, _slow_query_ms, _on_slow_query, _report_events
+    _slow_query_ms = slow_query_ms
+    _on_slow_query = on_slow_query
+    _report_events = report_events
+    _enabled = True
+    for listener in list(_toggle_listeners):
+        listener(True)
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    for listener in list(_toggle_listeners):
+        listener(False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    global _connections_opened, _statements_outside_calls
+    with _lock:
+        _functions.clear()
+        _slow_queries.clear()
+        _connections_opened = 0
+        _statements_outside_calls = 0
+
+
+def add_toggle_listener(listener: Callable[[bool], None]):
+    """listener(enabled) runs on enable()/disable(), e.g. to install trace callbacks."""
+    _toggle_listeners.append(listener)
+
+
+def set_explainer(explainer: Callable[[str], List[str]]):
+    """explainer(sql) returns the EXPLAIN QUERY PLAN lines for sql on the calling thread's connection."""
+    global _explainer
+    _explainer = explainer
+
+
+def connection_opened(conn):
+    global _connections_opened
+    with _lock:
+        _connections_opened += 1
+    if _enabled:
+        conn.set_trace_callback(trace_statement)
+
+
+def trace_statement(sql: str):
+    """sqlite3 trace callback; installed on the connections only while enabled."""
+    global _statements_outside_calls
+    if getattr(_local, "explaining", False) or sql.startswith("--"):
+        return  # our own EXPLAIN queries, or trigger markers
+    calls = getattr(_local, "calls", None)
+    if not calls:
+        with _lock:
+            _statements_outside_calls += 1
+        return
+    call = calls[-1]
+    call.statement_count += 1
+    if _slow_query_ms is not None and len(call.statements) < MAX_STATEMENTS_PER_CALL:
+        call.statements.append(sql)
+
+
+def _row_count(result: Any) -> int:
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return 0
+    return 1
+
+
+def _explain(statements: List[str]) -> List[Dict[str, Any]]:
+    explained = []
+    seen = set()
+    for sql in statements:
+        if len(explained) >= MAX_EXPLAINED_STATEMENTS:
+            break
+        if sql in seen or not _EXPLAINABLE.match(sql):
+            continue
+        seen.add(sql)
+        plan: List[str] = []
+        if _explainer is not None:
+            _local.explaining = True
+            try:
+                plan = _explainer(sql)
+            except Exception as e:
+                plan = [f"(EXPLAIN QUERY PLAN failed: {e})"]
+            finally:
+                _local.explaining = False
+        explained.append({"sql": sql, "plan": plan})
+    return explained
+
+
+def _print_slow_query(entry: Dict[str, Any]):
+    print(f"Slow database call {entry['function']}: {entry['ms']:.1f} ms, {entry['statements']} statements")
+    for statement in entry["explained"]:
+        print(f"  {' '.join(statement['sql'].split())[:200]}")
+        for line in statement["plan"]:
+            print(f"    {line}")
+
+
+def _record(call: _Call, seconds: float, rows: int, error: bool):
+    with _lock:
+        stats = _functions.get(call.name)
+        if stats is None:
+            stats = _functions[call.name] = FunctionStats()
+        stats.add(seconds, rows, call.statement_count, error)
+    activity = _current_activity.get()
+    if activity is not None:
+        activity._add(call.name, seconds, rows, call.statement_count, error)
+    if _slow_query_ms is not None and seconds * 1000 >= _slow_query_ms:
+        entry = {"function": call.name, "ms": seconds * 1000, "statements": call.statement_count,
+                 "explained": _explain(call.statements), "at": time.time()}
+        with _lock:
+            _slow_queries.append(entry)
+        (_on_slow_query or _print_slow_query)(entry)
+
+
+def _push(call: _Call):
+    calls = getattr(_local, "calls", None)
+    if calls is None:
+        calls = _local.calls = []
+    calls.append(call)
+
+
+def _finish(call: _Call, start: float, rows: int, error: bool):
+    _local.calls.pop()
+    _record(call, time.perf_counter() - start, rows, error)
+
+
+def instrumented(func: Callable) -> Callable:
+    """Decorator for data-access functions: counts calls, latency, rows and statements while enabled."""
+    name = func.__name__
+
+    if inspect.isgeneratorfunction(func):
+        # Generators are timed from the first to the last row, with the
+        # time spent by the consumer between rows left out.
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not _enabled:
+                yield from func(*args, **kwargs)
+                return
+            generator = func(*args, **kwargs)
+            call = _Call(name)
+            rows, busy, error = 0, 0.0, False
+            try:
+                while True:
+                    _push(call)
+                    start = time.perf_counter()
+                    try:
+                        row = next(generator)
+                    except StopIteration:
+                        return
+                    except BaseException:
+                        error = True
+                        raise
+                    finally:
+                        busy += time.perf_counter() - start
+                        _local.calls.pop()
+                    rows += 1
+                    yield row
+            finally:
+                generator.close()
+                _record(call, busy, rows, error)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        call = _Call(name)
+        _push(call)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            _finish(call, start, 0, True)
+            raise
+        _finish(call, start, _row_count(result), False)
+        return result
+    return wrapper
+
+
+# Per-event activity
+
+def _print_activity(activity: Activity):
+    print(activity.report())
+
+
+@contextlib.contextmanager
+def capture(label: str, on_complete: Optional[Callable[[Activity], None]] = None) -> Iterator[Optional[Activity]]:
+    """
+    Attributes the database calls made inside the block (and the DB worker
+    jobs and callbacks it starts) to one Activity. Yields None while
+    instrumentation is disabled.
+    """
+    if not _enabled:
+        yield None
+        return
+    if on_complete is None and _report_events:
+        on_complete = _print_activity
+    activity = Activity(label, on_complete)
+    token = _current_activity.set(activity)
+    try:
+        yield activity
+    finally:
+        _current_activity.reset(token)
+        activity.release()
+
+
+def event(label: str) -> Callable[[Callable], Callable]:
+    """Decorator form of capture() for GUI event handlers."""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with capture(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_activity() -> Optional[Activity]:
+    return _current_activity.get() if _enabled else None
+
+
+@contextlib.contextmanager
+def activity_scope(activity: Optional[Activity]) -> Iterator[None]:
+    """Makes `activity` current in this thread for the block, e.g. on the DB worker."""
+    if activity is None:
+        yield
+        return
+    token = _current_activity.set(activity)
+    try:
+        yield
+    finally:
+        _current_activity.reset(token)
+
+
+def bind_activity(activity: Activity, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps func to run under activity on whatever thread calls it; the activity waits for it."""
+    activity.hold()
+    def run(*args, **kwargs):
+        try:
+            with activity_scope(activity):
+                return func(*args, **kwargs)
+        finally:
+            activity.release()
+    return run
+
+
+# Reporting
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "enabled": _enabled,
+            "connections_opened": _connections_opened,
+            "statements_outside_calls": _statements_outside_calls,
+            "functions": {name: stats.as_dict() for name, stats in _functions.items()},
+            "slow_queries": list(_slow_queries),
+        }
+
+
+def report() -> str:
+    data = snapshot()
+    lines = [f"Database instrumentation: {data['connections_opened']} connections opened, "
+             f"{len(data['slow_queries'])} slow calls logged"]
+    functions = sorted(data["functions"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    for name, stats in functions:
+        lines.append(f"  {name:<30} {stats['calls']:>7} calls {stats['mean_ms']:>9.3f} ms avg "
+                     f"{stats['max_ms']:>9.3f} ms max {stats['rows']:>9} rows {stats['statements']:>7} stmts")
+    return "\n".join(lines)
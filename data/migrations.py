@@ -0,0 +1,283 @@
+import sqlite3
+from typing import List, Tuple
+
+# Each entry is (version, statements). PRAGMA user_version records the last
+# version applied, so startup only has to read one integer when the schema is
+# current. Statements must be safe to re-run against databases created before
+# versioning existed (hence IF NOT EXISTS everywhere).
+MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (1, [
+        '''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            priority TEXT DEFAULT 'Media',
+            due_date DATE,
+            completed BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            task_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE SET NULL
+        )
+        ''',
+    ]),
+    (2, [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_notes_task_id ON notes (task_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_completed_due_date ON tasks (completed, due_date)",
+    ]),
+    (3, [
+        # External-content FTS5 indexes: the text lives only in tasks/notes,
+        # the triggers below keep the inverted index in step with it.
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            description, content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+            content, content='notes', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_after_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_after_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_after_update AFTER UPDATE OF description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS notes_fts_after_insert AFTER INSERT ON notes BEGIN
+            INSERT INTO notes_fts (rowid, content) VALUES (new.id, new.content);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS notes_fts_after_delete AFTER DELETE ON notes BEGIN
+            INSERT INTO notes_fts (notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS notes_fts_after_update AFTER UPDATE OF content ON notes BEGIN
+            INSERT INTO notes_fts (notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO notes_fts (rowid, content) VALUES (new.id, new.content);
+        END
+        ''',
+        # Index rows that existed before this migration.
+        "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+        "INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')",
+    ]),
+    (4, [
+        # Integer encoding of the priority text (core.models.PRIORITY_RANKS),
+        # so views can sort and filter on it through an index. A virtual
+        # generated column can be added in place and never disagrees with
+        # `priority`; only the indexes below store it.
+        '''
+        ALTER TABLE tasks ADD COLUMN priority_rank INTEGER
+        GENERATED ALWAYS AS (CASE priority WHEN 'Alta' THEN 2 WHEN 'Media' THEN 1 ELSE 0 END) VIRTUAL
+        ''',
+        # One index per TaskQuery sort, with and without a status filter
+        # (idx_tasks_created_at and idx_tasks_completed_due_date exist already).
+        "CREATE INDEX IF NOT EXISTS idx_tasks_completed_created_at ON tasks (completed, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_completed_priority ON tasks (completed, priority_rank, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority_rank, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date)",
+    ]),
+    (5, [
+        # List views read preview and content_length instead of the whole
+        # note. 120 is core.models.NOTE_PREVIEW_CHARS.
+        "ALTER TABLE notes ADD COLUMN preview TEXT",
+        "ALTER TABLE notes ADD COLUMN content_length INTEGER",
+        "UPDATE notes SET preview = substr(content, 1, 120), content_length = length(content)",
+    ]),
+    (6, [
+        # Task counts kept by triggers, so the stats header never scans tasks.
+        # task_stats counts tasks per (priority, completed); task_due_stats
+        # counts open tasks per (due date, priority), from which "overdue" is
+        # summed for whatever day it is. database.check_task_stats()
+        # recomputes both from tasks.
+        '''
+        CREATE TABLE IF NOT EXISTS task_stats (
+            priority_rank INTEGER NOT NULL,
+            completed BOOLEAN NOT NULL,
+            task_count INTEGER NOT NULL,
+            PRIMARY KEY (priority_rank, completed)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS task_due_stats (
+            due_date DATE NOT NULL,
+            priority_rank INTEGER NOT NULL,
+            task_count INTEGER NOT NULL,
+            PRIMARY KEY (due_date, priority_rank)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_after_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_stats (priority_rank, completed, task_count) VALUES (new.priority_rank, new.completed, 1)
+                ON CONFLICT DO UPDATE SET task_count = task_count + 1;
+            INSERT INTO task_due_stats (due_date, priority_rank, task_count)
+                SELECT new.due_date, new.priority_rank, 1 WHERE new.completed = 0 AND new.due_date IS NOT NULL
+                ON CONFLICT DO UPDATE SET task_count = task_count + 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_after_delete AFTER DELETE ON tasks BEGIN
+            UPDATE task_stats SET task_count = task_count - 1
+                WHERE priority_rank = old.priority_rank AND completed = old.completed;
+            UPDATE task_due_stats SET task_count = task_count - 1
+                WHERE due_date = old.due_date AND priority_rank = old.priority_rank AND old.completed = 0;
+            DELETE FROM task_due_stats
+                WHERE due_date = old.due_date AND priority_rank = old.priority_rank AND task_count = 0;
+        END
+        ''',
+        # The old row's counts are taken out and the new row's put in. Updates
+        # that leave all three columns as they were (e.g. a toggle written
+        # twice) skip the trigger.
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_after_update AFTER UPDATE OF priority, completed, due_date ON tasks
+        WHEN old.priority IS NOT new.priority OR old.completed IS NOT new.completed OR old.due_date IS NOT new.due_date
+        BEGIN
+            UPDATE task_stats SET task_count = task_count - 1
+                WHERE priority_rank = old.priority_rank AND completed = old.completed;
+            UPDATE task_due_stats SET task_count = task_count - 1
+                WHERE due_date = old.due_date AND priority_rank = old.priority_rank AND old.completed = 0;
+            DELETE FROM task_due_stats
+                WHERE due_date = old.due_date AND priority_rank = old.priority_rank AND task_count = 0;
+            INSERT INTO task_stats (priority_rank, completed, task_count) VALUES (new.priority_rank, new.completed, 1)
+                ON CONFLICT DO UPDATE SET task_count = task_count + 1;
+            INSERT INTO task_due_stats (due_date, priority_rank, task_count)
+                SELECT new.due_date, new.priority_rank, 1 WHERE new.completed = 0 AND new.due_date IS NOT NULL
+                ON CONFLICT DO UPDATE SET task_count = task_count + 1;
+        END
+        ''',
+        # Counts for the rows that existed before this migration.
+        '''
+        INSERT INTO task_stats (priority_rank, completed, task_count)
+        SELECT priority_rank, completed, count(*) FROM tasks GROUP BY priority_rank, completed
+        ''',
+        '''
+        INSERT INTO task_due_stats (due_date, priority_rank, task_count)
+        SELECT due_date, priority_rank, count(*) FROM tasks
+        WHERE completed = 0 AND due_date IS NOT NULL GROUP BY due_date, priority_rank
+        ''',
+    ]),
+    (7, [
+        # One row per insert, update or delete of a task or note, for other
+        # processes sharing the file to catch up from (data.change_feed).
+        # AUTOINCREMENT keeps seq increasing even after the newest rows are
+        # pruned, and since writers are serialized, committed seqs have no
+        # gaps except where old rows were pruned.
+        '''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_change_log_after_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO change_log (kind, item_id, action) VALUES ('task', new.id, 'added');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_change_log_after_update AFTER UPDATE ON tasks BEGIN
+            INSERT INTO change_log (kind, item_id, action) VALUES ('task', new.id, 'updated');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS tasks_change_log_after_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO change_log (kind, item_id, action) VALUES ('task', old.id, 'deleted');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS notes_change_log_after_insert AFTER INSERT ON notes BEGIN
+            INSERT INTO change_log (kind, item_id, action) VALUES ('note', new.id, 'added');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS notes_change_log_after_update AFTER UPDATE ON notes BEGIN
+            INSERT INTO change_log (kind, item_id, action) VALUES ('note', new.id, 'updated');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS notes_change_log_after_delete AFTER DELETE ON notes BEGIN
+            INSERT INTO change_log (kind, item_id, action) VALUES ('note', old.id, 'deleted');
+        END
+        ''',
+    ]),
+    (8, [
+        # Progress of file imports (data.transfer), committed with each chunk
+        # so an interrupted import can resume. import_task_ids maps the task
+        # ids in the file to the ids they were given, for linking notes; it
+        # is emptied once an import finishes.
+        '''
+        CREATE TABLE IF NOT EXISTS import_runs (
+            import_key TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            records_done INTEGER NOT NULL DEFAULT 0,
+            finished BOOLEAN NOT NULL DEFAULT FALSE,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS import_task_ids (
+            import_key TEXT NOT NULL,
+            old_id INTEGER NOT NULL,
+            new_id INTEGER NOT NULL,
+            PRIMARY KEY (import_key, old_id)
+        ) WITHOUT ROWID
+        ''',
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Brings the schema up to LATEST_VERSION and returns the resulting version."""
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    for version, statements in MIGRATIONS:
+        cursor = conn.cursor()
+        try:
+            # Take the write lock before re-reading the version so two
+            # processes starting together cannot apply the same step twice.
+            cursor.execute("BEGIN IMMEDIATE")
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    return get_schema_version(conn)
@@ -0,0 +1,325 @@
+import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import data.database as db
+    from core.models import Task, Note
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from core.models import Task, Note
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __repr__(self) -> str:
+        return f"CacheStats(hits={self.hits}, misses={self.misses})"
+
+
+# observer(kind, action, item_id, item): kind is "task" or "note", action is
+# "added", "updated", "completed" (tasks whose completed flag changed) or
+# "deleted". item is the cached model, or None for deletions and tasks that
+# are not cached.
+ChangeObserver = Callable[[str, str, int, Optional[Any]], None]
+
+
+class Repository:
+    """
+    Write-through, id-indexed cache of tasks and notes in front of
+    data.database. Lists are loaded from the database once and then kept up
+    to date by the repository's own write methods; call invalidate() after
+    writing through data.database directly.
+
+    Observers hear about every add, update and delete made through the
+    repository, on the thread that made it.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[int, Task] = {}
+        self._task_list: Optional[List[Task]] = None  # newest first, None until loaded
+        self._notes: Dict[int, Note] = {}
+        self._note_list: Optional[List[Note]] = None
+        # task_id -> description for tasks linked from notes, as returned by the
+        # notes JOIN; lets notes render before (or without) the task list.
+        self._linked_task_descriptions: Dict[int, str] = {}
+        self.task_stats = CacheStats()
+        self.note_stats = CacheStats()
+        self._observers: List[ChangeObserver] = []
+
+    def add_observer(self, observer: ChangeObserver):
+        self._observers.append(observer)
+
+    def _notify(self, kind: str, action: str, item_id: int, item: Optional[Any] = None):
+        for observer in self._observers:
+            try:
+                observer(kind, action, item_id, item)
+            except Exception as e:
+                print(f"Error in repository observer: {e}")
+
+    def invalidate(self):
+        self._tasks.clear()
+        self._task_list = None
+        self._notes.clear()
+        self._note_list = None
+        self._linked_task_descriptions.clear()
+
+    def apply_changes(self, changes: List[Tuple[str, int]]) -> List[Tuple[str, str, int, Optional[Any]]]:
+        """
+        Brings the cache in line with rows changed outside this repository
+        (as listed by ChangeFeed.poll()) and notifies observers. Each row is
+        re-read and compared with its cached model, so changes this process
+        made itself are no-ops. Returns the (kind, action, item_id, item)
+        notifications sent.
+        """
+        tasks = db.get_tasks_by_ids([item_id for kind, item_id in changes if kind == "task"])
+        note_ids = [item_id for kind, item_id in changes if kind == "note"]
+        # Full notes, since observers such as the semantic index need the text.
+        notes = {note_id: db.get_note_by_id(note_id) for note_id in note_ids}
+        applied = []
+        for kind, item_id in changes:
+            if kind == "task":
+                change = self._apply_task_row(item_id, tasks.get(item_id))
+            else:
+                change = self._apply_note_row(item_id, notes.get(item_id))
+            if change is not None:
+                self._notify(kind, change[0], item_id, change[1])
+                applied.append((kind, change[0], item_id, change[1]))
+        return applied
+
+    def _apply_task_row(self, task_id: int, row: Optional[Task]) -> Optional[Tuple[str, Optional[Task]]]:
+        task = self._tasks.get(task_id)
+        if row is None:
+            # Reported even when not cached: observers may know the task.
+            self._tasks.pop(task_id, None)
+            self._linked_task_descriptions.pop(task_id, None)
+            if task is not None and self._task_list is not None:
+                self._task_list.remove(task)
+            return "deleted", None
+        if task_id in self._linked_task_descriptions:
+            self._linked_task_descriptions[task_id] = row.description
+        if task is None:
+            if self._task_list is None:
+                return "updated", row # not cached; the list will load it when needed
+            self._tasks[task_id] = row
+            self._task_list.insert(0, row) # newest first, as add_task() does
+            return "added", row
+        if (task.description, task.priority, task.due_date) != (row.description, row.priority, row.due_date):
+            task.description, task.priority, task.due_date = row.description, row.priority, row.due_date
+            task.completed = row.completed
+            return "updated", task
+        if task.completed != row.completed:
+            task.completed = row.completed
+            return "completed", task
+        return None
+
+    def _apply_note_row(self, note_id: int, row: Optional[Note]) -> Optional[Tuple[str, Optional[Note]]]:
+        note = self._notes.get(note_id)
+        if row is None:
+            self._notes.pop(note_id, None)
+            if note is not None and self._note_list is not None:
+                self._note_list.remove(note)
+            return "deleted", None
+        if note is None:
+            if self._note_list is None:
+                return "updated", row
+            self._notes[note_id] = row
+            self._note_list.insert(0, row)
+            return "added", row
+        if note.content is not None:
+            unchanged = note.content == row.content
+        else: # only the preview is loaded
+            unchanged = (note.preview, note.content_length) == (row.preview, row.content_length)
+        if unchanged and note.task_id == row.task_id:
+            return None
+        note.set_content(row.content)
+        note.task_id = row.task_id
+        return "updated", note
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        return {"tasks": self.task_stats.as_dict(), "notes": self.note_stats.as_dict()}
+
+    # Tasks
+
+    @property
+    def tasks_by_id(self) -> Dict[int, Task]:
+        return self._tasks
+
+    def task_description(self, task_id: int) -> Optional[str]:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            return task.description
+        return self._linked_task_descriptions.get(task_id)
+
+    def list_tasks(self) -> List[Task]:
+        if self._task_list is None:
+            self.task_stats.misses += 1
+            # Keep models handed out earlier (e.g. by first_task_page) so
+            # changes already applied to them are not lost.
+            self._task_list = [self._tasks.get(task.id, task) for task in db.get_all_tasks() if task.id is not None]
+            self._tasks = {task.id: task for task in self._task_list}
+        else:
+            self.task_stats.hits += 1
+        return self._task_list
+
+    def first_task_page(self, limit: int = db.PAGE_SIZE) -> List[Task]:
+        """The newest tasks, for showing something before list_tasks() has loaded."""
+        if self._task_list is not None:
+            self.task_stats.hits += 1
+            return self._task_list[:limit]
+        self.task_stats.misses += 1
+        tasks = db.get_tasks_page(limit=limit)
+        for task in tasks:
+            self._tasks.setdefault(task.id, task)
+        return [self._tasks[task.id] for task in tasks]
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self.task_stats.hits += 1
+            return task
+        self.task_stats.misses += 1
+        task = db.get_task_by_id(task_id)
+        if task is not None:
+            self._tasks[task_id] = task
+        return task
+
+    def add_task(self, description: str, priority: str = "Media",
+                 due_date: Optional[datetime.date] = None) -> Optional[Task]:
+        task = db.add_task(description=description, priority=priority, due_date=due_date)
+        if task is not None and task.id is not None:
+            self._tasks[task.id] = task
+            if self._task_list is not None:
+                self._task_list.insert(0, task)
+            self._notify("task", "added", task.id, task)
+        return task
+
+    def set_task_completed(self, task_id: int, completed: bool) -> bool:
+        if not db.update_task_completion(task_id, completed):
+            return False
+        self.apply_task_completed(task_id, completed)
+        return True
+
+    def apply_task_completed(self, task_id: int, completed: bool):
+        """Updates only the cached model, for writes that are buffered elsewhere."""
+        task = self._tasks.get(task_id)
+        if task is not None:
+            task.completed = completed
+        self._notify("task", "completed", task_id, task)
+
+    def set_task_due_date(self, task_id: int, due_date: Optional[datetime.date]) -> Optional[Task]:
+        if not db.update_task_due_date(task_id, due_date):
+            return None
+        task = self._tasks.get(task_id)
+        if task is None:
+            task = self.get_task(task_id)
+        else:
+            task.due_date = due_date
+        if task is not None:
+            self._notify("task", "updated", task_id, task)
+        return task
+
+    def delete_task(self, task_id: int) -> bool:
+        if not db.delete_task(task_id):
+            return False
+        task = self._tasks.pop(task_id, None)
+        self._linked_task_descriptions.pop(task_id, None)
+        if task is not None and self._task_list is not None:
+            self._task_list.remove(task)
+        self._notify("task", "deleted", task_id)
+        return True
+
+    def query_tasks(self, query: db.TaskQuery) -> List[Task]:
+        # SQL does the filtering and ordering; rows already cached are
+        # returned as the cached models so in-memory changes carry over.
+        tasks = []
+        for task in db.query_tasks(query):
+            tasks.append(self._tasks.setdefault(task.id, task))
+        return tasks
+
+    def search_tasks(self, query: str, limit: int = db.SEARCH_LIMIT) -> List[Task]:
+        # The FTS index does the matching; the models come from the cache.
+        tasks = (self.get_task(result.id) for result in db.search(query, limit=limit, kind="task"))
+        return [task for task in tasks if task is not None]
+
+    # Notes
+
+    def list_notes(self) -> List[Note]:
+        if self._note_list is None:
+            self.note_stats.misses += 1
+            self._note_list = []
+            for note, task_description in db.get_all_notes_with_tasks():
+                if note.id is None:
+                    continue
+                self._note_list.append(note)
+                if note.task_id is not None and task_description is not None:
+                    self._linked_task_descriptions[note.task_id] = task_description
+            self._notes = {note.id: note for note in self._note_list}
+        else:
+            self.note_stats.hits += 1
+        return self._note_list
+
+    def get_note(self, note_id: int) -> Optional[Note]:
+        """The note with its full content, which list_notes() leaves unloaded."""
+        note = self._notes.get(note_id)
+        if note is not None and note.content is not None:
+            self.note_stats.hits += 1
+            return note
+        self.note_stats.misses += 1
+        loaded = db.get_note_by_id(note_id)
+        if loaded is None:
+            return None
+        if note is None:
+            self._notes[note_id] = note = loaded
+        else:
+            note.set_content(loaded.content) # the list keeps showing the same object
+        return note
+
+    def add_note(self, content: str, task_id: Optional[int] = None) -> Optional[Note]:
+        note = db.add_note(content=content, task_id=task_id)
+        if note is not None and note.id is not None:
+            self._notes[note.id] = note
+            if self._note_list is not None:
+                self._note_list.insert(0, note)
+            self._notify("note", "added", note.id, note)
+        return note
+
+    def update_note(self, note_id: int, content: str) -> Optional[Note]:
+        if not db.update_note(note_id, content):
+            return None
+        note = self._notes.get(note_id)
+        if note is None:
+            note = self.get_note(note_id)
+        else:
+            note.set_content(content)
+        if note is not None:
+            self._notify("note", "updated", note_id, note)
+        return note
+
+    def delete_note(self, note_id: int) -> bool:
+        if not db.delete_note(note_id):
+            return False
+        note = self._notes.pop(note_id, None)
+        if note is not None and self._note_list is not None:
+            self._note_list.remove(note)
+        self._notify("note", "deleted", note_id)
+        return True
+
+    def search_notes(self, query: str, limit: int = db.SEARCH_LIMIT) -> List[Note]:
+        # Results are shown as list rows, so uncached ones are read as
+        # previews, in one query rather than one per result.
+        note_ids = [result.id for result in db.search(query, limit=limit, kind="note")]
+        missing = [note_id for note_id in note_ids if note_id not in self._notes]
+        self.note_stats.hits += len(note_ids) - len(missing)
+        if missing:
+            self.note_stats.misses += 1
+            for note_id, note in db.get_note_previews(missing).items():
+                self._notes[note_id] = note
+        return [self._notes[note_id] for note_id in note_ids if note_id in self._notes]
@@ -0,0 +1,366 @@
+"""
+Streams tasks and notes to and from JSONL or CSV files.
+
+    python -m data.transfer export backup.jsonl
+    python -m data.transfer import backup.jsonl
+    python -m data.transfer export notes.csv --database other.db
+
+Every record has a "type" of "task" or "note". Tasks carry id, description,
+priority, due_date (YYYY-MM-DD), completed and created_at; notes carry id,
+content, task_id and created_at. CSV files have one column per field, left
+empty where a field does not apply. Exports write all tasks, then all
+notes, oldest first.
+
+Imports read and validate CHUNK_SIZE records at a time and insert each
+chunk in one transaction. Imported rows get new ids; a note's task_id
+refers to the task's id in the file and is remapped, so tasks must come
+before the notes linked to them (as in exports). Progress is committed with
+every chunk: running the same import again after an interruption resumes
+where it stopped. Memory use does not grow with the file.
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple
+
+try:
+    import data.database as db
+    from core.models import Task, Note, parse_priority
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from core.models import Task, Note, parse_priority
+
+CHUNK_SIZE = db.BULK_CHUNK_SIZE
+FORMATS = ("jsonl", "csv")
+CSV_FIELDS = ["type", "id", "description", "priority", "due_date", "completed", "created_at", "task_id", "content"]
+PROGRESS_INTERVAL_SECONDS = 2.0
+MAX_REPORTED_ERRORS = 20
+
+# Notes can be far longer than csv's default 128 KiB field limit.
+csv.field_size_limit(2 ** 31 - 1)
+
+
+class TransferStats:
+    __slots__ = ("records", "tasks", "notes", "skipped", "unlinked", "seconds")
+
+    def __init__(self):
+        self.records = 0   # records read (for imports, including resumed-over ones)
+        self.tasks = 0
+        self.notes = 0
+        self.skipped = 0   # invalid records
+        self.unlinked = 0  # notes whose task was not in the file
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.tasks + self.notes) / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"TransferStats(records={self.records!r}, tasks={self.tasks!r}, notes={self.notes!r}, "
+                f"skipped={self.skipped!r}, unlinked={self.unlinked!r}, seconds={self.seconds:.3f})")
+
+
+def format_for(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Format must be one of {', '.join(FORMATS)}")
+        return fmt
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the format of '{path}'; pass --format")
+
+
+def _timestamp(value: Optional[datetime.datetime]) -> Optional[str]:
+    return value.isoformat(sep=" ") if value else None
+
+
+# Export
+
+def _task_record(task: Task) -> Dict[str, Any]:
+    return {"type": "task", "id": task.id, "description": task.description, "priority": task.priority.value,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "completed": task.completed, "created_at": _timestamp(task.created_at)}
+
+
+def _note_record(note: Note) -> Dict[str, Any]:
+    return {"type": "note", "id": note.id, "content": note.content, "task_id": note.task_id,
+            "created_at": _timestamp(note.created_at)}
+
+
+def _records() -> Iterator[Dict[str, Any]]:
+    # Both iterators read in batches; notes come with their full content.
+    for task in db.iter_tasks(oldest_first=True):
+        yield _task_record(task)
+    for note in db.iter_notes(oldest_first=True):
+        yield _note_record(note)
+
+
+def export_records(out: IO[str], fmt: str,
+                   progress: Optional[Callable[[TransferStats], None]] = None) -> TransferStats:
+    stats = TransferStats()
+    start = time.perf_counter()
+    last_report = start
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+    for record in _records():
+        if writer is not None:
+            writer.writerow(record)
+        else:
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write("\n")
+        stats.records += 1
+        if record["type"] == "task": stats.tasks += 1
+        else: stats.notes += 1
+        if progress and time.perf_counter() - last_report >= PROGRESS_INTERVAL_SECONDS:
+            last_report = time.perf_counter()
+            stats.seconds = last_report - start
+            progress(stats)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def export_file(path: str, fmt: Optional[str] = None,
+                progress: Optional[Callable[[TransferStats], None]] = None) -> TransferStats:
+    """Writes every task and note to path ("-" for stdout)."""
+    fmt = format_for(path, fmt) if path != "-" else (fmt or "jsonl")
+    if path == "-":
+        return export_records(sys.stdout, fmt, progress)
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        return export_records(out, fmt, progress)
+
+
+# Import
+
+def _read_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(line number, raw record) pairs; JSONL records are still unparsed text."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield line_number, line
+
+
+def _optional(record: Dict[str, Any], field: str) -> Any:
+    value = record.get(field)
+    return None if value is None or value == "" else value
+
+
+def _parse_id(value: Any, field: str) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{field} must be an integer")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{field} must be an integer, not {value!r}")
+
+
+def _parse_completed(value: Any) -> bool:
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes"):
+        return True
+    if text in ("0", "false", "no"):
+        return False
+    raise ValueError(f"completed must be true or false, not {value!r}")
+
+
+def _parse_created_at(value: Any, now: datetime.datetime) -> datetime.datetime:
+    if value is None:
+        return now
+    try:
+        moment = datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"created_at must be an ISO timestamp, not {value!r}")
+    if moment.tzinfo is not None: # stored timestamps are naive UTC
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _parse_record(raw: Any, fmt: str, now: datetime.datetime) -> Tuple[Optional[int], Any]:
+    """(id in the file, Task or Note); raises ValueError for an invalid record."""
+    if fmt == "jsonl":
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON: {e}")
+        if not isinstance(record, dict):
+            raise ValueError("a record must be a JSON object")
+    else:
+        record = raw
+    kind = record.get("type")
+    old_id = _parse_id(_optional(record, "id"), "id")
+    created_at = _parse_created_at(_optional(record, "created_at"), now)
+    if kind == "task":
+        description = _optional(record, "description")
+        if not isinstance(description, str) or not description.strip():
+            raise ValueError("a task needs a description")
+        due_date = _optional(record, "due_date")
+        try:
+            due_date = datetime.date.fromisoformat(due_date) if due_date is not None else None
+        except (TypeError, ValueError):
+            raise ValueError(f"due_date must be YYYY-MM-DD, not {due_date!r}")
+        priority = _optional(record, "priority") or "Media"
+        if not isinstance(priority, str):
+            raise ValueError(f"priority must be text, not {priority!r}")
+        priority = parse_priority(priority)
+        return old_id, Task(None, description, priority, due_date, _parse_completed(_optional(record, "completed")),
+                            created_at)
+    if kind == "note":
+        content = _optional(record, "content")
+        if not isinstance(content, str):
+            raise ValueError("a note needs content")
+        return old_id, Note(None, content, created_at, _parse_id(_optional(record, "task_id"), "task_id"))
+    raise ValueError(f"type must be 'task' or 'note', not {kind!r}")
+
+
+def import_records(records: Iterator[Tuple[int, Any]], fmt: str, import_key: str, skip: int = 0,
+                   chunk_size: int = CHUNK_SIZE, strict: bool = False,
+                   on_error: Callable[[int, str], None] = lambda line, message: None,
+                   progress: Optional[Callable[[TransferStats], None]] = None) -> Optional[TransferStats]:
+    """
+    Imports raw records under import_key, after skipping the first `skip`
+    (already imported by an interrupted run). Returns None if a chunk could
+    not be written, or with strict=True on the first invalid record;
+    progress up to the last written chunk is kept either way.
+    """
+    stats = TransferStats()
+    stats.records = skip
+    start = time.perf_counter()
+    last_report = start
+    remaining = iter(records)
+    for _ in zip(range(skip), remaining):
+        pass
+    while True:
+        chunk = [record for _, record in zip(range(chunk_size), remaining)]
+        if not chunk:
+            break
+        # Same value and resolution as the column's CURRENT_TIMESTAMP default.
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None, microsecond=0)
+        tasks: List[Tuple[Optional[int], Task]] = []
+        notes: List[Note] = []
+        for line, raw in chunk:
+            try:
+                old_id, item = _parse_record(raw, fmt, now)
+            except ValueError as e:
+                stats.skipped += 1
+                on_error(line, str(e))
+                if strict:
+                    return None
+                continue
+            if isinstance(item, Task): tasks.append((old_id, item))
+            else: notes.append(item)
+        unlinked = db.import_chunk(import_key, tasks, notes, stats.records + len(chunk))
+        if unlinked is None:
+            return None
+        stats.records += len(chunk)
+        stats.tasks += len(tasks)
+        stats.notes += len(notes)
+        stats.unlinked += unlinked
+        if progress and time.perf_counter() - last_report >= PROGRESS_INTERVAL_SECONDS:
+            last_report = time.perf_counter()
+            stats.seconds = last_report - start
+            progress(stats)
+    stats.seconds = time.perf_counter() - start
+    db.finish_import(import_key)
+    return stats
+
+
+def import_key_for(path: str) -> str:
+    # The same file, unchanged, resumes; a different or edited file starts over.
+    info = os.stat(path)
+    return f"{os.path.abspath(path)}|{info.st_size}|{info.st_mtime_ns}"
+
+
+def import_file(path: str, fmt: Optional[str] = None, chunk_size: int = CHUNK_SIZE, strict: bool = False,
+                restart: bool = False, on_error: Callable[[int, str], None] = lambda line, message: None,
+                progress: Optional[Callable[[TransferStats], None]] = None) -> Optional[TransferStats]:
+    fmt = format_for(path, fmt)
+    import_key = import_key_for(path)
+    if restart:
+        db.forget_import(import_key)
+    state = db.start_import(import_key, os.path.abspath(path))
+    if state is None:
+        return None
+    records_done, finished = state
+    if finished:
+        print(f"{path} was already imported; pass --restart to import it again.", file=sys.stderr)
+        return TransferStats()
+    if records_done:
+        print(f"Resuming the import of {path} after record {records_done}.", file=sys.stderr)
+    with open(path, "r", encoding="utf-8", newline="") as stream:
+        return import_records(_read_records(stream, fmt), fmt, import_key, skip=records_done, chunk_size=chunk_size,
+                              strict=strict, on_error=on_error, progress=progress)
+
+
+# Command line
+
+def _report(verb: str, stats: TransferStats, final: bool = False):
+    line = (f"{verb} {stats.tasks} tasks and {stats.notes} notes in {stats.seconds:.1f} s "
+            f"({stats.rows_per_second:,.0f} rows/s)")
+    if final and (stats.skipped or stats.unlinked):
+        line += f"; {stats.skipped} invalid records skipped, {stats.unlinked} note links dropped"
+    print(line, file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m data.transfer",
+                                     description="Import or export NexusTask AI tasks and notes")
+    parser.add_argument("--database", help="database file to use instead of the default")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="write every task and note to a file")
+    export_parser.add_argument("path", help="output file, or - for stdout")
+    import_parser = subparsers.add_parser("import", help="add the tasks and notes in a file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records per transaction")
+    import_parser.add_argument("--strict", action="store_true", help="stop at the first invalid record")
+    import_parser.add_argument("--restart", action="store_true",
+                               help="ignore an earlier run of this import and start from the first record")
+    for subparser in (export_parser, import_parser):
+        subparser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    args = parser.parse_args(argv)
+
+    if args.database:
+        db.configure_database(args.database)
+    try:
+        if args.command == "export":
+            stats = export_file(args.path, args.format, progress=lambda s: _report("Exported", s))
+            _report("Exported", stats, final=True)
+            return 0
+        reported_errors = [0]
+        def on_error(line: int, message: str):
+            reported_errors[0] += 1
+            if reported_errors[0] <= MAX_REPORTED_ERRORS:
+                print(f"{args.path}:{line}: {message}", file=sys.stderr)
+        stats = import_file(args.path, args.format, chunk_size=args.chunk_size, strict=args.strict,
+                            restart=args.restart, on_error=on_error, progress=lambda s: _report("Imported", s))
+        if stats is None:
+            print("Import stopped. Chunks written so far are kept; the same command resumes after them.",
+                  file=sys.stderr)
+            return 1
+        _report("Imported", stats, final=True)
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close_database()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    import data.database as db
+    from data import instrumentation
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from data import instrumentation
+
+
+class DatabaseWorker:
+    """
+    Runs data-access calls on one dedicated thread, in submission order, and
+    hands back a Future for each. Because requests are queued rather than
+    awaited, callers can issue several writes back to back and each one
+    starts as soon as the previous finishes; ordering still gives
+    read-your-writes.
+    """
+
+    def __init__(self, name: str = "nexus-db-worker"):
+        self._queue: "queue.Queue[Optional[Tuple[Future, Callable[..., Any], tuple, dict]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stopped = False
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("DatabaseWorker has been shut down")
+            self._pending += 1
+        activity = instrumentation.current_activity()
+        if activity is not None:
+            func = instrumentation.bind_activity(activity, func)
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            future, func, args, kwargs = request
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            with self._lock:
+                self._pending -= 1
+        # Connections are per thread; release this one before the thread exits.
+        db.get_connection_manager().close()
+
+    def shutdown(self, wait: bool = True):
+        """Stops accepting work; queued requests still run before the thread exits."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
@@ -0,0 +1,126 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import data.database as db
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+
+FLUSH_DELAY_SECONDS = 0.5
+MAX_PENDING = 256
+
+
+class WriteBehindBuffer:
+    """
+    Collects task completion updates and writes them in one transaction.
+    Repeated updates to the same task before a flush collapse into the last
+    one. A flush happens FLUSH_DELAY_SECONDS after the first buffered update,
+    as soon as MAX_PENDING tasks are buffered, or on close(). A batch that
+    fails to write goes back into the buffer, behind any newer update for the
+    same task, and is retried after another FLUSH_DELAY_SECONDS.
+
+    `submit` decides where flushes run (e.g. DatabaseWorker.submit); by
+    default they run on the timer thread, or the caller's for explicit ones.
+    """
+
+    def __init__(self,
+                 write_func: Callable[[Iterable[Tuple[int, bool]]], Optional[int]] = db.update_tasks_completion_bulk,
+                 flush_delay: float = FLUSH_DELAY_SECONDS, max_pending: int = MAX_PENDING,
+                 submit: Optional[Callable[[Callable[[], int]], Any]] = None):
+        self._write_func = write_func
+        self._flush_delay = flush_delay
+        self._max_pending = max_pending
+        self._submit = submit
+        self._lock = threading.Lock()
+        self._pending: Dict[int, bool] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._flush_requested = False  # a flush is already on its way
+        self._closed = False
+        self.queued = 0      # updates accepted
+        self.coalesced = 0   # updates absorbed by a later one for the same task
+        self.written = 0     # rows actually updated in the database
+        self.flushes = 0     # transactions issued
+        self.failed = 0      # flushes whose batch was put back
+
+    def set_completed(self, task_id: int, completed: bool):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WriteBehindBuffer is closed")
+            if task_id in self._pending:
+                self.coalesced += 1
+            self._pending[task_id] = completed
+            self.queued += 1
+            full = len(self._pending) >= self._max_pending
+            if not full:
+                self._start_timer()
+        if full:
+            self._dispatch_flush()
+
+    def _start_timer(self):
+        # Callers hold self._lock.
+        if self._timer is None:
+            self._timer = threading.Timer(self._flush_delay, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self.queued, "coalesced": self.coalesced, "written": self.written,
+                "flushes": self.flushes, "failed": self.failed, "pending": len(self._pending)}
+
+    def _on_timer(self):
+        self._dispatch_flush()
+        if self._submit is None:
+            # The timer thread is about to exit; don't leave its connection open.
+            db.get_connection_manager().close()
+
+    def _dispatch_flush(self):
+        with self._lock:
+            if self._flush_requested:
+                return
+            self._flush_requested = True
+        if self._submit is not None:
+            self._submit(self.flush)
+        else:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._pending = self._pending, {}
+            self._flush_requested = False
+        if not batch:
+            return 0
+        try:
+            written = self._write_func(list(batch.items()))
+        except Exception as e:
+            print(f"Error writing task completions: {e}")
+            written = None
+        with self._lock:
+            self.flushes += 1
+            if written is not None:
+                self.written += written
+                return written
+            self.failed += 1
+            # Updates made since the batch was taken are newer; keep those.
+            for task_id, completed in batch.items():
+                self._pending.setdefault(task_id, completed)
+            if self._closed:
+                print(f"Error: {len(self._pending)} task completion updates could not be saved")
+            else:
+                self._start_timer()
+        return 0
+
+    def close(self):
+        """Stops accepting updates and flushes whatever is still buffered."""
+        with self._lock:
+            self._closed = True
+        self._dispatch_flush()
@@ -1,18 +1,34 @@
 import customtkinter as ctk
 import tkinter as tk
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Sequence
 import datetime
 import os
 
 try:
     import data.database as db
-    from core.models import Task, Note
-    from gui.components.task_item_widget import TaskItemWidget
+    from data import instrumentation
+    from data.repository import Repository
+    from data.write_behind import WriteBehindBuffer
+    from data.worker import DatabaseWorker
+    from data.change_feed import ChangeFeed
+    from gui.async_data import AsyncDataAccess
+    from core.models import Task, Note, TaskStats, PRIORITY_RANKS
+    from gui.components.task_item_widget import TaskItemWidget, wraplength_for_width
+    from gui.components.note_item_widget import NoteItemWidget
+    from gui.components.virtual_list import VirtualListView
+    from gui.components.toast import Toast
+    from notifications.scheduler import ReminderScheduler, Reminder
+    from notifications.sinks import LoggingSink, ToastSink
 except ImportError as e:
     print(f"Error importing modules in app_window: {e}")
     import sys
     sys.exit(1)
 
+try:
+    from llm_integration.semantic_index import SemanticIndex, RELATED_LIMIT
+except ImportError: # numpy is optional; without it there is no Related panel
+    SemanticIndex = None
+
 APP_THEME_COLORS = {
     "main_bg_color": ("#F9F9F9", "#242424"),
     "tab_fg_color": ("#FFFFFF", "#2B2B2B"),
@@ -29,9 +45,28 @@ APP_THEME_COLORS = {
     "completed_desc_color": ("#707070", "#888888")
 }
 
+NO_TASK_LINK_LABEL = "General Note (No Task)"
+
+# Fixed slot heights (card plus vertical gap) for the virtualized lists.
+TASK_ROW_HEIGHT = 76
+NOTE_ROW_HEIGHT = 70
+
+SEARCH_DEBOUNCE_MS = 250
+TOAST_POLL_INTERVAL_MS = 1000
+SEARCH_RESULT_LIMIT = 200
+
+# Filter bar choices -> TaskQuery arguments.
+TASK_STATUS_FILTERS: Dict[str, Optional[bool]] = {"All": None, "Open": False, "Done": True}
+TASK_SORT_OPTIONS: Dict[str, str] = {"Newest": "created", "Priority": "priority", "Due date": "due"}
+RELATED_TEXT_CHARS = 40
+STATS_REFRESH_DELAY_MS = 300
+CHANGE_POLL_INTERVAL_MS = 1000
+
 
 class AppWindow(ctk.CTk):
-    def __init__(self):
+    def __init__(self, on_startup_phase: Optional[Callable[[str], None]] = None):
+        # on_startup_phase is called with "first paint" and "fully loaded"
+        # once the Tasks tab reaches those points (see main.py --profile-startup).
         super().__init__()
         
         self.configure(fg_color=APP_THEME_COLORS["main_bg_color"])
@@ -44,13 +79,15 @@ class AppWindow(ctk.CTk):
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self.tab_view = ctk.CTkTabview(
             self,
             corner_radius=8,
             fg_color=APP_THEME_COLORS["tab_fg_color"],
             segmented_button_selected_color=APP_THEME_COLORS["tab_selected_color"],
-            segmented_button_unselected_hover_color=APP_THEME_COLORS["tab_unselected_hover_color"]
+            segmented_button_unselected_hover_color=APP_THEME_COLORS["tab_unselected_hover_color"],
+            command=self._on_tab_selected
         )
         self.tab_view.grid(row=0, column=0, padx=15, pady=15, sticky="nsew")
 
@@ -63,24 +100,88 @@ class AppWindow(ctk.CTk):
             if tab:
                 tab.configure(fg_color=APP_THEME_COLORS["tab_fg_color"])
 
-
-        self.task_item_widgets_list: List[TaskItemWidget] = []
-        self.note_widgets: List[Dict[str, ctk.CTkBaseClass]] = []
-        self.current_tasks_for_notes_dropdown: List[Task] = []
+        self.loading_label = ctk.CTkLabel(self, text="Loading...", text_color=APP_THEME_COLORS["details_text_color"])
+
+        # Repository methods run on the DB worker thread; the Tk thread only
+        # reads cached models (tasks_by_id, task_description) from it.
+        self.repository = Repository()
+        self.data = AsyncDataAccess(self, on_busy_changed=self._set_loading_indicator)
+        # Checkbox clicks are coalesced and written in batches on the DB thread.
+        self.completion_buffer = WriteBehindBuffer(submit=self.data.worker.submit)
+        self._task_search_seq = 0
+        self._note_search_seq = 0
+        self.task_link_options: Dict[str, Optional[int]] = {NO_TASK_LINK_LABEL: None} # dropdown label -> task id
         self.selected_note_id: Optional[int] = None
+        self._task_search_after_id: Optional[str] = None
+        self._note_search_after_id: Optional[str] = None
+        self._task_stats_after_id: Optional[str] = None
+        self._on_startup_phase = on_startup_phase
+        self._notes_loaded = False
+
+        # The semantic index has its own worker: building it takes seconds on
+        # large databases and must not hold up ordinary reads and writes.
+        self.semantic_index = None
+        self.related_data: Optional[AsyncDataAccess] = None
+        if SemanticIndex is not None:
+            self.semantic_index = SemanticIndex()
+            self.repository.add_observer(self.semantic_index.on_change)
+            self.related_data = AsyncDataAccess(self, worker=DatabaseWorker(name="nexus-semantic-index"))
+        self._related_seq = 0
+
+        # Due-date reminders: the scheduler sleeps on its own thread and hands
+        # reminders to the log and, via ToastSink, to a toast shown on the Tk
+        # thread by the toast poll below.
+        self.toast = Toast(self, app_theme=APP_THEME_COLORS)
+        self.reminder_toasts = ToastSink(self._show_reminder_toast)
+        self.reminders = ReminderScheduler(sinks=[LoggingSink(), self.reminder_toasts])
+        self.repository.add_observer(self.reminders.on_change)
+        self._toast_poll_after_id: Optional[str] = None
 
         self._configure_tasks_tab(self.tasks_tab)
         self._configure_notes_tab(self.notes_tab)
 
+        # Writes by other processes sharing the database arrive through the
+        # change feed. Its first poll, queued ahead of the initial loads,
+        # marks where they start.
+        self.change_feed = ChangeFeed()
+        self._change_poll_after_id: Optional[str] = None
+        self.data.call(self.change_feed.poll)
+
+        # Only the visible tab loads now; notes wait until their tab is opened.
         self._load_tasks()
-        self._load_notes()
+
+    def _report_startup_phase(self, phase: str):
+        if self._on_startup_phase:
+            # Idle callbacks run after the redraws already queued, i.e. once
+            # the change is on screen.
+            self.after_idle(self._on_startup_phase, phase)
+        if phase == "fully loaded":
+            self._on_startup_phase = None
+
+    def _on_tab_selected(self):
+        if self.tab_view.get() == "Tasks":
+            self._refresh_task_stats() # "overdue" and "due today" move with the date
+        if self.tab_view.get() == "Notes" and not self._notes_loaded:
+            self._notes_loaded = True
+            self._load_notes()
+            if self.related_data:
+                self.related_data.call(self.semantic_index.ensure_built)
 
     def _configure_tasks_tab(self, tab: ctk.CTkFrame):
         tab.grid_columnconfigure(0, weight=1)
-        tab.grid_rowconfigure(1, weight=1)
+        tab.grid_rowconfigure(2, weight=1)
+
+        # Stats header, filled from db.get_task_stats() by _show_task_stats.
+        stats_frame = ctk.CTkFrame(tab, fg_color="transparent")
+        stats_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
+        self.task_stats_labels: Dict[str, ctk.CTkLabel] = {}
+        for column, name in enumerate(["open", "done", "overdue", "due today"]):
+            label = ctk.CTkLabel(stats_frame, text="", text_color=APP_THEME_COLORS["details_text_color"])
+            label.grid(row=0, column=column, padx=(2, 16), sticky="w")
+            self.task_stats_labels[name] = label
 
         input_frame = ctk.CTkFrame(tab, corner_radius=8, fg_color=APP_THEME_COLORS["input_frame_bg_color"])
-        input_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        input_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
         input_frame.grid_columnconfigure(0, weight=1)
 
         self.task_entry = ctk.CTkEntry(input_frame, placeholder_text="Enter new task description...")
@@ -90,6 +191,9 @@ class AppWindow(ctk.CTk):
         self.task_priority_menu = ctk.CTkOptionMenu(input_frame, values=["Baja", "Media", "Alta"], variable=self.task_priority_var)
         self.task_priority_menu.grid(row=0, column=1, padx=5, pady=10)
 
+        self.task_due_entry = ctk.CTkEntry(input_frame, placeholder_text="Due YYYY-MM-DD", width=130)
+        self.task_due_entry.grid(row=0, column=2, padx=5, pady=10)
+
         self.task_add_button = ctk.CTkButton(
             input_frame, text="Add Task", width=100,
             fg_color=APP_THEME_COLORS["button_primary_fg_color"],
@@ -98,13 +202,48 @@ class AppWindow(ctk.CTk):
         )
         self.task_add_button.grid(row=0, column=3, padx=(5, 10), pady=10)
 
-        self.task_list_scroll_frame = ctk.CTkScrollableFrame(
-            tab, label_text="Current Tasks",
+        self.task_search_entry = ctk.CTkEntry(input_frame, placeholder_text="Search tasks...")
+        self.task_search_entry.grid(row=1, column=0, columnspan=4, padx=10, pady=(0, 10), sticky="ew")
+        self.task_search_entry.bind("<KeyRelease>", self._schedule_task_search)
+
+        # Filter bar: every control narrows or reorders the list through a
+        # TaskQuery, so the work happens in SQL rather than over the cache.
+        filter_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
+        filter_frame.grid(row=2, column=0, columnspan=4, padx=10, pady=(0, 10), sticky="ew")
+
+        self.task_status_filter = ctk.CTkSegmentedButton(filter_frame, values=list(TASK_STATUS_FILTERS),
+                                                         command=lambda value: self._run_task_search())
+        self.task_status_filter.set("All")
+        self.task_status_filter.grid(row=0, column=0, padx=(0, 10))
+
+        self.task_priority_filter_vars: Dict[str, tk.BooleanVar] = {}
+        for column, priority in enumerate(["Alta", "Media", "Baja"], start=1):
+            var = tk.BooleanVar(value=True)
+            ctk.CTkCheckBox(filter_frame, text=priority, variable=var, width=70,
+                            command=self._run_task_search).grid(row=0, column=column, padx=2)
+            self.task_priority_filter_vars[priority] = var
+
+        self.task_due_from_entry = ctk.CTkEntry(filter_frame, placeholder_text="Due from", width=100)
+        self.task_due_from_entry.grid(row=0, column=4, padx=(10, 2))
+        self.task_due_to_entry = ctk.CTkEntry(filter_frame, placeholder_text="Due to", width=100)
+        self.task_due_to_entry.grid(row=0, column=5, padx=(2, 10))
+        for entry in (self.task_due_from_entry, self.task_due_to_entry):
+            entry.bind("<KeyRelease>", self._schedule_task_search)
+
+        self.task_sort_var = tk.StringVar(value="Newest")
+        ctk.CTkOptionMenu(filter_frame, values=list(TASK_SORT_OPTIONS), variable=self.task_sort_var, width=110,
+                          command=lambda value: self._run_task_search()).grid(row=0, column=6)
+
+        self.task_list_view = VirtualListView(
+            tab, create_row=self._create_task_widget,
+            bind_row=lambda widget, task: widget.update_task_data(task),
+            key=lambda task: task.id,
+            row_height=TASK_ROW_HEIGHT, label_text="Current Tasks",
+            resize_rows=self._resize_task_widgets,
             label_text_color=APP_THEME_COLORS["scroll_frame_label_text_color"],
             fg_color=APP_THEME_COLORS["main_bg_color"] # Match tab background or main_bg
         )
-        self.task_list_scroll_frame.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
-        self.task_list_scroll_frame.grid_columnconfigure(0, weight=1)
+        self.task_list_view.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="nsew")
 
 
     def _configure_notes_tab(self, tab: ctk.CTkFrame):
@@ -113,11 +252,11 @@ class AppWindow(ctk.CTk):
         tab.grid_rowconfigure(2, weight=1)
 
         note_input_controls_frame = ctk.CTkFrame(tab, fg_color=APP_THEME_COLORS["input_frame_bg_color"], corner_radius=8)
-        note_input_controls_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        note_input_controls_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=10)
         note_input_controls_frame.grid_columnconfigure(0, weight=1)
 
-        self.note_task_link_var = tk.StringVar(value="General Note (No Task)")
-        self.note_task_link_dropdown = ctk.CTkOptionMenu(note_input_controls_frame, variable=self.note_task_link_var, values=["General Note (No Task)"])
+        self.note_task_link_var = tk.StringVar(value=NO_TASK_LINK_LABEL)
+        self.note_task_link_dropdown = ctk.CTkOptionMenu(note_input_controls_frame, variable=self.note_task_link_var, values=[NO_TASK_LINK_LABEL])
         self.note_task_link_dropdown.grid(row=0, column=0, padx=(10,5), pady=10, sticky="ew")
 
         self.note_save_button = ctk.CTkButton(
@@ -131,190 +270,466 @@ class AppWindow(ctk.CTk):
         self.note_clear_button = ctk.CTkButton(note_input_controls_frame, text="New/Clear", command=self._clear_note_editor_event)
         self.note_clear_button.grid(row=0, column=2, padx=(5,10), pady=10)
 
+        self.note_search_entry = ctk.CTkEntry(note_input_controls_frame, placeholder_text="Search notes...")
+        self.note_search_entry.grid(row=1, column=0, columnspan=3, padx=10, pady=(0,10), sticky="ew")
+        self.note_search_entry.bind("<KeyRelease>", self._schedule_note_search)
+
         self.note_content_textbox = ctk.CTkTextbox(tab, wrap=tk.WORD, height=150, border_width=1, corner_radius=8)
         self.note_content_textbox.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
 
-        self.note_list_scroll_frame = ctk.CTkScrollableFrame(
-            tab, label_text="Saved Notes",
+        # Notes and tasks similar to the note in the editor; filled by
+        # _show_related_items and hidden while there is nothing to show.
+        self.related_frame = ctk.CTkFrame(tab, fg_color=APP_THEME_COLORS["input_frame_bg_color"], corner_radius=8)
+        self.related_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(self.related_frame, text="Related", text_color=APP_THEME_COLORS["scroll_frame_label_text_color"]).grid(
+            row=0, column=0, padx=10, pady=(8, 4), sticky="w")
+        self.related_buttons: List[ctk.CTkButton] = []
+        for row in range(RELATED_LIMIT if SemanticIndex is not None else 0):
+            button = ctk.CTkButton(self.related_frame, text="", anchor="w", width=220,
+                                   fg_color="transparent", text_color=APP_THEME_COLORS["description_text_color"],
+                                   hover_color=APP_THEME_COLORS["tab_unselected_hover_color"])
+            button.grid(row=row + 1, column=0, padx=6, pady=2, sticky="ew")
+            self.related_buttons.append(button)
+
+        self.note_list_view = VirtualListView(
+            tab, create_row=self._create_note_widget, bind_row=self._bind_note_widget,
+            key=lambda note: note.id,
+            row_height=NOTE_ROW_HEIGHT, label_text="Saved Notes",
             label_text_color=APP_THEME_COLORS["scroll_frame_label_text_color"],
             fg_color=APP_THEME_COLORS["main_bg_color"]
         )
-        self.note_list_scroll_frame.grid(row=2, column=0, padx=10, pady=(0,10), sticky="nsew")
-        self.note_list_scroll_frame.grid_columnconfigure(0, weight=1)
-
-    def _clear_task_list_display(self):
-        for widget in self.task_item_widgets_list:
-            widget.destroy()
-        self.task_item_widgets_list.clear()
+        self.note_list_view.grid(row=2, column=0, columnspan=2, padx=10, pady=(0,10), sticky="nsew")
+
+    def _create_task_widget(self, master, task: Task) -> TaskItemWidget:
+        return TaskItemWidget(
+            master=master,
+            task=task,
+            toggle_command=self._toggle_task_completion_event,
+            delete_command=self._delete_task_event,
+            app_theme=APP_THEME_COLORS,
+            manage_wraplength=False
+        )
 
+    def _resize_task_widgets(self, widgets: Sequence[TaskItemWidget], row_width: float):
+        # Called by the list once per resize; every card gets the same wraplength.
+        wraplength = wraplength_for_width(row_width)
+        for widget in widgets:
+            widget.set_wraplength(wraplength)
+
+    def _set_loading_indicator(self, busy: bool):
+        if busy: self.loading_label.grid(row=1, column=0, padx=15, pady=(0, 8), sticky="w")
+        else: self.loading_label.grid_forget()
+
+    def _on_close(self):
+        # Flush buffered toggles and let queued writes reach the database
+        # before the window goes away.
+        self._stop_toast_poll()
+        self._stop_change_poll()
+        self.completion_buffer.close()
+        self.reminders.stop()
+        self.reminder_toasts.close()
+        if self.related_data:
+            self.semantic_index.close() # stops a build in progress early
+            self.related_data.shutdown()
+        self.data.shutdown()
+        self.destroy()
+
+    @instrumentation.event("load tasks")
     def _load_tasks(self):
-        self._clear_task_list_display()
+        # The first page is queued ahead of the full list, so the rows in view
+        # paint without waiting for every task to be read.
+        self.data.call(self.repository.first_task_page, on_success=self._show_first_task_page, read=True)
+        self.data.call(self.repository.list_tasks, on_success=self._show_loaded_tasks, read=True)
+
+    def _show_first_task_page(self, tasks: List[Task]):
+        if not self.task_list_view.items:
+            self.task_list_view.set_items(tasks)
+        self._report_startup_phase("first paint")
+
+    def _show_loaded_tasks(self, tasks: List[Task]):
+        # Only the rows in view get widgets; the rest are bound while scrolling.
+        if not self._task_view_is_filtered(): # a search or filter set meanwhile wins
+            self.task_list_view.set_items(tasks, keep_offset=True)
+        self._populate_tasks_for_notes_dropdown(tasks)
+        self.note_list_view.refresh()  # visible note rows show linked task descriptions
+        self._report_startup_phase("fully loaded")
+        self.reminders.start() # after startup, so its first query doesn't compete with ours
+        if self._toast_poll_after_id is None:
+            self._poll_toasts()
+        self._refresh_task_stats()
+        if self._change_poll_after_id is None:
+            self._schedule_change_poll()
+
+    def _poll_toasts(self):
+        self.reminder_toasts.drain() # reminders the scheduler thread queued since the last tick
+        self._toast_poll_after_id = self.after(TOAST_POLL_INTERVAL_MS, self._poll_toasts)
+
+    def _stop_toast_poll(self):
+        if self._toast_poll_after_id is not None:
+            self.after_cancel(self._toast_poll_after_id)
+            self._toast_poll_after_id = None
+
+    def _refresh_task_stats(self):
+        # Debounced, so a burst of toggles costs one read.
+        if self._task_stats_after_id is not None:
+            self.after_cancel(self._task_stats_after_id)
+        self._task_stats_after_id = self.after(STATS_REFRESH_DELAY_MS, self._load_task_stats)
+
+    def _load_task_stats(self):
+        self._task_stats_after_id = None
+        self.data.call(self._read_task_stats, on_success=self._show_task_stats)
+
+    def _read_task_stats(self) -> Optional[TaskStats]:
+        # Runs on the DB worker. Buffered toggles are written first so the
+        # counts include them.
+        self.completion_buffer.flush()
+        return db.get_task_stats()
+
+    def _show_task_stats(self, stats: Optional[TaskStats]):
+        if stats is None: return
+        by_priority = " · ".join(f"{priority.value} {count}" for priority, count in
+                                 sorted(stats.open.items(), key=lambda item: -PRIORITY_RANKS[item[0]]))
+        self.task_stats_labels["open"].configure(text=f"Open {stats.total_open} ({by_priority})")
+        self.task_stats_labels["done"].configure(text=f"Done {stats.total_completed}")
+        self.task_stats_labels["overdue"].configure(text=f"Overdue {stats.total_overdue}")
+        self.task_stats_labels["due today"].configure(text=f"Due today {stats.due_today}")
+
+    def _schedule_change_poll(self):
+        self._change_poll_after_id = self.after(CHANGE_POLL_INTERVAL_MS, self._poll_changes)
+
+    def _stop_change_poll(self):
+        # A poll already on the DB worker would re-arm it from its callback;
+        # callers shut self.data down afterwards, so that callback never runs.
+        if self._change_poll_after_id is not None:
+            self.after_cancel(self._change_poll_after_id)
+            self._change_poll_after_id = None
+
+    def _poll_changes(self):
+        # The next poll is scheduled once this one is done, so they never pile up.
+        self.data.call(self._read_changes, on_success=self._show_changes, on_error=self._on_change_poll_error)
+
+    def _on_change_poll_error(self, error: BaseException):
+        print(f"Error polling for changes: {error}")
+        self._schedule_change_poll()
+
+    def _read_changes(self) -> Optional[list]:
+        # Runs on the DB worker, the thread the feed's connection belongs to.
+        # Buffered toggles are written first, so their own change_log rows
+        # match the cache instead of overwriting it with the older value.
+        self.completion_buffer.flush()
+        changes = self.change_feed.poll()
+        if changes is None:
+            self.repository.invalidate()
+            return None
+        return self.repository.apply_changes(changes) if changes else []
+
+    def _show_changes(self, applied: Optional[list]):
+        self._schedule_change_poll()
+        if applied is None:
+            self._reload_all()
+            return
+        task_changes = [change for change in applied if change[0] == "task"]
+        note_changes = [change for change in applied if change[0] == "note"]
+        if task_changes:
+            filtered = self._task_view_is_filtered()
+            for _, action, task_id, task in task_changes:
+                if action == "deleted":
+                    self.task_list_view.remove_item(task_id)
+                    self._remove_task_link_option(task_id)
+                elif action == "added":
+                    if not filtered: self.task_list_view.insert_item(0, task)
+                    self._add_task_link_option(task)
+                else:
+                    self.task_list_view.update_item(task)
+                    if action == "updated": self._rename_task_link_option(task)
+            if filtered: self._run_task_search() # the changes may move tasks in or out of the view
+            self.note_list_view.refresh() # linked task descriptions
+            self._refresh_task_stats()
+        if note_changes and self._notes_loaded:
+            if self.note_search_entry.get().strip():
+                self._run_note_search()
+                return
+            for _, action, note_id, note in note_changes:
+                if action == "deleted": self.note_list_view.remove_item(note_id)
+                elif action == "added": self.note_list_view.insert_item(0, note)
+                else: self.note_list_view.update_item(note)
+
+    def _reload_all(self):
+        # The feed fell too far behind to catch up row by row.
+        self._load_tasks()
+        if self._task_view_is_filtered(): self._run_task_search()
+        if self._notes_loaded: self._run_note_search()
+        self.reminders.reload()
+        if self.related_data and self.semantic_index.is_built:
+            self.related_data.call(self.semantic_index.rebuild)
+
+    def _schedule_task_search(self, event=None):
+        # Debounce: only query the index once typing pauses.
+        if self._task_search_after_id is not None:
+            self.after_cancel(self._task_search_after_id)
+        self._task_search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_task_search)
+
+    @staticmethod
+    def _parse_filter_date(entry: ctk.CTkEntry) -> Optional[datetime.date]:
+        text = entry.get().strip()
+        return datetime.date.fromisoformat(text) if text else None # ValueError while half typed
+
+    def _build_task_query(self) -> Optional[db.TaskQuery]:
+        """The filter bar and search box as a TaskQuery; None while a date is invalid."""
         try:
-            tasks: List[Task] = db.get_all_tasks()
-            for i, task in enumerate(tasks):
-                if task.id is not None:
-                    task_widget = TaskItemWidget(
-                        master=self.task_list_scroll_frame,
-                        task=task,
-                        toggle_command=self._toggle_task_completion_event,
-                        delete_command=self._delete_task_event,
-                        app_theme=APP_THEME_COLORS 
-                    )
-                    task_widget.grid(row=i, column=0, sticky="ew", padx=5, pady=6) # pady between cards
-                    self.task_item_widgets_list.append(task_widget)
-            self._populate_tasks_for_notes_dropdown()
-        except Exception as e:
-            print(f"Error loading tasks into GUI: {e}")
-
+            due_from = self._parse_filter_date(self.task_due_from_entry)
+            due_to = self._parse_filter_date(self.task_due_to_entry)
+        except ValueError:
+            return None
+        query = db.TaskQuery().with_status(TASK_STATUS_FILTERS.get(self.task_status_filter.get()))
+        query.sorted_by(TASK_SORT_OPTIONS.get(self.task_sort_var.get(), "created"))
+        priorities = [priority for priority, var in self.task_priority_filter_vars.items() if var.get()]
+        if len(priorities) < len(self.task_priority_filter_vars):
+            query.with_priorities(*priorities)
+        # "Due to" is inclusive in the bar, exclusive in TaskQuery.
+        query.due_between(due_from, due_to + datetime.timedelta(days=1) if due_to else None)
+        return query.matching(self.task_search_entry.get())
+
+    def _task_view_is_filtered(self) -> bool:
+        query = self._build_task_query()
+        return query is None or query.is_filtered() or query.sort != "created"
+
+    @instrumentation.event("search tasks")
+    def _run_task_search(self):
+        self._task_search_after_id = None
+        query = self._build_task_query()
+        if query is None: return # keep the current list until the date is complete
+        self._task_search_seq += 1
+        seq = self._task_search_seq
+        def show(tasks: List[Task]):
+            if seq == self._task_search_seq: # drop results overtaken by a newer search
+                self.task_list_view.set_items(tasks)
+        if query.text and not query.is_filtered(ignore_text=True) and query.sort == "created":
+            # Plain search: best matches first, as ranked by the FTS index.
+            self.data.call(self.repository.search_tasks, query.text, limit=SEARCH_RESULT_LIMIT, on_success=show, read=True)
+        elif query.is_filtered() or query.sort != "created":
+            if query.text: query.limited(SEARCH_RESULT_LIMIT)
+            self.data.call(self.repository.query_tasks, query, on_success=show, read=True)
+        else: self.data.call(self.repository.list_tasks, on_success=show, read=True)
+
+    @instrumentation.event("add task")
     def _add_task_event(self):
         description = self.task_entry.get()
         priority = self.task_priority_var.get()
         if not description: return
+        due_text = self.task_due_entry.get().strip()
         try:
-            new_task = db.add_task(description=description, priority=priority, due_date=None)
-            if new_task:
-                self._load_tasks()
-                self.task_entry.delete(0, tk.END)
-                self.task_priority_var.set("Media")
-        except Exception as e: print(f"Error in add task event: {e}")
+            due_date = datetime.date.fromisoformat(due_text) if due_text else None
+        except ValueError:
+            print(f"Invalid due date '{due_text}', expected YYYY-MM-DD.")
+            return
+        self.task_entry.delete(0, tk.END)
+        self.task_due_entry.delete(0, tk.END)
+        self.task_priority_var.set("Media")
+        self.data.call(self.repository.add_task, description=description, priority=priority, due_date=due_date,
+                       on_success=self._on_task_added)
+
+    def _on_task_added(self, new_task: Optional[Task]):
+        if not new_task or new_task.id is None:
+            print("Failed to add task via GUI.")
+            return
+        if self._task_view_is_filtered(): self._run_task_search()
+        else: self.task_list_view.insert_item(0, new_task) # newest first, like get_all_tasks()
+        self._add_task_link_option(new_task)
+        self._refresh_task_stats()
+
+    def _show_reminder_toast(self, reminder: Reminder):
+        self.toast.show("Task due", f"{reminder.description} ({reminder.due_date.strftime('%Y-%m-%d')})")
 
     def _toggle_task_completion_event(self, task_id: int, new_status: bool):
-        try:
-            if db.update_task_completion(task_id, new_status):
-                # TaskItemWidget updates its own style, but if other logic depends on it:
-                # self._load_tasks() # Or find and update specific widget if needed
-                pass # Widget handles its own style update on toggle
-            else: print(f"Failed to update task {task_id} completion status.")
-        except Exception as e: print(f"Error toggling task completion: {e}")
+        # The widget restyles itself and the cached model (which the list
+        # shows) is updated right away; the database write is buffered.
+        self.repository.apply_task_completed(task_id, new_status)
+        self.completion_buffer.set_completed(task_id, new_status)
+        self._refresh_task_stats()
 
+    @instrumentation.event("delete task")
     def _delete_task_event(self, task_id: int):
-        try:
-            if db.delete_task(task_id): self._load_tasks()
-            else: print(f"Failed to delete task {task_id}.")
-        except Exception as e: print(f"Error deleting task: {e}")
-
-    def _populate_tasks_for_notes_dropdown(self):
-        self.current_tasks_for_notes_dropdown = db.get_all_tasks()
-        dropdown_values = ["General Note (No Task)"] + \
-                          [f"Task {t.id}: {t.description[:30]}..." for t in self.current_tasks_for_notes_dropdown if t.id is not None]
+        def apply(deleted: bool):
+            if not deleted:
+                print(f"Failed to delete task {task_id}.")
+                return
+            self.task_list_view.remove_item(task_id)
+            self._remove_task_link_option(task_id)
+            self.note_list_view.refresh()
+            self._refresh_task_stats()
+        self.data.call(self.repository.delete_task, task_id, on_success=apply)
+
+    @staticmethod
+    def _task_link_label(task: Task) -> str:
+        return f"Task {task.id}: {task.description[:30]}..."
+
+    def _populate_tasks_for_notes_dropdown(self, tasks: List[Task]):
+        self.task_link_options = {NO_TASK_LINK_LABEL: None}
+        for t in tasks:
+            self.task_link_options[self._task_link_label(t)] = t.id
+        self._refresh_task_link_dropdown()
+
+    def _add_task_link_option(self, task: Task):
+        # Keep the "no task" entry first and the newest task right after it.
+        options = list(self.task_link_options.items())
+        options.insert(1, (self._task_link_label(task), task.id))
+        self.task_link_options = dict(options)
+        self._refresh_task_link_dropdown()
+
+    def _rename_task_link_option(self, task: Task):
+        self.task_link_options = {(self._task_link_label(task) if t_id == task.id else label): t_id
+                                  for label, t_id in self.task_link_options.items()}
+        self._refresh_task_link_dropdown()
+
+    def _remove_task_link_option(self, task_id: int):
+        self.task_link_options = {label: t_id for label, t_id in self.task_link_options.items() if t_id != task_id}
+        self._refresh_task_link_dropdown()
+
+    def _refresh_task_link_dropdown(self):
         if hasattr(self, 'note_task_link_dropdown'):
             current_selection = self.note_task_link_var.get()
-            self.note_task_link_dropdown.configure(values=dropdown_values)
-            if current_selection in dropdown_values:
+            self.note_task_link_dropdown.configure(values=list(self.task_link_options))
+            if current_selection in self.task_link_options:
                 self.note_task_link_var.set(current_selection)
             else:
-                self.note_task_link_var.set("General Note (No Task)")
+                self.note_task_link_var.set(NO_TASK_LINK_LABEL)
     
-    def _clear_note_list_display(self):
-        for widget_dict in self.note_widgets:
-            widget_dict['frame'].destroy()
-        self.note_widgets.clear()
-
-    def _create_note_widget(self, note: Note) -> Dict[str, ctk.CTkBaseClass]:
-        note_row_frame = ctk.CTkFrame(
-            self.note_list_scroll_frame, 
-            corner_radius=8, border_width=1,
-            fg_color=APP_THEME_COLORS["card_fg_color"],
-            border_color=APP_THEME_COLORS["card_border_color"]
+    def _note_task_link_text(self, note: Note) -> str:
+        if not note.task_id: return ""
+        task_description = self.repository.task_description(note.task_id)
+        if task_description is not None: return f" (Task: {task_description[:20]}...)"
+        return f" (Task ID: {note.task_id})"
+
+    def _create_note_widget(self, master, note: Note) -> NoteItemWidget:
+        return NoteItemWidget(
+            master=master,
+            note=note,
+            open_command=self._load_note_into_editor,
+            delete_command=self._delete_note_event,
+            app_theme=APP_THEME_COLORS,
+            task_link_text=self._note_task_link_text(note)
         )
-        note_row_frame.grid_columnconfigure(0, weight=1)
 
-        content_preview = note.content.replace("\n", " ")[:70] + ("..." if len(note.content) > 70 else "")
-        created_at_str = note.created_at.strftime('%Y-%m-%d %H:%M') if note.created_at else "No date"
-        
-        task_link_info = ""
-        if note.task_id:
-            linked_task = next((task for task in self.current_tasks_for_notes_dropdown if task.id == note.task_id), None)
-            if linked_task: task_link_info = f" (Task: {linked_task.description[:20]}...)"
-            else: task_link_info = f" (Task ID: {note.task_id})"
-
-        full_text = f"{content_preview}"
-        details_text = f"Created: {created_at_str}{task_link_info}"
-
-        note_label_content = ctk.CTkLabel(note_row_frame, text=full_text, anchor="w", justify="left", text_color=APP_THEME_COLORS["description_text_color"])
-        note_label_content.grid(row=0, column=0, padx=10, pady=(10,0), sticky="ew")
-        note_label_content.bind("<Button-1>", lambda event, n_id=note.id: self._load_note_into_editor(n_id) if n_id is not None else None)
-
-        note_label_details = ctk.CTkLabel(note_row_frame, text=details_text, anchor="w", justify="left", font=ctk.CTkFont(size=10), text_color=APP_THEME_COLORS["details_text_color"])
-        note_label_details.grid(row=1, column=0, padx=10, pady=(0,10), sticky="ew")
-        note_label_details.bind("<Button-1>", lambda event, n_id=note.id: self._load_note_into_editor(n_id) if n_id is not None else None)
-        
-        delete_button = ctk.CTkButton(note_row_frame, text="Del", width=40, height=28, command=lambda n_id=note.id: self._delete_note_event(n_id) if n_id is not None else None)
-        delete_button.grid(row=0, column=1, rowspan=2, padx=(5,10), pady=10, sticky="ns")
-        
-        return {"frame": note_row_frame, "label_content": note_label_content, "label_details": note_label_details, "delete_button": delete_button}
+    def _bind_note_widget(self, widget: NoteItemWidget, note: Note):
+        widget.update_note_data(note, self._note_task_link_text(note))
 
+    @instrumentation.event("load notes")
     def _load_notes(self):
-        self._clear_note_list_display()
-        try:
-            notes: List[Note] = db.get_all_notes()
-            for i, note in enumerate(notes):
-                 if note.id is not None:
-                    widget_dict = self._create_note_widget(note)
-                    widget_dict['frame'].grid(row=i, column=0, sticky="ew", padx=5, pady=6) # pady between cards
-                    self.note_widgets.append(widget_dict)
-            self._populate_tasks_for_notes_dropdown()
-        except Exception as e: print(f"Error loading notes into GUI: {e}")
-
+        self.data.call(self.repository.list_notes, on_success=self.note_list_view.set_items, read=True)
+
+    def _schedule_note_search(self, event=None):
+        if self._note_search_after_id is not None:
+            self.after_cancel(self._note_search_after_id)
+        self._note_search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_note_search)
+
+    @instrumentation.event("search notes")
+    def _run_note_search(self):
+        self._note_search_after_id = None
+        query = self.note_search_entry.get().strip()
+        self._note_search_seq += 1
+        seq = self._note_search_seq
+        def show(notes: List[Note]):
+            if seq == self._note_search_seq:
+                self.note_list_view.set_items(notes)
+        if query: self.data.call(self.repository.search_notes, query, limit=SEARCH_RESULT_LIMIT, on_success=show, read=True)
+        else: self.data.call(self.repository.list_notes, on_success=show, read=True)
+
+    @instrumentation.event("open note")
     def _load_note_into_editor(self, note_id: int):
         if note_id is None: return
-        note = db.get_note_by_id(note_id)
+        self.data.call(self.repository.get_note, note_id, on_success=self._show_note_in_editor, read=True)
+
+    def _show_note_in_editor(self, note: Optional[Note]):
         if note:
             self.note_content_textbox.delete("1.0", tk.END)
             self.note_content_textbox.insert("1.0", note.content)
             self.selected_note_id = note.id
-            if note.task_id:
-                linked_task_display_val = next((f"Task {t.id}: {t.description[:30]}..." for t in self.current_tasks_for_notes_dropdown if t.id == note.task_id), None)
-                if linked_task_display_val: self.note_task_link_var.set(linked_task_display_val)
-                else: self.note_task_link_var.set("General Note (No Task)") 
-            else: self.note_task_link_var.set("General Note (No Task)")
+            linked_task = self.repository.tasks_by_id.get(note.task_id) if note.task_id else None
+            if linked_task: self.note_task_link_var.set(self._task_link_label(linked_task))
+            else: self.note_task_link_var.set(NO_TASK_LINK_LABEL)
             self.note_save_button.configure(text="Update Note")
+            self._load_related_items(note.id)
         else: self._clear_note_editor_event()
 
+    def _load_related_items(self, note_id: int):
+        if not self.related_data: return
+        self._related_seq += 1
+        seq = self._related_seq
+        def show(related):
+            # Drop results for a note that is no longer in the editor.
+            if seq == self._related_seq and self.selected_note_id == note_id:
+                self._show_related_items(related)
+        self.related_data.call(self.semantic_index.find_related, note_id, on_success=show)
+
+    def _show_related_items(self, related):
+        for button, item in zip(self.related_buttons, related):
+            prefix = "Note" if item.kind == "note" else "Task"
+            text = " ".join(item.text.split())
+            if len(text) > RELATED_TEXT_CHARS: text = text[:RELATED_TEXT_CHARS - 3] + "..."
+            button.configure(text=f"{prefix}: {text}", command=lambda item=item: self._open_related_item(item))
+            button.grid()
+        for button in self.related_buttons[len(related):]:
+            button.grid_remove()
+        if related: self.related_frame.grid(row=1, column=1, sticky="nsew", padx=(0, 10), pady=5)
+        else: self.related_frame.grid_remove()
+
+    def _open_related_item(self, item):
+        if item.kind == "note":
+            self._load_note_into_editor(item.id)
+            return
+        # Tasks have no detail view: show the task in the Tasks tab via search.
+        self.tab_view.set("Tasks")
+        self.task_search_entry.delete(0, tk.END)
+        self.task_search_entry.insert(0, item.text)
+        self._run_task_search()
+
     def _clear_note_editor_event(self):
         self.selected_note_id = None
+        self._related_seq += 1
+        self.related_frame.grid_remove()
         self.note_content_textbox.delete("1.0", tk.END)
-        self.note_task_link_var.set("General Note (No Task)")
+        self.note_task_link_var.set(NO_TASK_LINK_LABEL)
         self.note_save_button.configure(text="Save Note")
         self.note_content_textbox.focus()
 
+    @instrumentation.event("save note")
     def _save_note_event(self):
         content = self.note_content_textbox.get("1.0", tk.END).strip()
-        selected_link_value = self.note_task_link_var.get()
-        task_id: Optional[int] = None
-        if selected_link_value != "General Note (No Task)":
-            try:
-                task_id_str = selected_link_value.split(":")[0].replace("Task ", "")
-                task_id = int(task_id_str)
-            except ValueError: task_id = None
+        task_id: Optional[int] = self.task_link_options.get(self.note_task_link_var.get())
         if not content: return
-        try:
-            if self.selected_note_id is not None:
-                if db.update_note(self.selected_note_id, content): print(f"Note {self.selected_note_id} updated.")
-                else: print(f"Failed to update note {self.selected_note_id}.")
-            else:
-                new_note = db.add_note(content=content, task_id=task_id)
-                if new_note: print(f"Note added via GUI: {new_note}")
-                else: print("Failed to add note via GUI.")
-            self._load_notes()
-            self._clear_note_editor_event()
-        except Exception as e: print(f"Error in save note event: {e}")
-
+        note_id = self.selected_note_id
+        if note_id is not None:
+            def apply_update(note: Optional[Note]):
+                if not note:
+                    print(f"Failed to update note {note_id}.")
+                    return
+                print(f"Note {note_id} updated.")
+                self.note_list_view.update_item(note)
+            self.data.call(self.repository.update_note, note_id, content, on_success=apply_update)
+        else:
+            def apply_add(new_note: Optional[Note]):
+                if not new_note:
+                    print("Failed to add note via GUI.")
+                    return
+                print(f"Note added via GUI: {new_note}")
+                if self.note_search_entry.get().strip(): self._run_note_search()
+                else: self.note_list_view.insert_item(0, new_note)
+            self.data.call(self.repository.add_note, content=content, task_id=task_id, on_success=apply_add)
+        self._clear_note_editor_event()
+
+    @instrumentation.event("delete note")
     def _delete_note_event(self, note_id: int):
         if note_id is None: return
-        try:
-            if db.delete_note(note_id):
-                self._load_notes()
-                if self.selected_note_id == note_id: self._clear_note_editor_event()
-            else: print(f"Failed to delete note {note_id}.")
-        except Exception as e: print(f"Error deleting note: {e}")
+        def apply(deleted: bool):
+            if not deleted:
+                print(f"Failed to delete note {note_id}.")
+                return
+            self.note_list_view.remove_item(note_id)
+            if self.selected_note_id == note_id: self._clear_note_editor_event()
+        self.data.call(self.repository.delete_note, note_id, on_success=apply)
 
 if __name__ == "__main__":
-    if not os.path.exists(db.INIT_FLAG_FILE) or not os.path.exists(db.DATABASE_PATH) :
-        if os.path.exists(db.INIT_FLAG_FILE): os.remove(db.INIT_FLAG_FILE)
-        db.initialize_database()
-        try:
-            with open(db.INIT_FLAG_FILE, 'w') as f: f.write(datetime.datetime.now().isoformat())
-        except IOError as e: print(f"Warning: Could not create initialization flag file: {e}")
+    db.initialize_database()
     app = AppWindow()
     app.mainloop()
\ No newline at end of file
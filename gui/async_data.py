@@ -0,0 +1,108 @@
+import queue
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+try:
+    from data.worker import DatabaseWorker
+    from data import instrumentation
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data.worker import DatabaseWorker
+    from data import instrumentation
+
+POLL_INTERVAL_MS = 15
+LOADING_INDICATOR_DELAY_MS = 150
+
+
+class AsyncDataAccess:
+    """
+    Tk-side facade over a DatabaseWorker. Calls return immediately; their
+    callbacks are run on the Tk thread by an after() poll that is only
+    scheduled while requests are outstanding.
+    """
+
+    def __init__(self, tk_root, worker: Optional[DatabaseWorker] = None,
+                 on_busy_changed: Optional[Callable[[bool], None]] = None):
+        self._root = tk_root
+        self.worker = worker if worker else DatabaseWorker()
+        self._on_busy_changed = on_busy_changed
+        self._completed: "queue.Queue[tuple]" = queue.Queue()
+        self._outstanding = 0
+        self._outstanding_reads = 0
+        self._poll_after_id: Optional[str] = None
+        self._busy_after_id: Optional[str] = None
+        self._busy = False
+
+    def call(self, func: Callable[..., Any], *args: Any,
+             on_success: Optional[Callable[[Any], None]] = None,
+             on_error: Optional[Callable[[BaseException], None]] = None,
+             read: bool = False, **kwargs: Any) -> Future:
+        """Runs func on the DB thread; pass read=True for reads that may show the loading indicator."""
+        future = self.worker.submit(func, *args, **kwargs)
+        # Callbacks run under the caller's instrumentation activity too, so
+        # follow-up calls they make are attributed to the same GUI event.
+        activity = instrumentation.current_activity()
+        if activity is not None:
+            activity.hold()
+        self._outstanding += 1
+        if read:
+            self._outstanding_reads += 1
+            if self._busy_after_id is None and not self._busy:
+                self._busy_after_id = self._root.after(LOADING_INDICATOR_DELAY_MS, self._show_busy)
+        # Runs on the worker thread: only hand the result over, never touch Tk.
+        future.add_done_callback(lambda f: self._completed.put((f, on_success, on_error, read, activity)))
+        if self._poll_after_id is None:
+            self._poll_after_id = self._root.after(POLL_INTERVAL_MS, self._drain)
+        return future
+
+    def _drain(self):
+        self._poll_after_id = None
+        while True:
+            try:
+                future, on_success, on_error, read, activity = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            if read:
+                self._outstanding_reads -= 1
+            error = future.exception()
+            try:
+                with instrumentation.activity_scope(activity):
+                    if error is not None:
+                        if on_error: on_error(error)
+                        else: print(f"Error in background database call: {error}")
+                    elif on_success:
+                        on_success(future.result())
+            except Exception as e:
+                print(f"Error in database callback: {e}")
+            finally:
+                if activity is not None:
+                    activity.release()
+        if self._outstanding_reads == 0:
+            self._set_busy(False)
+        if self._outstanding > 0:
+            self._poll_after_id = self._root.after(POLL_INTERVAL_MS, self._drain)
+
+    def _show_busy(self):
+        self._busy_after_id = None
+        if self._outstanding_reads > 0:
+            self._set_busy(True)
+
+    def _set_busy(self, busy: bool):
+        if not busy and self._busy_after_id is not None:
+            self._root.after_cancel(self._busy_after_id)
+            self._busy_after_id = None
+        if busy != self._busy:
+            self._busy = busy
+            if self._on_busy_changed:
+                self._on_busy_changed(busy)
+
+    def shutdown(self):
+        """Waits for queued work (pending writes included) and stops the worker."""
+        for after_id in (self._poll_after_id, self._busy_after_id):
+            if after_id is not None:
+                self._root.after_cancel(after_id)
+        self._poll_after_id = self._busy_after_id = None
+        self.worker.shutdown(wait=True)
@@ -0,0 +1,16 @@
+import customtkinter as ctk
+from typing import Dict, Optional, Tuple
+
+# One CTkFont per distinct style, shared by every widget that uses it.
+# Creating a font registers a new Tk font object, so building them per card
+# (and again on every restyle) adds up quickly in long lists.
+_font_cache: Dict[Tuple[Optional[int], str, bool], ctk.CTkFont] = {}
+
+
+def cached_font(size: Optional[int] = None, slant: str = "roman", underline: bool = False) -> ctk.CTkFont:
+    key = (size, slant, underline)
+    font = _font_cache.get(key)
+    if font is None:
+        font = ctk.CTkFont(size=size, slant=slant, underline=underline)
+        _font_cache[key] = font
+    return font
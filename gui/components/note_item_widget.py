@@ -0,0 +1,69 @@
+import customtkinter as ctk
+from typing import Callable, Optional
+
+try:
+    from core.models import Note
+    from gui.components.fonts import cached_font
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+    from core.models import Note
+    from gui.components.fonts import cached_font
+
+class NoteItemWidget(ctk.CTkFrame):
+    def __init__(self, master, note: Note,
+                 open_command: Optional[Callable[[int], None]] = None,
+                 delete_command: Optional[Callable[[int], None]] = None,
+                 app_theme: dict = None, task_link_text: str = ""):
+
+        self.theme = app_theme if app_theme else {
+            "card_fg_color": ("#FFFFFF", "#2B2B2B"),
+            "card_border_color": ("#E0E0E0", "#444444"),
+            "details_text_color": ("#555555", "#AAAAAA"),
+            "description_text_color": ("#101010", "#E5E5E5"),
+        }
+
+        super().__init__(master, corner_radius=8, border_width=1,
+                         fg_color=self.theme["card_fg_color"],
+                         border_color=self.theme["card_border_color"])
+
+        self.note = note
+        self.open_command = open_command
+        self.delete_command = delete_command
+
+        self.grid_columnconfigure(0, weight=1)
+
+        self.note_label_content = ctk.CTkLabel(self, text="", anchor="w", justify="left",
+                                               text_color=self.theme["description_text_color"])
+        self.note_label_content.grid(row=0, column=0, padx=10, pady=(10, 0), sticky="ew")
+        self.note_label_content.bind("<Button-1>", lambda event: self._on_open())
+
+        self.note_label_details = ctk.CTkLabel(self, text="", anchor="w", justify="left",
+                                               font=cached_font(size=10),
+                                               text_color=self.theme["details_text_color"])
+        self.note_label_details.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="ew")
+        self.note_label_details.bind("<Button-1>", lambda event: self._on_open())
+
+        self.delete_button = ctk.CTkButton(self, text="Del", width=40, height=28, command=self._on_delete)
+        self.delete_button.grid(row=0, column=1, rowspan=2, padx=(5, 10), pady=10, sticky="ns")
+
+        self.update_note_data(note, task_link_text)
+
+    def _on_open(self):
+        if self.open_command and self.note.id is not None:
+            self.open_command(self.note.id)
+
+    def _on_delete(self):
+        if self.delete_command and self.note.id is not None:
+            self.delete_command(self.note.id)
+
+    def update_note_data(self, note: Note, task_link_text: str = ""):
+        self.note = note
+
+        # Only the stored preview is needed here; full content may not be loaded.
+        content_preview = note.preview.replace("\n", " ")[:70] + ("..." if note.content_length > 70 else "")
+        created_at_str = note.created_at.strftime('%Y-%m-%d %H:%M') if note.created_at else "No date"
+
+        self.note_label_content.configure(text=content_preview)
+        self.note_label_details.configure(text=f"Created: {created_at_str}{task_link_text}")
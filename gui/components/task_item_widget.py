@@ -4,17 +4,33 @@ from typing import Callable, Optional
 
 try:
     from core.models import Task
+    from gui.components.fonts import cached_font
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
     from core.models import Task
+    from gui.components.fonts import cached_font
+
+# Fixed widths of the columns around the labels, in widget units: checkbox
+# and delete button plus their grid padx. Knowing them up front lets the
+# wraplength be derived from the card width alone.
+CHECKBOX_COLUMN_WIDTH = 30 + 12 + 5
+DELETE_COLUMN_WIDTH = 60 + 5 + 12
+LABEL_PADX_TOTAL = 5 + 5
+MIN_WRAPLENGTH = 20
+
+def wraplength_for_width(card_width: float) -> int:
+    available = card_width - CHECKBOX_COLUMN_WIDTH - DELETE_COLUMN_WIDTH - LABEL_PADX_TOTAL
+    return max(MIN_WRAPLENGTH, int(available))
 
 class TaskItemWidget(ctk.CTkFrame):
     def __init__(self, master, task: Task,
                  toggle_command: Optional[Callable[[int, bool], None]] = None,
                  delete_command: Optional[Callable[[int], None]] = None,
-                 app_theme: dict = None):
+                 app_theme: dict = None, manage_wraplength: bool = True):
+        # manage_wraplength=False leaves wraplength to the owner (see
+        # set_wraplength), e.g. a list that resizes all its cards at once.
         
         self.theme = app_theme if app_theme else {
             "card_fg_color": ("#FFFFFF", "#2B2B2B"),
@@ -31,6 +47,9 @@ class TaskItemWidget(ctk.CTkFrame):
         self.task = task
         self.toggle_command = toggle_command
         self.delete_command = delete_command
+        self._wraplength: Optional[int] = None
+        self._styled_completed: Optional[bool] = None  # style currently applied
+        self._wraplength_update_pending = False
 
         self.grid_columnconfigure(1, weight=1)
 
@@ -50,7 +69,7 @@ class TaskItemWidget(ctk.CTkFrame):
 
         self.task_label_details = ctk.CTkLabel(
             self, text=details_text, anchor="w", justify="left",
-            font=ctk.CTkFont(size=11), text_color=self.theme["details_text_color"]
+            font=cached_font(size=11), text_color=self.theme["details_text_color"]
         )
         self.task_label_details.grid(row=1, column=1, padx=5, pady=(0, 10), sticky="ew")
 
@@ -59,8 +78,9 @@ class TaskItemWidget(ctk.CTkFrame):
         )
         self.delete_button.grid(row=0, column=2, rowspan=2, padx=(5, 12), pady=12, sticky="ns")
         
-        self.bind("<Configure>", self._on_frame_configure) # Trigger wraplength update on resize
-        self._update_style() # Initial style and wraplength update
+        if manage_wraplength:
+            self.bind("<Configure>", self._on_frame_configure) # Trigger wraplength update on resize
+        self._update_style()
 
         self.bind_all_mouse_scroll(self.task_label_description)
         self.bind_all_mouse_scroll(self.task_label_details)
@@ -72,53 +92,34 @@ class TaskItemWidget(ctk.CTkFrame):
         widget.bind("<Button-5>", lambda event: self._on_mouse_wheel(event), add="+")
 
     def _on_mouse_wheel(self, event):
+        # Inside a VirtualListView the list scrolls through its own bind_all
+        # handler, so only swallow the event when scrolling a CTkScrollableFrame.
         if self.master and hasattr(self.master, "_parent_canvas"): 
             canvas = self.master._parent_canvas 
             if event.num == 5 or event.delta < 0:
                 canvas.yview_scroll(1, "units")
             elif event.num == 4 or event.delta > 0:
                 canvas.yview_scroll(-1, "units")
-        return "break"
+            return "break"
 
     def _on_frame_configure(self, event=None):
-        # Schedule the wraplength update.
-        # Using 'after_idle' can be more robust than a fixed 'after(x)' ms.
-        self.after_idle(self._update_label_wraplengths)
+        # A resize delivers a burst of <Configure> events; handle them once.
+        if not self._wraplength_update_pending:
+            self._wraplength_update_pending = True
+            self.after_idle(self._update_label_wraplengths)
 
     def _update_label_wraplengths(self):
+        self._wraplength_update_pending = False
         if not self.winfo_exists():
             return
-            
-        parent_width = self.winfo_width()
-        
-        cb_width = self.task_checkbox.winfo_width() if self.task_checkbox.winfo_exists() else 30
-        del_btn_width = self.delete_button.winfo_width() if self.delete_button.winfo_exists() else 70
-
-        # Paddings for elements not in the label's column (column 1)
-        # Checkbox: padx=(12,5) -> 17 total horizontal space including its own assumed internal padding.
-        # Delete button: padx=(5,12) -> 17 total horizontal space.
-        # Label's own grid padding: padx=5 -> 5 on left, 5 on right = 10
-        
-        # Estimate column 0 width (checkbox + its L/R grid padding)
-        col0_effective_width = cb_width + 12 + 5 
-        # Estimate column 2 width (button + its L/R grid padding)
-        col2_effective_width = del_btn_width + 5 + 12
-        
-        # Available width for column 1 (labels' column)
-        available_for_col1_content = parent_width - (col0_effective_width + col2_effective_width)
-        
-        # Subtract the label's own grid padding (padx=5 means 5 on each side)
-        label_grid_padx_total = 5 + 5 
-        final_wraplength = available_for_col1_content - label_grid_padx_total
-
-        if final_wraplength < 20: # Minimum sensible wraplength
-            final_wraplength = 20 
-
-        if self.task_label_description.winfo_exists():
-            self.task_label_description.configure(wraplength=final_wraplength)
-        if self.task_label_details.winfo_exists():
-            self.task_label_details.configure(wraplength=final_wraplength)
+        self.set_wraplength(wraplength_for_width(self._reverse_widget_scaling(self.winfo_width())))
 
+    def set_wraplength(self, wraplength: int):
+        if wraplength == self._wraplength:
+            return
+        self._wraplength = wraplength
+        self.task_label_description.configure(wraplength=wraplength)
+        self.task_label_details.configure(wraplength=wraplength)
 
     def _on_toggle(self):
         if self.toggle_command and self.task.id is not None:
@@ -130,31 +131,27 @@ class TaskItemWidget(ctk.CTkFrame):
             self.delete_command(self.task.id)
 
     def _update_style(self):
-        current_description_color = self.theme["description_text_color"]
-        current_details_color = self.theme["details_text_color"]
-        
-        description_font_slant = "roman"
-        description_font_underline = False
-        details_font_slant = "roman"
-        details_font_underline = False
-
-        if self.checkbox_var.get():
-            description_font_slant = "italic"
-            description_font_underline = True
-            details_font_slant = "italic"
-            details_font_underline = True
-            current_description_color = self.theme["completed_desc_color"]
-            current_details_color = self.theme["completed_desc_color"]
-            
+        completed = bool(self.checkbox_var.get())
+        if completed == self._styled_completed:
+            return # rebinding a pooled card to a task in the same state
+        self._styled_completed = completed
+
+        if completed:
+            description_color = details_color = self.theme["completed_desc_color"]
+            slant, underline = "italic", True
+        else:
+            description_color = self.theme["description_text_color"]
+            details_color = self.theme["details_text_color"]
+            slant, underline = "roman", False
+
         self.task_label_description.configure(
-            font=ctk.CTkFont(slant=description_font_slant, underline=description_font_underline),
-            text_color=current_description_color
+            font=cached_font(slant=slant, underline=underline),
+            text_color=description_color
         )
         self.task_label_details.configure(
-            font=ctk.CTkFont(size=11, slant=details_font_slant, underline=details_font_underline),
-            text_color=current_details_color
+            font=cached_font(size=11, slant=slant, underline=underline),
+            text_color=details_color
         )
-        self.after_idle(self._update_label_wraplengths) # Ensure wraplength is updated after style changes too
 
     def update_task_data(self, task: Task):
         self.task = task
@@ -0,0 +1,62 @@
+import customtkinter as ctk
+from typing import List, Optional
+
+try:
+    from gui.components.fonts import cached_font
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+    from gui.components.fonts import cached_font
+
+TOAST_DURATION_MS = 8000
+MAX_TOAST_LINES = 3
+
+
+class Toast(ctk.CTkFrame):
+    """
+    Small in-window notice placed over the bottom-right corner of its
+    master. Messages that arrive while it is visible are added to it (the
+    newest MAX_TOAST_LINES are kept) and restart the hide timer.
+    """
+
+    def __init__(self, master, app_theme: dict = None, duration_ms: int = TOAST_DURATION_MS):
+        self.theme = app_theme if app_theme else {
+            "card_fg_color": ("#FFFFFF", "#2B2B2B"),
+            "card_border_color": ("#E0E0E0", "#444444"),
+            "details_text_color": ("#555555", "#AAAAAA"),
+            "description_text_color": ("#101010", "#E5E5E5"),
+        }
+        super().__init__(master, corner_radius=8, border_width=1,
+                         fg_color=self.theme["card_fg_color"],
+                         border_color=self.theme["card_border_color"])
+        self.duration_ms = duration_ms
+        self._lines: List[str] = []
+        self._hide_after_id: Optional[str] = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.title_label = ctk.CTkLabel(self, text="", anchor="w", font=cached_font(size=12),
+                                        text_color=self.theme["description_text_color"])
+        self.title_label.grid(row=0, column=0, padx=(12, 4), pady=(8, 0), sticky="w")
+        self.body_label = ctk.CTkLabel(self, text="", anchor="w", justify="left", wraplength=320,
+                                       text_color=self.theme["details_text_color"])
+        self.body_label.grid(row=1, column=0, columnspan=2, padx=12, pady=(0, 10), sticky="w")
+        self.close_button = ctk.CTkButton(self, text="x", width=24, height=24, command=self.hide)
+        self.close_button.grid(row=0, column=1, padx=(4, 8), pady=(8, 0), sticky="e")
+
+    def show(self, title: str, message: str):
+        self._lines = (self._lines + [message])[-MAX_TOAST_LINES:]
+        self.title_label.configure(text=title)
+        self.body_label.configure(text="\n".join(self._lines))
+        self.place(relx=1.0, rely=1.0, x=-20, y=-20, anchor="se")
+        self.lift()
+        if self._hide_after_id is not None:
+            self.after_cancel(self._hide_after_id)
+        self._hide_after_id = self.after(self.duration_ms, self.hide)
+
+    def hide(self):
+        if self._hide_after_id is not None:
+            self.after_cancel(self._hide_after_id)
+            self._hide_after_id = None
+        self._lines = []
+        self.place_forget()
@@ -0,0 +1,243 @@
+import customtkinter as ctk
+import tkinter as tk
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+
+class VirtualListView(ctk.CTkFrame):
+    """
+    Scrollable list that only keeps enough row widgets alive to cover the
+    viewport (plus a small buffer). Rows have a fixed height; scrolling moves
+    the pooled widgets and rebinds only the ones whose item changed.
+
+    Items are identified by `key`, so single-item changes (insert_item,
+    remove_item, update_item) touch at most one widget instead of rebuilding
+    the list.
+
+    Resizes are coalesced: a burst of <Configure> events causes one render,
+    and `resize_rows(rows, row_width)` is called only when the row width
+    (in widget units) actually changed, or for rows newly added to the pool.
+    """
+
+    def __init__(self, master, create_row: Callable[[tk.Misc, Any], tk.Misc],
+                 bind_row: Callable[[Any, Any], None], row_height: int,
+                 label_text: str = "", label_text_color=None,
+                 key: Callable[[Any], Hashable] = id,
+                 buffer_rows: int = 2, row_padx: int = 5, row_pady: int = 6,
+                 resize_rows: Optional[Callable[[Sequence[tk.Misc], float], None]] = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._create_row = create_row
+        self._bind_row = bind_row
+        self._key = key
+        self._row_height = row_height
+        self._buffer_rows = buffer_rows
+        self._row_padx = row_padx
+        self._row_pady = row_pady
+        self._resize_rows = resize_rows
+        self._row_width: Optional[float] = None  # last width pushed to resize_rows
+        self._resized_rows = 0  # pool rows that have received it
+        self._resize_pending = False
+
+        self._items: List[Any] = []
+        self._items_by_key: Dict[Hashable, Any] = {}
+        self._offset = 0  # pixels scrolled from the top of the list
+        self._pool: List[tk.Misc] = []
+        self._pool_window_ids: List[int] = []
+        self._pool_keys: List[Optional[Hashable]] = []  # key of the item each pooled row shows
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        if label_text:
+            self._label = ctk.CTkLabel(self, text=label_text, text_color=label_text_color)
+            self._label.grid(row=0, column=0, columnspan=2, sticky="ew", padx=8, pady=(6, 2))
+
+        self.viewport = tk.Canvas(self, highlightthickness=0, borderwidth=0,
+                                  bg=self._apply_appearance_mode(self._fg_color))
+        self.viewport.grid(row=1, column=0, sticky="nsew", padx=(6, 0), pady=6)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 2), pady=6)
+
+        self.viewport.bind("<Configure>", self._on_viewport_configure)
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel_all, add="+")
+        self.bind_all("<Button-4>", self._on_mouse_wheel_all, add="+")
+        self.bind_all("<Button-5>", self._on_mouse_wheel_all, add="+")
+
+    def _on_viewport_configure(self, event=None):
+        if not self._resize_pending:
+            self._resize_pending = True
+            self.after_idle(self._on_viewport_resized)
+
+    def _on_viewport_resized(self):
+        self._resize_pending = False
+        self._render()
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self.viewport.configure(bg=self._apply_appearance_mode(self._fg_color))
+
+    @property
+    def items(self) -> Sequence[Any]:
+        return self._items
+
+    def set_items(self, items: Sequence[Any], keep_offset: bool = False):
+        self._items = list(items)
+        self._items_by_key = {self._key(item): item for item in self._items}
+        if not keep_offset:
+            self._offset = 0
+        self._pool_keys = [None] * len(self._pool)  # force every visible row to rebind
+        self._render()
+
+    def refresh(self):
+        """Rebinds the visible rows, e.g. after items were mutated in place."""
+        self._pool_keys = [None] * len(self._pool)
+        self._render()
+
+    def get_item(self, key: Hashable) -> Optional[Any]:
+        return self._items_by_key.get(key)
+
+    def _first_visible_index(self) -> int:
+        return self._offset // self._physical_row_height()
+
+    def insert_item(self, index: int, item: Any):
+        index = max(0, min(index, len(self._items)))
+        self._items.insert(index, item)
+        self._items_by_key[self._key(item)] = item
+        if index < self._first_visible_index():
+            # Shift with the content so the rows on screen stay where they are.
+            self._offset += self._physical_row_height()
+        self._render()
+
+    def remove_item(self, key: Hashable) -> bool:
+        item = self._items_by_key.pop(key, None)
+        if item is None:
+            return False
+        index = self._items.index(item)
+        del self._items[index]
+        if index < self._first_visible_index():
+            self._offset -= self._physical_row_height()
+        self._render()
+        return True
+
+    def update_item(self, item: Any) -> bool:
+        """Replaces the item with the same key and rebinds its row if visible."""
+        key = self._key(item)
+        old_item = self._items_by_key.get(key)
+        if old_item is None:
+            return False
+        if old_item is not item:
+            self._items[self._items.index(old_item)] = item
+            self._items_by_key[key] = item
+        for slot, slot_key in enumerate(self._pool_keys):
+            if slot_key == key:
+                self._bind_row(self._pool[slot], item)
+        return True
+
+    def _physical_row_height(self) -> int:
+        return max(1, round(self._apply_widget_scaling(self._row_height)))
+
+    def _content_height(self) -> int:
+        return len(self._items) * self._physical_row_height()
+
+    def _clamp_offset(self):
+        max_offset = max(0, self._content_height() - self.viewport.winfo_height())
+        self._offset = min(max(0, self._offset), max_offset)
+
+    def _ensure_pool(self, count: int):
+        while len(self._pool) < count:
+            item_index = len(self._pool)
+            if item_index >= len(self._items):
+                return
+            widget = self._create_row(self.viewport, self._items[item_index])
+            window_id = self.viewport.create_window(0, 0, window=widget, anchor="nw", state="hidden")
+            self._pool.append(widget)
+            self._pool_window_ids.append(window_id)
+            self._pool_keys.append(None)
+
+    def _render(self):
+        viewport_height = self.viewport.winfo_height()
+        viewport_width = self.viewport.winfo_width()
+        if viewport_height <= 1:
+            return  # not mapped yet; <Configure> will call back
+
+        row_height = self._physical_row_height()
+        pad_x = round(self._apply_widget_scaling(self._row_padx))
+        pad_y = round(self._apply_widget_scaling(self._row_pady))
+        self._clamp_offset()
+
+        visible_rows = viewport_height // row_height + 2
+        self._ensure_pool(visible_rows + self._buffer_rows)
+        pool_size = len(self._pool)
+        if self._resize_rows is not None:
+            self._push_row_width(self._reverse_widget_scaling(max(1, viewport_width - 2 * pad_x)))
+        if pool_size == 0:
+            self._update_scrollbar()
+            return
+
+        first = max(0, self._offset // row_height - self._buffer_rows // 2)
+        wanted = {self._key(self._items[index]): index
+                  for index in range(first, min(first + pool_size, len(self._items)))}
+
+        # Rows already showing a wanted item keep it (they just move); only the
+        # leftover slots are rebound, so a single insert/remove/scroll step
+        # costs one widget update.
+        placed: Dict[Hashable, int] = {}
+        free_slots: List[int] = []
+        for slot, slot_key in enumerate(self._pool_keys):
+            if slot_key is not None and slot_key in wanted and slot_key not in placed:
+                placed[slot_key] = slot
+            else:
+                free_slots.append(slot)
+        for key, index in wanted.items():
+            slot = placed.get(key)
+            if slot is None:
+                slot = free_slots.pop()
+                self._bind_row(self._pool[slot], self._items[index])
+                self._pool_keys[slot] = key
+            window_id = self._pool_window_ids[slot]
+            self.viewport.coords(window_id, pad_x, index * row_height - self._offset + pad_y)
+            self.viewport.itemconfigure(window_id, state="normal",
+                                        width=max(1, viewport_width - 2 * pad_x),
+                                        height=max(1, row_height - 2 * pad_y))
+        for slot in free_slots:
+            self.viewport.itemconfigure(self._pool_window_ids[slot], state="hidden")
+            self._pool_keys[slot] = None
+        self._update_scrollbar()
+
+    def _push_row_width(self, row_width: float):
+        if row_width != self._row_width:
+            self._row_width = row_width
+            self._resized_rows = 0
+        if self._resized_rows < len(self._pool):
+            self._resize_rows(self._pool[self._resized_rows:], row_width)
+            self._resized_rows = len(self._pool)
+
+    def _update_scrollbar(self):
+        total = self._content_height()
+        viewport_height = self.viewport.winfo_height()
+        if total <= viewport_height or total == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + viewport_height) / total)
+
+    def yview(self, *args: Any):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * self._content_height())
+        elif args[0] == "scroll":
+            amount, what = int(args[1]), args[2]
+            step = self.viewport.winfo_height() if what == "pages" else self._physical_row_height() // 2
+            self._offset += amount * step
+        self._render()
+
+    def yview_scroll(self, number: int, what: str):
+        self.yview("scroll", number, what)
+
+    def _on_mouse_wheel_all(self, event):
+        widget_path, viewport_path = str(event.widget), str(self.viewport)
+        if widget_path != viewport_path and not widget_path.startswith(viewport_path + "."):
+            return
+        if event.num == 5 or event.delta < 0:
+            self.yview_scroll(1, "units")
+        elif event.num == 4 or event.delta > 0:
+            self.yview_scroll(-1, "units")
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+CACHE_DATABASE_NAME = "llm_cache.db"
+CACHE_DATABASE_PATH = os.path.join(os.path.dirname(__file__), '..', CACHE_DATABASE_NAME)
+MEMORY_CAPACITY = 2048
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+EVICT_EVERY_WRITES = 1000  # expired rows are purged from disk this often
+_SQL_BATCH = 500  # keys per IN (...) lookup, below SQLite's variable limit
+
+
+class ResponseCache:
+    """
+    Two-level cache of LLM responses keyed by a hash of provider and prompt:
+    an in-memory LRU in front of a SQLite table. Entries expire ttl_seconds
+    after they were stored, in both levels; a disk hit is promoted to memory.
+
+    path=None keeps the cache in memory only. The cache has its own database
+    file so its writes never wait on the application's. Thread-safe.
+    """
+
+    def __init__(self, path: Optional[str] = CACHE_DATABASE_PATH, capacity: int = MEMORY_CAPACITY,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # key -> (response, expires_at)
+        self._writes_since_evict = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0  # expired entries dropped, from either level
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+                self._conn.execute("PRAGMA journal_mode = WAL")
+                self._conn.execute("PRAGMA synchronous = NORMAL")
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        expires_at REAL NOT NULL
+                    ) WITHOUT ROWID
+                """)
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache (expires_at)")
+            except sqlite3.Error as e:
+                print(f"Error opening LLM cache at {path}, using memory only: {e}")
+                self._conn = None
+        self.evict_expired()
+
+    @staticmethod
+    def key_for(signature: str, prompt: str) -> str:
+        return hashlib.sha256(f"{signature}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def get_memory(self, key: str) -> Optional[str]:
+        """Memory-only lookup, cheap enough for the submitting thread."""
+        with self._lock:
+            return self._get_memory(key, self._clock())
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        response, expires_at = entry
+        if expires_at <= now:
+            del self._memory[key]
+            self.evicted += 1
+            return None
+        self._memory.move_to_end(key)
+        self.memory_hits += 1
+        return response
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        now = self._clock()
+        found: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                response = self._get_memory(key, now)
+                if response is None: missing.append(key)
+                else: found[key] = response
+            if missing and self._conn is not None:
+                try:
+                    for start in range(0, len(missing), _SQL_BATCH):
+                        chunk = missing[start:start + _SQL_BATCH]
+                        placeholders = ",".join("?" * len(chunk))
+                        rows = self._conn.execute(
+                            f"SELECT key, response, expires_at FROM llm_cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                            (*chunk, now)
+                        ).fetchall()
+                        for key, response, expires_at in rows:
+                            found[key] = response
+                            self._remember(key, response, expires_at)
+                            self.disk_hits += 1
+                except sqlite3.Error as e:
+                    print(f"Error reading LLM cache: {e}")
+            self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def put(self, key: str, response: str):
+        self.put_many({key: response})
+
+    def put_many(self, responses: Mapping[str, str]):
+        if not responses:
+            return
+        now = self._clock()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            for key, response in responses.items():
+                self._remember(key, response, expires_at)
+            if self._conn is not None:
+                try:
+                    with self._conn:  # one transaction per batch
+                        self._conn.execute("BEGIN")
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO llm_cache (key, response, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                            [(key, response, now, expires_at) for key, response in responses.items()]
+                        )
+                except sqlite3.Error as e:
+                    print(f"Error writing LLM cache: {e}")
+            self._writes_since_evict += len(responses)
+            evict = self._writes_since_evict >= EVICT_EVERY_WRITES
+        if evict:
+            self.evict_expired()
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def evict_expired(self) -> int:
+        """Drops expired entries from memory and disk; returns how many went."""
+        now = self._clock()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._memory.items() if expires_at <= now]
+            for key in expired:
+                del self._memory[key]
+            removed = len(expired)
+            if self._conn is not None:
+                try:
+                    removed += self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+                except sqlite3.Error as e:
+                    print(f"Error evicting expired LLM cache entries: {e}")
+            self._writes_since_evict = 0
+            self.evicted += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM llm_cache")
+                except sqlite3.Error as e:
+                    print(f"Error clearing LLM cache: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {"memory_entries": len(self._memory), "memory_hits": self.memory_hits,
+                    "disk_hits": self.disk_hits, "misses": self.misses, "evicted": self.evicted,
+                    "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0}
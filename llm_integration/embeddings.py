@@ -0,0 +1,142 @@
+import re
+import unicodedata
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+TOKEN_CACHE_LIMIT = 200_000
+
+
+class Embedder:
+    """
+    Maps texts to L2-normalised float32 vectors of a fixed dimension, one
+    row per text. Implementations must be deterministic: the same text (and
+    the same fitted state) always gives the same vector.
+    """
+    dimension: int = 0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def fit(self, texts: Iterable[str]):
+        """Learns corpus statistics, if the embedder uses any. Optional."""
+
+    def signature(self) -> str:
+        """Identifies which vectors are comparable: equal signatures, same vector space."""
+        return f"{type(self).__name__}:{self.dimension}"
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    matrix /= norms
+    return matrix
+
+
+class HashingEmbedder(Embedder):
+    """
+    Offline TF-IDF over hashed features. Words (accents folded, lower-cased)
+    and, optionally, word bigrams are hashed with CRC32 into `dimension`
+    signed buckets. Term frequencies are dampened with log1p, and after
+    fit() each bucket is weighted by its inverse document frequency.
+
+    Nothing is downloaded and the vectors are stable across runs, unlike
+    Python's salted hash().
+    """
+
+    def __init__(self, dimension: int = 256, bigrams: bool = True):
+        self.dimension = dimension
+        self.bigrams = bigrams
+        self.idf: Optional[np.ndarray] = None
+        self._token_cache: Dict[str, Tuple[int, float]] = {}
+
+    def signature(self) -> str:
+        fitted = "idf" if self.idf is not None else "tf"
+        return f"{type(self).__name__}:{self.dimension}:{int(self.bigrams)}:{fitted}"
+
+    def tokens(self, text: str) -> List[str]:
+        folded = unicodedata.normalize("NFKD", text.lower())
+        folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+        words = _WORD_RE.findall(folded)
+        if self.bigrams:
+            return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return words
+
+    def _feature(self, token: str) -> Tuple[int, float]:
+        feature = self._token_cache.get(token)
+        if feature is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            # Low bits pick the bucket, the next bit the sign, so colliding
+            # tokens tend to cancel out instead of piling up.
+            feature = (h % self.dimension, 1.0 if (h // self.dimension) & 1 else -1.0)
+            if len(self._token_cache) >= TOKEN_CACHE_LIMIT:
+                self._token_cache.clear()
+            self._token_cache[token] = feature
+        return feature
+
+    def _sparse(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows: List[int] = []
+        cols: List[int] = []
+        signs: List[float] = []
+        feature = self._feature
+        for row, text in enumerate(texts):
+            for token in self.tokens(text or ""):
+                col, sign = feature(token)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+        return (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64),
+                np.asarray(signs, dtype=np.float32))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if not texts:
+            return matrix
+        rows, cols, signs = self._sparse(texts)
+        np.add.at(matrix, (rows, cols), signs)
+        # Sublinear tf that keeps the sign of the (signed) bucket count.
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+        if self.idf is not None:
+            matrix *= self.idf
+        return _normalize(matrix)
+
+    def fit(self, texts: Iterable[str], batch_size: int = 1000):
+        document_frequency = np.zeros(self.dimension, dtype=np.int64)
+        documents = 0
+        batch: List[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                documents += self._count_documents(batch, document_frequency)
+                batch = []
+        if batch:
+            documents += self._count_documents(batch, document_frequency)
+        self.idf = (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def _count_documents(self, texts: Sequence[str], document_frequency: np.ndarray) -> int:
+        rows, cols, _ = self._sparse(texts)
+        if len(rows):
+            # Each (document, bucket) pair counts once.
+            pairs = np.unique(rows * self.dimension + cols)
+            np.add.at(document_frequency, pairs % self.dimension, 1)
+        return len(texts)
+
+
+_EMBEDDERS = {
+    "hashing": HashingEmbedder,
+}
+
+
+def register_embedder(name: str, factory):
+    """Makes an Embedder available to get_embedder(name), e.g. one backed by a model."""
+    _EMBEDDERS[name] = factory
+
+
+def get_embedder(name: str = "hashing", **kwargs) -> Embedder:
+    try:
+        factory = _EMBEDDERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown embedder {name!r}; available: {', '.join(sorted(_EMBEDDERS))}")
+    return factory(**kwargs)
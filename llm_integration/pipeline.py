@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from llm_integration.cache import ResponseCache
+    from llm_integration.providers import LLMProvider, get_provider
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from llm_integration.cache import ResponseCache
+    from llm_integration.providers import LLMProvider, get_provider
+
+MAX_WORKERS = 4
+MAX_QUEUED_PROMPTS = 1024
+BATCH_WAIT_SECONDS = 0.02
+
+
+class LLMPipeline:
+    """
+    Runs prompts through a provider off the calling thread. submit() returns
+    a Future at once; a dispatcher thread groups queued prompts into batches
+    of up to batch_size (waiting at most batch_wait for a batch to fill) and
+    hands them to a pool of max_workers threads, so at most max_workers
+    provider calls are in flight.
+
+    Responses are cached by content hash: memory hits resolve inside
+    submit(), disk hits on a worker before the provider is called, and
+    identical prompts already in flight share one Future. submit() blocks
+    while max_queue prompts are waiting, which keeps a large job from
+    buffering without limit; the Tk thread should submit through a worker.
+    """
+
+    def __init__(self, provider: Optional[LLMProvider] = None, cache: Optional[ResponseCache] = None,
+                 max_workers: int = MAX_WORKERS, batch_size: Optional[int] = None,
+                 batch_wait: float = BATCH_WAIT_SECONDS, max_queue: int = MAX_QUEUED_PROMPTS):
+        self.provider = provider if provider else get_provider("stub")
+        self.cache = cache if cache else ResponseCache(path=None)
+        self.batch_size = max(1, batch_size or self.provider.max_batch_size)
+        self.batch_wait = batch_wait
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(maxsize=max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nexus-llm")
+        self._slots = threading.BoundedSemaphore(max_workers)  # batches allowed in flight
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}  # cache key -> Future of the queued or running prompt
+        self._stopped = False
+        self._started_at = time.perf_counter()
+        self.submitted = 0         # prompts passed to submit()
+        self.deduplicated = 0      # prompts that joined an identical one already in flight
+        self.completed = 0         # Futures resolved with a response
+        self.failed = 0            # Futures resolved with an exception
+        self.batches = 0           # batches dispatched to the pool
+        self.provider_calls = 0
+        self.provider_prompts = 0
+        self.provider_seconds = 0.0
+        self._dispatcher = threading.Thread(target=self._dispatch, name="nexus-llm-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, prompt: str) -> Future:
+        key = ResponseCache.key_for(self.provider.signature(), prompt)
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("LLMPipeline has been shut down")
+            self.submitted += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future
+            future = Future()
+            cached = self.cache.get_memory(key)
+            if cached is not None:
+                self.completed += 1
+                future.set_result(cached)
+                return future
+            self._in_flight[key] = future
+        self._queue.put((key, prompt))  # blocks while the queue is full
+        return future
+
+    def submit_many(self, prompts: Sequence[str]) -> List[Future]:
+        return [self.submit(prompt) for prompt in prompts]
+
+    def complete(self, prompts: Sequence[str], timeout: Optional[float] = None) -> List[str]:
+        """Blocking convenience: the responses for prompts, in order."""
+        return [future.result(timeout) for future in self.submit_many(prompts)]
+
+    def _dispatch(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.perf_counter() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    # A backlog fills the batch without waiting at all.
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._slots.acquire()
+            with self._lock:
+                self.batches += 1
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[Tuple[str, str]]):
+        try:
+            cached = self.cache.get_many(key for key, _ in batch)
+            misses = [(key, prompt) for key, prompt in batch if key not in cached]
+            responses: Dict[str, str] = dict(cached)
+            error: Optional[BaseException] = None
+            if misses:
+                started = time.perf_counter()
+                try:
+                    completions = self.provider.complete_batch([prompt for _, prompt in misses])
+                    if len(completions) != len(misses):
+                        raise ValueError(f"Provider returned {len(completions)} completions for {len(misses)} prompts")
+                except Exception as e:
+                    print(f"Error in LLM provider call: {e}")
+                    error = e
+                else:
+                    fresh = {key: completion for (key, _), completion in zip(misses, completions)}
+                    self.cache.put_many(fresh)
+                    responses.update(fresh)
+                with self._lock:
+                    self.provider_calls += 1
+                    self.provider_prompts += len(misses)
+                    self.provider_seconds += time.perf_counter() - started
+            self._resolve(batch, responses, error)
+        finally:
+            self._slots.release()
+
+    def _resolve(self, batch: List[Tuple[str, str]], responses: Dict[str, str], error: Optional[BaseException]):
+        with self._lock:
+            futures = [(key, self._in_flight.pop(key)) for key, _ in batch]
+            for key, _ in futures:
+                if key in responses: self.completed += 1
+                else: self.failed += 1
+        # Outside the lock: done-callbacks may submit follow-up prompts.
+        for key, future in futures:
+            if key in responses: future.set_result(responses[key])
+            else: future.set_exception(error if error else RuntimeError("No response"))
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            elapsed = time.perf_counter() - self._started_at
+            stats = {
+                "submitted": self.submitted, "deduplicated": self.deduplicated,
+                "completed": self.completed, "failed": self.failed,
+                "queue_depth": self._queue.qsize(), "in_flight": len(self._in_flight),
+                "batches": self.batches, "provider_calls": self.provider_calls,
+                "provider_prompts": self.provider_prompts,
+                "mean_batch_size": self.provider_prompts / self.provider_calls if self.provider_calls else 0.0,
+                "provider_seconds": round(self.provider_seconds, 3),
+                "throughput_per_s": self.completed / elapsed if elapsed > 0 else 0.0,
+            }
+        stats.update({f"cache_{name}": value for name, value in self.cache.stats().items()})
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stops accepting prompts; those already queued are still answered."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self._queue.put(None)
+        if wait:
+            self._dispatcher.join()
+            self._executor.shutdown(wait=True)
+            self.cache.close()
@@ -0,0 +1,77 @@
+import hashlib
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+
+class LLMProvider:
+    """
+    Something that turns prompts into completions. complete_batch() gets up
+    to max_batch_size prompts and returns one completion per prompt, in
+    order; it is called from pipeline threads, so it must be thread-safe.
+    """
+    name: str = "provider"
+    model: str = ""
+    max_batch_size: int = 1
+
+    def complete_batch(self, prompts: Sequence[str]) -> List[str]:
+        raise NotImplementedError
+
+    def signature(self) -> str:
+        """Part of every cache key: responses are only reused for the same provider and model."""
+        return f"{self.name}:{self.model}"
+
+
+class StubProvider(LLMProvider):
+    """
+    Local, deterministic stand-in for a real model, for tests and benchmarks.
+    The completion is derived from a hash of the prompt, so repeated prompts
+    give repeated answers. `latency` is slept once per batch and
+    `per_prompt_latency` once per prompt, to imitate a remote call.
+    """
+    name = "stub"
+
+    def __init__(self, model: str = "stub-1", max_batch_size: int = 16,
+                 latency: float = 0.0, per_prompt_latency: float = 0.0,
+                 respond: Optional[Callable[[str], str]] = None):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.latency = latency
+        self.per_prompt_latency = per_prompt_latency
+        self._respond = respond
+        self._lock = threading.Lock()
+        self.calls = 0    # complete_batch() invocations
+        self.prompts = 0  # prompts answered
+
+    def complete_batch(self, prompts: Sequence[str]) -> List[str]:
+        delay = self.latency + self.per_prompt_latency * len(prompts)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self.calls += 1
+            self.prompts += len(prompts)
+        return [self._respond(prompt) if self._respond else self._default_response(prompt) for prompt in prompts]
+
+    @staticmethod
+    def _default_response(prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        first_line = prompt.strip().splitlines()[0] if prompt.strip() else ""
+        return f"[stub {digest}] {first_line[:60]}"
+
+
+_PROVIDERS = {
+    "stub": StubProvider,
+}
+
+
+def register_provider(name: str, factory):
+    """Makes an LLMProvider available to get_provider(name), e.g. one for a hosted API."""
+    _PROVIDERS[name] = factory
+
+
+def get_provider(name: str = "stub", **kwargs) -> LLMProvider:
+    try:
+        factory = _PROVIDERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown provider {name!r}; available: {', '.join(sorted(_PROVIDERS))}")
+    return factory(**kwargs)
@@ -0,0 +1,204 @@
+import copy
+import sys
+import os
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import data.database as db
+    from llm_integration.embeddings import Embedder, get_embedder
+    from llm_integration.vector_index import VectorIndex
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from llm_integration.embeddings import Embedder, get_embedder
+    from llm_integration.vector_index import VectorIndex
+
+KINDS = ("note", "task")
+EMBED_BATCH_SIZE = 1000
+RELATED_LIMIT = 5
+
+
+class Related:
+    __slots__ = ("kind", "id", "score", "text")
+
+    def __init__(self, kind: str, id: int, score: float, text: str):
+        self.kind = kind # "note" or "task"
+        self.id = id
+        self.score = score # cosine similarity, higher is closer
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Related(kind={self.kind!r}, id={self.id!r}, score={self.score:.3f}, text={self.text[:30]!r})"
+
+
+def _batched(rows: Iterable[Tuple[int, str]], size: int) -> Iterator[List[Tuple[int, str]]]:
+    batch: List[Tuple[int, str]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _texts(kind: str) -> Iterator[Tuple[int, str]]:
+    if kind == "note":
+        return ((note.id, note.content) for note in db.iter_notes())
+    return ((task.id, task.description) for task in db.iter_tasks())
+
+
+class SemanticIndex:
+    """
+    "Find related" over notes and tasks: one VectorIndex per kind, built
+    lazily from the database and then kept in step by on_change(), which is
+    meant to be registered as a Repository observer.
+
+    Changes made while the index is being built are queued and applied once
+    it is ready. Writes that bypass the Repository are picked up by
+    rebuild().
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = None, batch_size: int = EMBED_BATCH_SIZE):
+        self.embedder = embedder if embedder else get_embedder("hashing")
+        self.batch_size = batch_size
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._lock = threading.RLock()
+        self._built = False
+        self._building = False
+        self._closed = False
+        self._queued_changes: List[Tuple[str, str, int, Optional[str]]] = []
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def close(self):
+        """Makes a build in progress stop early; the index stays unbuilt."""
+        self._closed = True
+
+    def ensure_built(self) -> bool:
+        if self._built:
+            return True
+        return self.rebuild()
+
+    def rebuild(self) -> bool:
+        with self._lock:
+            if self._building:
+                return False
+            self._building = True
+        try:
+            # idf comes from the whole corpus, so it is fitted in a first
+            # streaming pass and then kept fixed for incremental updates. A
+            # copy is fitted: the current indexes stay in the old vector space
+            # (and on_change()/search_text() keep using it) until the swap.
+            embedder = copy.copy(self.embedder)
+            embedder.fit(self._corpus())
+            if self._closed:
+                return False
+            indexes: Dict[str, VectorIndex] = {}
+            for kind in KINDS:
+                index = VectorIndex(embedder.dimension)
+                for batch in _batched(_texts(kind), self.batch_size):
+                    if self._closed:
+                        return False
+                    ids = [item_id for item_id, _ in batch]
+                    index.upsert(ids, embedder.embed([text for _, text in batch]))
+                indexes[kind] = index
+            with self._lock:
+                self.embedder = embedder
+                self._indexes = indexes
+                self._built = True
+                queued, self._queued_changes = self._queued_changes, []
+                for change in queued:
+                    self._apply_change(*change)
+            return True
+        finally:
+            with self._lock:
+                self._building = False
+
+    def _corpus(self) -> Iterator[str]:
+        for kind in KINDS:
+            for _, text in _texts(kind):
+                if self._closed:
+                    return
+                yield text
+
+    def on_change(self, kind: str, action: str, item_id: int, item=None):
+        if kind not in KINDS or action == "completed":
+            return # only the text matters here
+        text = None
+        if item is not None:
+            text = item.content if kind == "note" else item.description
+        with self._lock:
+            if self._built:
+                self._apply_change(kind, action, item_id, text)
+            if self._building:
+                # The build may have read this row before the change.
+                self._queued_changes.append((kind, action, item_id, text))
+            # Neither: the eventual build reads the change from the database.
+
+    def _apply_change(self, kind: str, action: str, item_id: int, text: Optional[str]):
+        index = self._indexes[kind]
+        if action == "deleted" or text is None:
+            index.remove([item_id])
+        else:
+            index.upsert([item_id], self.embedder.embed([text]))
+
+    def size(self) -> Dict[str, int]:
+        with self._lock:
+            return {kind: len(index) for kind, index in self._indexes.items()}
+
+    def find_related(self, note_id: int, limit: int = RELATED_LIMIT,
+                     kinds: Sequence[str] = KINDS) -> List[Related]:
+        return self.find_related_batch([note_id], limit, kinds).get(note_id, [])
+
+    def find_related_batch(self, note_ids: Sequence[int], limit: int = RELATED_LIMIT,
+                           kinds: Sequence[str] = KINDS) -> Dict[int, List[Related]]:
+        """Related items for several notes with one matrix product per kind."""
+        if not self.ensure_built():
+            return {}
+        with self._lock:
+            notes = self._indexes["note"]
+            known = [note_id for note_id in note_ids if note_id in notes]
+            if not known:
+                return {}
+            queries = np.stack([notes.vector(note_id) for note_id in known])
+            hits: Dict[int, List[Tuple[str, int, float]]] = {note_id: [] for note_id in known}
+            for kind in kinds:
+                exclude = [{note_id} if kind == "note" else set() for note_id in known]
+                for note_id, results in zip(known, self._indexes[kind].search(queries, limit, exclude)):
+                    hits[note_id].extend((kind, item_id, score) for item_id, score in results)
+        return {note_id: self._materialize(sorted(found, key=lambda hit: -hit[2])[:limit])
+                for note_id, found in hits.items()}
+
+    def search_text(self, text: str, limit: int = RELATED_LIMIT,
+                    kinds: Sequence[str] = KINDS) -> List[Related]:
+        """Items closest to free text, e.g. an unsaved note being written."""
+        if not text.strip() or not self.ensure_built():
+            return []
+        found: List[Tuple[str, int, float]] = []
+        with self._lock:
+            query = self.embedder.embed([text])  # in the same vector space as the indexes
+            for kind in kinds:
+                found.extend((kind, item_id, score) for item_id, score in self._indexes[kind].search(query, limit)[0])
+        return self._materialize(sorted(found, key=lambda hit: -hit[2])[:limit])
+
+    def _materialize(self, hits: List[Tuple[str, int, float]]) -> List[Related]:
+        hits = [hit for hit in hits if hit[2] > 0]  # a score of 0 means nothing in common
+        # Notes are shown by their preview, so the full content is not read.
+        previews = db.get_note_previews([item_id for kind, item_id, _ in hits if kind == "note"])
+        related = []
+        for kind, item_id, score in hits:
+            if kind == "note":
+                note = previews.get(item_id)
+                text = note.preview if note is not None else None
+            else:
+                task = db.get_task_by_id(item_id)
+                text = task.description if task is not None else None
+            if text is not None:
+                related.append(Related(kind, item_id, score, text))
+        return related
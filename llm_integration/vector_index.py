@@ -0,0 +1,151 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+SEARCH_BLOCK_ROWS = 65_536  # rows scored per matrix product; bounds temporary memory
+
+
+class VectorIndex:
+    """
+    Dense id -> vector store for cosine search. Vectors are expected to be
+    L2-normalised, so a dot product is the cosine similarity.
+
+    Rows live in one preallocated matrix that grows by doubling; removing an
+    id moves the last row into its slot, so the live rows stay contiguous and
+    every search is a handful of matrix products.
+    """
+
+    def __init__(self, dimension: int, initial_capacity: int = 1024):
+        self.dimension = dimension
+        self._vectors = np.zeros((max(1, initial_capacity), dimension), dtype=np.float32)
+        self._ids = np.zeros(max(1, initial_capacity), dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._size = 0
+        self._read_only = False  # True while backed by a memory-mapped file
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    def vector(self, item_id: int) -> Optional[np.ndarray]:
+        row = self._rows.get(item_id)
+        return None if row is None else self._vectors[row]
+
+    def _make_writable(self):
+        if self._read_only:
+            self._vectors = np.array(self._vectors)
+            self._ids = np.array(self._ids)
+            self._read_only = False
+
+    def _reserve(self, size: int):
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        capacity = max(1, capacity)
+        while capacity < size:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._vectors, self._ids = vectors, ids
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray):
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if len(ids) and vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got {vectors.shape[1]}")
+        self._make_writable()
+        self._reserve(self._size + len(ids))
+        for item_id, vector in zip(ids, vectors):
+            row = self._rows.get(item_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[item_id] = row
+                self._ids[row] = item_id
+            self._vectors[row] = vector
+
+    def remove(self, ids: Iterable[int]) -> int:
+        self._make_writable()
+        removed = 0
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._size -= 1
+            removed += 1
+        return removed
+
+    def search(self, queries: np.ndarray, k: int,
+               exclude: Optional[Sequence[Set[int]]] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k (id, cosine) per query row, best first. exclude[i] lists ids to
+        leave out of query i's results (e.g. the query item itself).
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        query_count = len(queries)
+        if self._size == 0 or k <= 0:
+            return [[] for _ in range(query_count)]
+        # Fetch a few extra candidates so excluded ids can be dropped afterwards.
+        extra = max((len(ids) for ids in exclude), default=0) if exclude else 0
+        keep = min(k + extra, self._size)
+
+        best_scores = np.full((query_count, 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((query_count, 0), dtype=np.int64)
+        for start in range(0, self._size, SEARCH_BLOCK_ROWS):
+            block = self._vectors[start:min(start + SEARCH_BLOCK_ROWS, self._size)]
+            scores = queries @ block.T  # (queries, block rows)
+            if scores.shape[1] > keep:
+                top = np.argpartition(scores, -keep, axis=1)[:, -keep:]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            if best_scores.shape[1] > keep:
+                top = np.argpartition(best_scores, -keep, axis=1)[:, -keep:]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = self._ids[np.take_along_axis(best_rows, order, axis=1)]
+        results = []
+        for i in range(query_count):
+            skip = exclude[i] if exclude else ()
+            hits = [(int(item_id), float(score)) for item_id, score in zip(best_ids[i], best_scores[i])
+                    if int(item_id) not in skip]
+            results.append(hits[:k])
+        return results
+
+    def save(self, path_prefix: str):
+        """Writes <prefix>.vectors.npy and <prefix>.ids.npy."""
+        np.save(f"{path_prefix}.vectors.npy", self._vectors[:self._size])
+        np.save(f"{path_prefix}.ids.npy", self._ids[:self._size])
+
+    @classmethod
+    def load(cls, path_prefix: str, mmap: bool = False) -> "VectorIndex":
+        """
+        Loads a saved index. With mmap the vectors stay on disk and are paged
+        in by searches; the first write copies them into memory.
+        """
+        vectors = np.load(f"{path_prefix}.vectors.npy", mmap_mode="r" if mmap else None)
+        ids = np.load(f"{path_prefix}.ids.npy")
+        index = cls(vectors.shape[1], initial_capacity=1)
+        index._vectors, index._ids = vectors, ids
+        index._size = len(ids)
+        index._rows = {int(item_id): row for row, item_id in enumerate(ids)}
+        index._read_only = mmap
+        return index
@@ -1,24 +1,68 @@
+import time
+_process_start = time.perf_counter()
+
+import argparse
 import sys
 import os
+from typing import List, Tuple
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(script_dir)
 
 try:
     from gui.app_window import AppWindow
-    # We also need to ensure the database module is loaded so initialization runs
     import data.database
+    from data import instrumentation
 except ImportError as e:
     print(f"Error during initial imports: {e}")
     print("Ensure file structure is correct and all __init__.py files exist.")
     sys.exit(1)
 
+class StartupProfile:
+    """Records how long each startup phase took, measured from process start."""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.last = start
+        self.phases: List[Tuple[str, float, float]] = [] # (name, ms since start, ms for this phase)
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.start) * 1000, (now - self.last) * 1000))
+        self.last = now
+        if phase == "fully loaded":
+            self.report()
+
+    def report(self):
+        print("Startup profile:")
+        for phase, total_ms, phase_ms in self.phases:
+            print(f"  {phase:<14} {phase_ms:8.1f} ms  (at {total_ms:8.1f} ms)")
+
 def main():
+    parser = argparse.ArgumentParser(description="NexusTask AI")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase takes")
+    parser.add_argument("--profile-db", action="store_true",
+                        help="report the database calls made by each GUI action, and totals on exit")
+    parser.add_argument("--slow-query-ms", type=float, default=None,
+                        help="with --profile-db, log calls at least this slow with their query plans")
+    args = parser.parse_args()
+
+    if args.profile_db:
+        instrumentation.enable(slow_query_ms=args.slow_query_ms, report_events=True)
+
+    profile = StartupProfile(_process_start) if args.profile_startup else None
+    if profile: profile.mark("imports")
     try:
-        # The database initialization now happens automatically when data.database is imported.
         print("Starting NexusTask AI...")
-        app = AppWindow()
+        # Opening the database also applies any pending schema migrations.
+        data.database.initialize_database()
+        if profile: profile.mark("database open")
+        app = AppWindow(on_startup_phase=profile.mark if profile else None)
+        if profile: profile.mark("window built")
         app.mainloop()
+        data.database.close_database()
+        if args.profile_db: print(instrumentation.report())
         print("NexusTask AI closed.")
     except Exception as e:
         print(f"Unexpected error running the application: {e}")
@@ -26,4 +70,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
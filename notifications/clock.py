@@ -0,0 +1,58 @@
+import datetime
+import threading
+from typing import Callable, List, Optional
+
+MAX_SLEEP_SECONDS = 60.0
+
+
+class SystemClock:
+    """Wall-clock time for the ReminderScheduler."""
+
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.now()
+
+    def seconds_until(self, deadline: Optional[datetime.datetime]) -> Optional[float]:
+        """How long to sleep before deadline; None means until woken."""
+        if deadline is None:
+            return None
+        # Capped so a wall-clock jump (suspend, DST, manual change) is noticed
+        # within a minute instead of after the originally computed sleep.
+        return min(max(0.0, (deadline - self.now()).total_seconds()), MAX_SLEEP_SECONDS)
+
+    def on_advance(self, callback: Callable[[], None]):
+        """Real time needs no notifications; see FakeClock."""
+
+
+class FakeClock(SystemClock):
+    """
+    Clock that only moves when advance() or set() is called, for driving a
+    ReminderScheduler deterministically. Sleepers wait until the clock is
+    advanced rather than for real time to pass.
+    """
+
+    def __init__(self, start: Optional[datetime.datetime] = None):
+        self._now = start if start else datetime.datetime(2025, 1, 1, 8, 0)
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[], None]] = []
+
+    def now(self) -> datetime.datetime:
+        with self._lock:
+            return self._now
+
+    def seconds_until(self, deadline: Optional[datetime.datetime]) -> Optional[float]:
+        if deadline is not None and deadline <= self.now():
+            return 0.0
+        return None
+
+    def on_advance(self, callback: Callable[[], None]):
+        self._listeners.append(callback)
+
+    def set(self, moment: datetime.datetime):
+        with self._lock:
+            self._now = moment
+        for callback in list(self._listeners):
+            callback()
+
+    def advance(self, delta: datetime.timedelta = datetime.timedelta(0), **kwargs: float):
+        """advance(timedelta(hours=1)) or advance(hours=1)."""
+        self.set(self.now() + delta + datetime.timedelta(**kwargs))
@@ -0,0 +1,236 @@
+import datetime
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import data.database as db
+    from core.models import Task
+    from notifications.clock import SystemClock
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from core.models import Task
+    from notifications.clock import SystemClock
+
+DEFAULT_REMIND_AT = datetime.time(9, 0)
+HORIZON_DAYS = 7
+CATCH_UP = datetime.timedelta(days=1)
+
+
+class Reminder:
+    __slots__ = ("task_id", "description", "due_date", "fire_at")
+
+    def __init__(self, task_id: int, description: str, due_date: datetime.date, fire_at: datetime.datetime):
+        self.task_id = task_id
+        self.description = description
+        self.due_date = due_date
+        self.fire_at = fire_at
+
+    def __repr__(self) -> str:
+        return (f"Reminder(task_id={self.task_id!r}, description={self.description!r}, "
+                f"due_date={self.due_date!r}, fire_at={self.fire_at!r})")
+
+
+ReminderSink = Callable[[Reminder], None]
+
+
+class ReminderScheduler:
+    """
+    Fires one reminder per open task at remind_at on its due date, minus
+    `lead`. Only the next `horizon_days` of due dates are held, in a min-heap
+    of fire times loaded with an indexed range query; the next window is
+    loaded when the clock reaches it. The scheduler thread sleeps until the
+    earliest fire time (or until a change wakes it), never polling the table.
+
+    on_change() is a Repository observer: added, rescheduled, completed and
+    deleted tasks update the heap in place. Replaced entries stay in the heap
+    marked cancelled and are skipped when they surface.
+
+    Reminders missed by at most `catch_up` (e.g. while the app was closed)
+    fire on start; older ones are dropped. Each (task, due date) fires once.
+    """
+
+    def __init__(self, sinks: Optional[List[ReminderSink]] = None, clock: Optional[SystemClock] = None,
+                 remind_at: datetime.time = DEFAULT_REMIND_AT, lead: datetime.timedelta = datetime.timedelta(0),
+                 horizon_days: int = HORIZON_DAYS, catch_up: datetime.timedelta = CATCH_UP,
+                 load_due: Callable[[datetime.date, datetime.date], List[Task]] = db.get_open_tasks_due_between):
+        self.sinks: List[ReminderSink] = list(sinks) if sinks else []
+        self.clock = clock if clock else SystemClock()
+        self.remind_at = remind_at
+        self.lead = lead
+        self.horizon_days = horizon_days
+        self.catch_up = catch_up
+        self._load_due = load_due
+        self._cond = threading.Condition(threading.RLock())
+        self._heap: List[list] = []  # [fire_at, seq, reminder or None when cancelled]
+        self._entries: Dict[int, list] = {}  # task_id -> its live heap entry
+        self._seq = itertools.count()  # tie-breaker so reminders are never compared
+        self._loaded_until: Optional[datetime.date] = None  # due dates before this are in the heap
+        self._not_before: Optional[datetime.datetime] = None  # reminders older than this are dropped
+        self._fired: Set[Tuple[int, datetime.date]] = set()
+        self._completed: Set[int] = set()  # completed in memory, maybe not yet in the database
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.loads = 0
+        self.loaded_rows = 0
+        self.dispatched = 0
+        self.clock.on_advance(self.wake)
+
+    def add_sink(self, sink: ReminderSink):
+        self.sinks.append(sink)
+
+    def fire_time(self, due_date: datetime.date) -> datetime.datetime:
+        return datetime.datetime.combine(due_date, self.remind_at) - self.lead
+
+    # Heap maintenance; callers hold self._cond.
+
+    def _push(self, task: Task):
+        self._cancel(task.id)
+        if task.completed or task.due_date is None or task.id in self._completed:
+            return
+        if self._loaded_until is None or task.due_date >= self._loaded_until:
+            return  # beyond the loaded window; the next load picks it up
+        fire_at = self.fire_time(task.due_date)
+        if fire_at < self._not_before or (task.id, task.due_date) in self._fired:
+            return
+        entry = [fire_at, next(self._seq), Reminder(task.id, task.description, task.due_date, fire_at)]
+        self._entries[task.id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _cancel(self, task_id: int):
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            entry[2] = None
+
+    def _load_window(self, now: datetime.datetime):
+        # Recomputed on every load, in case the machine slept through days.
+        self._not_before = now - self.catch_up
+        # The earliest due date whose fire time can still be in range.
+        start = (self._not_before + self.lead).date()
+        if self._loaded_until is not None:
+            start = max(start, self._loaded_until)
+        end = max(start, now.date()) + datetime.timedelta(days=self.horizon_days)
+        tasks = self._load_due(start, end)
+        self._loaded_until = end
+        self.loads += 1
+        self.loaded_rows += len(tasks)
+        for task in tasks:
+            self._push(task)
+
+    def _next_deadline(self) -> Optional[datetime.datetime]:
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)  # drop cancelled entries as they surface
+        deadlines = [self.fire_time(self._loaded_until)] if self._loaded_until is not None else []
+        if self._heap:
+            deadlines.append(self._heap[0][0])
+        return min(deadlines) if deadlines else None
+
+    # Public API
+
+    def load(self):
+        """Loads the first window; start() does this on the scheduler thread."""
+        with self._cond:
+            if self._loaded_until is None:
+                self._load_window(self.clock.now())
+
+    def reload(self):
+        """Drops the loaded window so it is read again, after writes on_change() never heard about."""
+        with self._cond:
+            self._heap = []
+            self._entries = {}
+            self._loaded_until = None
+            self._cond.notify()
+
+    def next_fire_at(self) -> Optional[datetime.datetime]:
+        with self._cond:
+            self._next_deadline()
+            return self._heap[0][0] if self._heap else None
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def run_pending(self) -> int:
+        """Dispatches every reminder due by now; returns how many fired."""
+        due: List[Reminder] = []
+        with self._cond:
+            now = self.clock.now()
+            if self._loaded_until is None:
+                self._load_window(now)
+            while self.fire_time(self._loaded_until) <= now:
+                self._load_window(now)
+            while self._heap and self._heap[0][0] <= now:
+                _, _, reminder = heapq.heappop(self._heap)
+                if reminder is None:
+                    continue
+                del self._entries[reminder.task_id]
+                self._fired.add((reminder.task_id, reminder.due_date))
+                due.append(reminder)
+            self.dispatched += len(due)
+        # Sinks run outside the lock so a slow one cannot stall on_change().
+        for reminder in due:
+            for sink in self.sinks:
+                try:
+                    sink(reminder)
+                except Exception as e:
+                    print(f"Error in reminder sink: {e}")
+        return len(due)
+
+    def on_change(self, kind: str, action: str, item_id: int, item=None):
+        if kind != "task":
+            return
+        with self._cond:
+            if action == "completed":
+                completed = item.completed if item is not None else True
+                if completed: self._completed.add(item_id)
+                else: self._completed.discard(item_id)
+            if action == "deleted" or item is None:
+                self._cancel(item_id)
+            else:
+                self._push(item)
+            self._cond.notify()  # the earliest deadline may have changed
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify()
+
+    def start(self) -> threading.Thread:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="nexus-reminders", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    if self._stopped:
+                        break
+                    if self._loaded_until is None:
+                        self._load_window(self.clock.now())
+                    timeout = self.clock.seconds_until(self._next_deadline())
+                    if timeout is None or timeout > 0:
+                        self._cond.wait(timeout)
+                        continue
+                self.run_pending()
+        except Exception as e:
+            print(f"Error in reminder scheduler: {e}")
+        finally:
+            # Connections are per thread; release this one before the thread exits.
+            db.get_connection_manager().close()
+
+    def stop(self, wait: bool = True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"pending": len(self._entries), "heap_size": len(self._heap), "loads": self.loads,
+                    "loaded_rows": self.loaded_rows, "dispatched": self.dispatched}
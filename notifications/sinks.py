@@ -0,0 +1,67 @@
+import logging
+import queue
+import threading
+from typing import Callable
+
+try:
+    from notifications.scheduler import Reminder
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from notifications.scheduler import Reminder
+
+# A sink is any callable taking a Reminder. Sinks are called on the
+# scheduler thread and must not block it for long or touch Tk directly.
+
+
+class LoggingSink:
+    def __init__(self, logger: logging.Logger = logging.getLogger("nexus_task_ai.reminders"),
+                 level: int = logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, reminder: Reminder):
+        self.logger.log(self.level, "Task %s due %s: %s", reminder.task_id, reminder.due_date, reminder.description)
+
+
+class ToastSink:
+    """
+    Hands reminders to `show(reminder)` on the Tk thread. The scheduler
+    thread only queues them and sets a flag; drain() shows them and must be
+    called on the Tk thread by a tick the app runs (AppWindow's toast poll).
+    The sink keeps no after() timer of its own, and drain() costs a flag
+    check while nothing is due.
+    """
+
+    def __init__(self, show: Callable[[Reminder], None]):
+        self._show = show
+        self._queue: "queue.Queue[Reminder]" = queue.Queue()
+        self._pending = threading.Event()
+        self._closed = False
+
+    def __call__(self, reminder: Reminder):
+        # Runs on the scheduler thread: only hand the reminder over, never touch Tk.
+        self._queue.put(reminder)
+        self._pending.set()
+
+    def drain(self) -> int:
+        """Shows the queued reminders; returns how many were shown."""
+        if not self._pending.is_set() or self._closed:
+            return 0
+        self._pending.clear()
+        shown = 0
+        while True:
+            try:
+                reminder = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._show(reminder)
+                shown += 1
+            except Exception as e:
+                print(f"Error showing reminder toast: {e}")
+        return shown
+
+    def close(self):
+        self._closed = True
@@ -0,0 +1,18 @@
+import pytest
+
+try:
+    import data.database as db
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Points data.database at a fresh file for one test."""
+    db.configure_database(str(tmp_path / "test.db"))
+    db.initialize_database()
+    yield db
+    db.close_database()
@@ -0,0 +1,102 @@
+import sqlite3
+
+try:
+    from data.change_feed import ChangeFeed
+    from data.repository import Repository
+    from data.write_behind import WriteBehindBuffer
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data.change_feed import ChangeFeed
+    from data.repository import Repository
+    from data.write_behind import WriteBehindBuffer
+
+
+def other_process(tmp_path, *statements):
+    """Commits statements on a separate connection, as another app instance would."""
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        for sql, params in statements:
+            conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_poll_reports_changes_since_the_last_poll(database, tmp_path):
+    feed = ChangeFeed()
+    assert feed.poll() == []  # only records the starting position
+    assert feed.poll() == []  # nothing committed elsewhere
+    assert feed.unchanged == 1
+
+    task = database.add_task("shared")
+    other_process(tmp_path,
+                  ("INSERT INTO notes (content, created_at) VALUES (?, ?)", ("from elsewhere", "2025-01-01 10:00:00")),
+                  ("UPDATE tasks SET description = ? WHERE id = ?", ("renamed", task.id)),
+                  ("UPDATE tasks SET completed = 1 WHERE id = ?", (task.id,)))
+
+    # The own insert and both updates collapse into one entry for the task.
+    assert feed.poll() == [("task", task.id), ("note", 1)]
+    assert feed.poll() == []
+
+
+def test_poll_asks_for_a_reload_after_too_many_changes(database, tmp_path):
+    feed = ChangeFeed(max_changes=2)
+    feed.poll()
+    other_process(tmp_path, *[("INSERT INTO tasks (description, priority) VALUES (?, 'Media')", (f"t{i}",))
+                              for i in range(3)])
+
+    assert feed.poll() is None
+    assert feed.reloads == 1
+    assert feed.poll() == []  # picks up from the current position
+
+
+def test_poll_asks_for_a_reload_when_rows_were_pruned_unread(database, tmp_path):
+    feed = ChangeFeed()
+    feed.poll()
+    other_process(tmp_path, ("INSERT INTO tasks (description, priority) VALUES ('gone', 'Media')", ()),
+                  ("DELETE FROM change_log", ()),
+                  ("INSERT INTO tasks (description, priority) VALUES ('kept', 'Media')", ()))
+
+    assert feed.poll() is None
+
+
+def test_apply_changes_skips_own_writes_and_reports_others(database, tmp_path):
+    repository = Repository()
+    notified = []
+    repository.add_observer(lambda *change: notified.append(change[:3]))
+    own = repository.add_task("own")
+    gone = repository.add_task("deleted elsewhere")
+    repository.list_tasks()
+    notified.clear()
+
+    other_process(tmp_path, ("UPDATE tasks SET completed = 1 WHERE id = ?", (own.id,)),
+                  ("DELETE FROM tasks WHERE id = ?", (gone.id,)))
+    applied = repository.apply_changes([("task", own.id), ("task", gone.id)])
+
+    assert [change[:3] for change in applied] == notified == [
+        ("task", "completed", own.id), ("task", "deleted", gone.id)]
+    assert repository.get_task(own.id).completed
+    assert [task.id for task in repository.list_tasks()] == [own.id]
+    assert repository.apply_changes([("task", own.id)]) == []
+
+
+def test_buffered_toggle_survives_a_change_after_a_flush(database, tmp_path):
+    repository = Repository()
+    buffer = WriteBehindBuffer(flush_delay=60)
+    task = repository.add_task("toggle me")
+    repository.list_tasks()
+    feed = ChangeFeed()
+    feed.poll()
+
+    repository.apply_task_completed(task.id, True)
+    buffer.set_completed(task.id, True)
+    other_process(tmp_path, ("UPDATE tasks SET description = 'renamed' WHERE id = ?", (task.id,)))
+    # What AppWindow._read_changes does: flush before reading the changes.
+    buffer.flush()
+    repository.apply_changes(feed.poll())
+
+    cached = repository.get_task(task.id)
+    assert (cached.description, cached.completed) == ("renamed", True)
+    buffer.close()
@@ -0,0 +1,53 @@
+import sqlite3
+import threading
+
+import pytest
+
+try:
+    from data.database import ConnectionManager
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data.database import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "test.db"), pragmas={"cache_size": -2000})
+    yield manager
+    manager.close_all()
+
+
+def test_one_connection_per_thread(manager):
+    conn = manager.connection()
+    assert manager.connection() is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(manager.connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not conn
+
+
+def test_pragmas_are_applied_with_overrides(manager):
+    conn = manager.connection()
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2000
+
+
+def test_close_and_close_all(manager):
+    conn = manager.connection()
+    manager.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    reopened = manager.connection()
+    assert reopened is not conn
+
+    manager.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        reopened.execute("SELECT 1")
+    assert manager.connection() is not reopened
@@ -0,0 +1,59 @@
+import datetime
+
+try:
+    from core.models import Task
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.models import Task
+
+
+def test_add_task_returns_the_inserted_row(database):
+    task = database.add_task("write report", priority="Alta", due_date=datetime.date(2025, 3, 1))
+
+    assert task.id is not None
+    assert (task.description, task.priority, task.completed) == ("write report", "Alta", False)
+    stored = database.get_task_by_id(task.id)
+    assert (stored.id, stored.description, stored.priority) == (task.id, "write report", "Alta")
+
+
+def test_add_task_with_invalid_priority_rolls_back(database):
+    assert database.add_task("bad priority", priority="Urgente") is None
+
+    conn = database.get_db_connection()
+    assert not conn.in_transaction
+    assert database.get_all_tasks() == []
+    # The thread's connection is still usable for the next write.
+    note = database.add_note("still works")
+    assert note is not None
+    assert database.update_note(note.id, "edited")
+
+
+def test_add_note_returns_the_inserted_row(database):
+    task = database.add_task("linked")
+    note = database.add_note("some text", task_id=task.id)
+
+    assert note.id is not None
+    assert (note.content, note.task_id) == ("some text", task.id)
+    assert database.get_note_by_id(note.id).content == "some text"
+
+
+def test_add_tasks_bulk_is_all_or_nothing(database):
+    created = database.add_tasks_bulk([Task(None, f"task {i}") for i in range(3)])
+    assert [task.id for task in created] == [1, 2, 3]
+
+    # The second row violates NOT NULL, so neither is written.
+    assert database.add_tasks_bulk([Task(None, "kept out"), Task(None, None)]) == []
+    assert len(database.get_all_tasks()) == 3
+
+
+def test_note_lists_carry_previews_and_get_note_loads_content(database):
+    note = database.add_note("x" * 500)
+    assert database.update_note(note.id, "groceries " + "y" * 300)
+
+    listed = database.get_all_notes()[0]
+    assert listed.content is None
+    assert (listed.preview, listed.content_length) == ("groceries " + "y" * 110, 310)
+    assert database.get_note_by_id(note.id).content == "groceries " + "y" * 300
+    assert [result.id for result in database.search("groceries", kind="note")] == [note.id]
@@ -0,0 +1,108 @@
+import sqlite3
+
+try:
+    import data.database as db
+    from data.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import data.database as db
+    from data.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+
+# The schema initialize_database() created before migrations existed
+# (user_version 0), with a few rows in it.
+BASELINE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        description TEXT NOT NULL,
+        priority TEXT DEFAULT 'Media',
+        due_date DATE,
+        completed BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content TEXT NOT NULL,
+        task_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE SET NULL
+    );
+    INSERT INTO tasks (description, priority, due_date, completed, created_at) VALUES
+        ('pay rent', 'Alta', '2025-01-31', 0, '2025-01-01 09:00:00'),
+        ('water plants', 'Baja', NULL, 1, '2025-01-02 09:00:00'),
+        ('call the bank', 'Media', '2025-02-15', 0, '2025-01-03 09:00:00');
+    INSERT INTO notes (content, task_id, created_at) VALUES
+        ('rent goes up in March', 1, '2025-01-04 10:00:00'),
+        ('loose note', NULL, '2025-01-05 10:00:00');
+'''
+
+
+def make_baseline(path: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+
+
+def schema_of(path: str) -> dict:
+    """Every table, index, trigger and view with its columns, for comparing schemas."""
+    conn = sqlite3.connect(path)
+    try:
+        objects = conn.execute("SELECT type, name, tbl_name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'").fetchall()
+        schema = {}
+        for kind, name, table in objects:
+            columns = ()
+            if kind in ("table", "view"):
+                columns = tuple(row[1] for row in conn.execute(f"PRAGMA table_info('{name}')"))
+            elif kind == "index":
+                columns = tuple(row[2] for row in conn.execute(f"PRAGMA index_info('{name}')"))
+            schema[name] = (kind, table, columns)
+        return schema
+    finally:
+        conn.close()
+
+
+def test_baseline_database_is_migrated_to_latest(tmp_path):
+    path = str(tmp_path / "baseline.db")
+    make_baseline(path)
+    db.configure_database(path)
+    try:
+        assert db.initialize_database() == LATEST_VERSION
+
+        tasks = sorted(db.get_all_tasks(), key=lambda task: task.id)
+        assert [(task.description, task.priority, task.completed) for task in tasks] == [
+            ("pay rent", "Alta", False), ("water plants", "Baja", True), ("call the bank", "Media", False)]
+        notes = sorted(db.get_all_notes(), key=lambda note: note.id)
+        assert [note.task_id for note in notes] == [1, None]
+        assert [(note.preview, note.content_length) for note in notes] == [
+            ("rent goes up in March", 21), ("loose note", 10)]
+        assert [result.id for result in db.search("rent", kind="note")] == [1]
+        assert db.check_task_stats() == []  # backfilled by migration 6
+        # New rows continue the existing ids.
+        assert db.add_task("after the upgrade").id == 4
+    finally:
+        db.close_database()
+
+
+def test_migrated_baseline_matches_a_new_database(tmp_path):
+    migrated, fresh = str(tmp_path / "migrated.db"), str(tmp_path / "fresh.db")
+    make_baseline(migrated)
+    for path in (migrated, fresh):
+        conn = sqlite3.connect(path)
+        apply_migrations(conn)
+        conn.close()
+
+    assert schema_of(migrated) == schema_of(fresh)
+
+
+def test_apply_migrations_is_idempotent(tmp_path):
+    path = str(tmp_path / "twice.db")
+    conn = sqlite3.connect(path)
+    try:
+        assert apply_migrations(conn) == LATEST_VERSION
+        before = schema_of(path)
+        assert apply_migrations(conn) == LATEST_VERSION
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert schema_of(path) == before
+    finally:
+        conn.close()
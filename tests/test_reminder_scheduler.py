@@ -0,0 +1,177 @@
+import datetime
+import threading
+from typing import Dict, List
+
+try:
+    from core.models import Task
+    from notifications.clock import FakeClock
+    from notifications.scheduler import ReminderScheduler
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.models import Task
+    from notifications.clock import FakeClock
+    from notifications.scheduler import ReminderScheduler
+
+START = datetime.datetime(2025, 1, 1, 8, 0)  # FakeClock's default start
+DAY = datetime.timedelta(days=1)
+
+
+class FakeTasks:
+    """Stands in for the tasks table behind get_open_tasks_due_between()."""
+
+    def __init__(self, *tasks: Task):
+        self.tasks: Dict[int, Task] = {task.id: task for task in tasks}
+        self.loads: List[tuple] = []
+
+    def add(self, task: Task) -> Task:
+        self.tasks[task.id] = task
+        return task
+
+    def due_between(self, start: datetime.date, end: datetime.date) -> List[Task]:
+        self.loads.append((start, end))
+        return sorted((task for task in self.tasks.values()
+                       if not task.completed and task.due_date is not None and start <= task.due_date < end),
+                      key=lambda task: (task.due_date, task.id))
+
+
+def make_scheduler(tasks: FakeTasks, clock: FakeClock, **kwargs):
+    fired = []
+    scheduler = ReminderScheduler(sinks=[fired.append], clock=clock, load_due=tasks.due_between, **kwargs)
+    return scheduler, fired
+
+
+def test_fires_at_remind_at_minus_lead():
+    clock = FakeClock(START)
+    tasks = FakeTasks(Task(1, "file taxes", due_date=datetime.date(2025, 1, 2)))
+    scheduler, fired = make_scheduler(tasks, clock, lead=datetime.timedelta(minutes=30))
+
+    assert scheduler.run_pending() == 0
+    assert scheduler.next_fire_at() == datetime.datetime(2025, 1, 2, 8, 30)
+    clock.set(datetime.datetime(2025, 1, 2, 8, 29))
+    assert scheduler.run_pending() == 0
+    clock.advance(minutes=1)
+    assert scheduler.run_pending() == 1
+    assert [(reminder.task_id, reminder.fire_at) for reminder in fired] == [(1, datetime.datetime(2025, 1, 2, 8, 30))]
+    assert scheduler.pending() == 0
+
+
+def test_on_change_tracks_added_completed_rescheduled_and_deleted_tasks():
+    clock = FakeClock(START)
+    tasks = FakeTasks()
+    scheduler, fired = make_scheduler(tasks, clock)
+    scheduler.load()
+    today = START.date()
+
+    added = tasks.add(Task(1, "added", due_date=today))
+    scheduler.on_change("task", "added", added.id, added)
+    completed = tasks.add(Task(2, "completed", due_date=today))
+    scheduler.on_change("task", "added", completed.id, completed)
+    completed.completed = True
+    scheduler.on_change("task", "completed", completed.id, completed)
+    moved = tasks.add(Task(3, "moved", due_date=today))
+    scheduler.on_change("task", "added", moved.id, moved)
+    moved.due_date = today + DAY
+    scheduler.on_change("task", "updated", moved.id, moved)
+    deleted = tasks.add(Task(4, "deleted", due_date=today))
+    scheduler.on_change("task", "added", deleted.id, deleted)
+    scheduler.on_change("task", "deleted", deleted.id)
+    assert scheduler.pending() == 2
+
+    clock.set(datetime.datetime(2025, 1, 1, 9, 0))
+    assert scheduler.run_pending() == 1
+    clock.advance(DAY)
+    assert scheduler.run_pending() == 1
+    assert [(reminder.task_id, reminder.due_date) for reminder in fired] == [(1, today), (3, today + DAY)]
+
+
+def test_reopened_task_fires_again():
+    clock = FakeClock(START)
+    task = Task(1, "reopened", due_date=START.date())
+    scheduler, fired = make_scheduler(FakeTasks(task), clock)
+    scheduler.load()
+
+    task.completed = True
+    scheduler.on_change("task", "completed", task.id, task)
+    assert scheduler.pending() == 0
+    task.completed = False
+    scheduler.on_change("task", "completed", task.id, task)
+    clock.set(datetime.datetime(2025, 1, 1, 9, 0))
+    assert scheduler.run_pending() == 1
+    assert fired[0].task_id == 1
+
+
+def test_next_window_loads_when_the_clock_reaches_it():
+    clock = FakeClock(START)
+    far = Task(1, "beyond the first window", due_date=START.date() + 10 * DAY)
+    tasks = FakeTasks(far)
+    scheduler, fired = make_scheduler(tasks, clock, horizon_days=7)
+
+    scheduler.load()
+    assert scheduler.pending() == 0
+    assert scheduler.stats()["loads"] == 1
+    # A task added beyond the loaded window waits for the load that covers it.
+    scheduler.on_change("task", "added", far.id, far)
+    assert scheduler.pending() == 0
+
+    clock.advance(6 * DAY)
+    scheduler.run_pending()
+    assert scheduler.stats()["loads"] == 1
+    clock.advance(DAY + datetime.timedelta(hours=1))  # past 09:00 on the window's last day
+    assert scheduler.run_pending() == 0
+    assert scheduler.stats()["loads"] == 2
+    assert scheduler.pending() == 1
+    # Each load starts where the previous one ended.
+    assert tasks.loads[1][0] == tasks.loads[0][1]
+
+    clock.set(datetime.datetime.combine(far.due_date, datetime.time(9, 0)))
+    assert scheduler.run_pending() == 1
+    assert fired[0].task_id == far.id
+
+
+def test_catch_up_fires_reminders_missed_by_up_to_a_day_once():
+    now = datetime.datetime(2025, 1, 2, 8, 0)
+    clock = FakeClock(now)
+    missed = Task(1, "missed by 23 hours", due_date=datetime.date(2025, 1, 1))
+    too_old = Task(2, "missed by 47 hours", due_date=datetime.date(2024, 12, 31))
+    scheduler, fired = make_scheduler(FakeTasks(missed, too_old), clock)
+
+    assert scheduler.run_pending() == 1
+    assert [reminder.task_id for reminder in fired] == [missed.id]
+    # Neither running again nor an unrelated edit to the task fires it twice.
+    assert scheduler.run_pending() == 0
+    scheduler.on_change("task", "updated", missed.id, missed)
+    assert scheduler.pending() == 0
+    clock.advance(hours=1)
+    assert scheduler.run_pending() == 0
+    assert len(fired) == 1
+
+
+def test_rescheduled_task_fires_for_its_new_due_date():
+    clock = FakeClock(START)
+    task = Task(1, "moved after firing", due_date=START.date())
+    scheduler, fired = make_scheduler(FakeTasks(task), clock)
+    clock.set(datetime.datetime(2025, 1, 1, 9, 0))
+    assert scheduler.run_pending() == 1
+
+    task.due_date = START.date() + DAY
+    scheduler.on_change("task", "updated", task.id, task)
+    clock.advance(DAY)
+    assert scheduler.run_pending() == 1
+    assert [reminder.due_date for reminder in fired] == [START.date(), START.date() + DAY]
+
+
+def test_scheduler_thread_wakes_when_the_clock_advances():
+    clock = FakeClock(START)
+    tasks = FakeTasks(Task(1, "threaded", due_date=START.date()))
+    delivered = threading.Event()
+    scheduler = ReminderScheduler(sinks=[lambda reminder: delivered.set()], clock=clock,
+                                  load_due=tasks.due_between)
+    scheduler.start()
+    try:
+        assert not delivered.wait(0.1)
+        clock.set(datetime.datetime(2025, 1, 1, 9, 0))
+        assert delivered.wait(5)
+    finally:
+        scheduler.stop()
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")  # optional dependency; see llm_integration
+
+try:
+    from llm_integration.semantic_index import SemanticIndex
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from llm_integration.semantic_index import SemanticIndex
+
+
+def test_find_related_ranks_notes_sharing_words_first(database):
+    rent = database.add_note("rent is due on the first of the month")
+    database.add_note("grocery list: apples, bread, cheese")
+    landlord = database.add_note("ask the landlord whether the rent goes up this month")
+    index = SemanticIndex()
+
+    related = index.find_related(rent.id)
+    assert related[0].kind == "note"
+    assert related[0].id == landlord.id
+
+
+def test_rebuild_swaps_in_a_newly_fitted_embedder(database):
+    note = database.add_note("quarterly server report")
+    index = SemanticIndex()
+    assert index.rebuild()
+    old_embedder = index.embedder
+    old_idf = old_embedder.idf.copy()
+
+    for i in range(20):
+        database.add_note(f"quarterly numbers {i}")
+    assert index.rebuild()
+
+    # The old embedder was never refitted in place: vectors made with it
+    # before the swap stay comparable with the indexes they went into.
+    assert np.array_equal(old_embedder.idf, old_idf)
+    assert index.embedder is not old_embedder
+    assert not np.array_equal(index.embedder.idf, old_idf)
+    assert index.find_related(note.id)
+    assert index.search_text("quarterly")
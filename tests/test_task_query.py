@@ -0,0 +1,52 @@
+import datetime
+
+import pytest
+
+try:
+    from data.database import TaskQuery
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data.database import TaskQuery
+
+
+def descriptions(tasks):
+    return [task.description for task in tasks]
+
+
+def test_priority_sort_follows_rank_not_text(database):
+    database.add_task("low", priority="Baja")
+    database.add_task("high", priority="Alta")
+    database.add_task("medium", priority="Media")
+
+    tasks = database.query_tasks(TaskQuery().sorted_by("priority"))
+
+    assert descriptions(tasks) == ["high", "medium", "low"]
+
+
+def test_filters_combine(database):
+    database.add_task("open high", priority="Alta")
+    database.add_task("open low", priority="Baja")
+    done = database.add_task("done high", priority="Alta")
+    database.update_task_completion(done.id, True)
+
+    assert descriptions(database.query_tasks(TaskQuery().open().with_priorities("Alta"))) == ["open high"]
+    assert descriptions(database.query_tasks(TaskQuery().done())) == ["done high"]
+    assert database.query_tasks(TaskQuery().with_priorities()) == []
+
+
+def test_due_sort_puts_undated_tasks_last(database):
+    database.add_task("undated")
+    database.add_task("later", due_date=datetime.date(2025, 5, 1))
+    database.add_task("sooner", due_date=datetime.date(2025, 4, 1))
+
+    assert descriptions(database.query_tasks(TaskQuery().sorted_by("due"))) == ["sooner", "later", "undated"]
+    assert descriptions(database.query_tasks(TaskQuery().sorted_by("due").limited(2))) == ["sooner", "later"]
+    window = TaskQuery().due_between(datetime.date(2025, 4, 1), datetime.date(2025, 5, 1))
+    assert descriptions(database.query_tasks(window)) == ["sooner"]
+
+
+def test_unknown_sort_is_rejected():
+    with pytest.raises(ValueError):
+        TaskQuery().sorted_by("alphabetical")
@@ -0,0 +1,39 @@
+import datetime
+
+try:
+    from core.models import Priority
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.models import Priority
+
+TODAY = datetime.date(2025, 6, 10)
+
+
+def test_stats_follow_inserts_updates_and_deletes(database):
+    late = database.add_task("late", priority="Alta", due_date=TODAY - datetime.timedelta(days=3))
+    database.add_task("today", priority="Baja", due_date=TODAY)
+    done = database.add_task("done", priority="Media")
+    database.update_task_completion(done.id, True)
+
+    stats = database.get_task_stats(TODAY)
+    assert (stats.open[Priority.ALTA], stats.open[Priority.BAJA], stats.completed[Priority.MEDIA]) == (1, 1, 1)
+    assert (stats.total_overdue, stats.due_today) == (1, 1)
+
+    database.update_task_completion(late.id, True)
+    database.delete_task(done.id)
+    stats = database.get_task_stats(TODAY)
+    assert (stats.total_open, stats.total_completed, stats.total_overdue) == (1, 1, 0)
+    assert database.check_task_stats() == []
+
+
+def test_check_task_stats_reports_and_repairs_drift(database):
+    database.add_task("one", priority="Alta")
+    database.get_db_connection().execute("UPDATE task_stats SET task_count = task_count + 5")
+    database.get_db_connection().commit()
+
+    assert database.check_task_stats()
+    assert database.check_task_stats(repair=True)
+    assert database.check_task_stats() == []
+    assert database.get_task_stats(TODAY).open[Priority.ALTA] == 1
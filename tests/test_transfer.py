@@ -0,0 +1,77 @@
+import datetime
+
+import pytest
+
+try:
+    from data import transfer
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data import transfer
+
+
+def seed(database):
+    task = database.add_task("pay rent", priority="Alta", due_date=datetime.date(2025, 3, 1))
+    database.add_task("water plants", priority="Baja")
+    database.add_note("rent goes up, \"again\"\nin March", task_id=task.id)
+    database.add_note("loose note")
+    return task
+
+
+@pytest.mark.parametrize("fmt", transfer.FORMATS)
+def test_export_then_import_round_trips(database, tmp_path, fmt):
+    seed(database)
+    path = str(tmp_path / f"backup.{fmt}")
+    exported = transfer.export_file(path)
+    assert (exported.tasks, exported.notes) == (2, 2)
+
+    imported = transfer.import_file(path)
+
+    assert (imported.tasks, imported.notes, imported.skipped, imported.unlinked) == (2, 2, 0, 0)
+    tasks = sorted(database.get_all_tasks(), key=lambda task: task.id)
+    assert [(t.description, t.priority, t.due_date) for t in tasks[2:]] == [
+        ("pay rent", "Alta", datetime.date(2025, 3, 1)), ("water plants", "Baja", None)]
+    copied = max(database.get_all_notes(), key=lambda note: note.id)
+    assert copied.task_id is None
+    linked = database.get_notes_for_task(tasks[2].id)
+    assert [database.get_note_by_id(note.id).content for note in linked] == ["rent goes up, \"again\"\nin March"]
+
+
+def test_invalid_records_are_skipped_or_stop_a_strict_import(database, tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"type": "task", "description": "ok"}\n'
+                    '{"type": "task", "description": "bad", "priority": "Urgente"}\n', encoding="utf-8")
+    errors = []
+
+    assert transfer.import_file(str(path), strict=True) is None
+    stats = transfer.import_file(str(path), restart=True, on_error=lambda line, message: errors.append(line))
+
+    assert (stats.tasks, stats.skipped) == (1, 1)
+    assert errors == [2]
+    assert [task.description for task in database.get_all_tasks()] == ["ok"]
+
+
+def test_interrupted_import_resumes_and_finished_import_is_not_repeated(database, tmp_path):
+    path = str(tmp_path / "tasks.jsonl")
+    with open(path, "w", encoding="utf-8") as out:
+        for i in range(5):
+            out.write(f'{{"type": "task", "description": "task {i}"}}\n')
+    key = transfer.import_key_for(path)
+
+    def interrupted():
+        with open(path, encoding="utf-8") as stream:
+            for number, (line, raw) in enumerate(transfer._read_records(stream, "jsonl")):
+                if number == 3:
+                    raise KeyboardInterrupt
+                yield line, raw
+
+    database.start_import(key, path)
+    with pytest.raises(KeyboardInterrupt):
+        transfer.import_records(interrupted(), "jsonl", key, chunk_size=2)
+    assert len(database.get_all_tasks()) == 2  # the first chunk was committed
+
+    resumed = transfer.import_file(path, chunk_size=2)
+    assert (resumed.records, resumed.tasks) == (5, 3)
+    assert sorted(t.description for t in database.get_all_tasks()) == [f"task {i}" for i in range(5)]
+    assert transfer.import_file(path).tasks == 0
@@ -0,0 +1,71 @@
+import threading
+
+try:
+    from data.write_behind import WriteBehindBuffer
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data.write_behind import WriteBehindBuffer
+
+
+class FakeWriter:
+    """Stands in for update_tasks_completion_bulk(); fails the calls listed in `fail`."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.batches = []
+        self.written = threading.Event()
+
+    def __call__(self, updates):
+        self.batches.append(sorted(updates))
+        if len(self.batches) in self.fail:
+            return None
+        self.written.set()
+        return len(self.batches[-1])
+
+
+def test_updates_to_one_task_collapse_into_the_last():
+    writer = FakeWriter()
+    buffer = WriteBehindBuffer(write_func=writer, flush_delay=60)
+    for completed in (True, False, True):
+        buffer.set_completed(1, completed)
+    buffer.set_completed(2, True)
+
+    assert buffer.flush() == 2
+    assert writer.batches == [[(1, True), (2, True)]]
+    assert buffer.stats()["coalesced"] == 2
+
+
+def test_full_buffer_flushes_without_waiting_for_the_timer():
+    writer = FakeWriter()
+    buffer = WriteBehindBuffer(write_func=writer, flush_delay=60, max_pending=3)
+    for task_id in range(3):
+        buffer.set_completed(task_id, True)
+
+    assert writer.batches == [[(0, True), (1, True), (2, True)]]
+    assert buffer.pending == 0
+
+
+def test_failed_batch_is_put_back_behind_newer_updates():
+    writer = FakeWriter(fail={1})
+    buffer = WriteBehindBuffer(write_func=writer, flush_delay=60)
+    buffer.set_completed(1, True)
+    buffer.set_completed(2, True)
+
+    assert buffer.flush() == 0
+    assert buffer.pending == 2
+    buffer.set_completed(2, False)  # newer than the failed write
+    assert buffer.flush() == 2
+    assert writer.batches[-1] == [(1, True), (2, False)]
+    assert buffer.stats()["failed"] == 1
+
+
+def test_failed_batch_is_retried_by_the_timer():
+    writer = FakeWriter(fail={1})
+    buffer = WriteBehindBuffer(write_func=writer, flush_delay=0.01)
+    buffer.set_completed(1, True)
+
+    assert buffer.flush() == 0
+    assert writer.written.wait(5)
+    assert writer.batches == [[(1, True)], [(1, True)]]